@@ -10,6 +10,9 @@
 # All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
 # for full copyright and license information.
 #################################################################################
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 import pyomo.environ as pyo
 from pyomo.opt.base.solvers import OptSolver
@@ -18,11 +21,24 @@ from abc import ABC, abstractmethod
 from idaes.apps.grid_integration.utils import convert_marginal_costs_to_actual_costs
 import datetime
 from pyomo.common.dependencies import attempt_import
+import idaes.logger as idaeslog
 
 egret, egret_avail = attempt_import("egret")
 if egret_avail:
     from egret.model_library.transmission import tx_utils
 
+_logger = idaeslog.getLogger(__name__)
+
+# Bidder and bidding model shared with the forked worker processes that solve
+# the scenario subproblems in decomposition mode.
+_scenario_solve_data = None
+
+
+def _solve_scenario_worker(i, coordination_data):
+    bidder, model = _scenario_solve_data
+    optimal = bidder._solve_scenario(model, i, coordination_data)
+    return i, optimal, [v.value for v in bidder._scenario_vars(model, i)]
+
 
 class AbstractBidder(ABC):
 
@@ -170,6 +186,7 @@ class AbstractBidder(ABC):
         self._check_bidding_model_object()
         self._check_n_scenario()
         self._check_solver()
+        self._check_n_workers()
 
     def _check_bidding_model_object(self):
 
@@ -225,6 +242,26 @@ class AbstractBidder(ABC):
                 f"The provided solver {self.solver} is not a valid Pyomo solver."
             )
 
+    def _check_n_workers(self):
+
+        """
+        Check if the number of worker processes is None or a positive integer.
+        """
+
+        n_workers = getattr(self, "n_workers", None)
+        if n_workers is None:
+            return
+
+        if not isinstance(n_workers, int):
+            raise TypeError(
+                f"The number of worker processes should be an integer, but a {type(n_workers).__name__} was given."
+            )
+
+        if n_workers <= 0:
+            raise ValueError(
+                f"The number of worker processes should be greater than zero, but {n_workers} was given."
+            )
+
 
 class StochasticProgramBidder(AbstractBidder):
 
@@ -241,6 +278,9 @@ class StochasticProgramBidder(AbstractBidder):
         solver,
         forecaster,
         real_time_underbid_penalty,
+        decomposition=False,
+        n_workers=None,
+        decomposition_tolerance=1e-4,
     ):
 
         """
@@ -261,6 +301,12 @@ class StochasticProgramBidder(AbstractBidder):
 
             real_time_underbid_penalty: penalty for RT power bid that's less than DA power bid, non-negative
 
+            decomposition: if True, solve the price scenarios as separate subproblems coordinated by the bidder, instead of solving the extensive form
+
+            n_workers: number of worker processes to solve the scenario subproblems in decomposition mode, if None or 1 they are solved in this process
+
+            decomposition_tolerance: tolerance on the coupling constraints across scenarios in decomposition mode
+
         Returns:
             None
         """
@@ -272,6 +318,9 @@ class StochasticProgramBidder(AbstractBidder):
         self.solver = solver
         self.forecaster = forecaster
         self.real_time_underbid_penalty = real_time_underbid_penalty
+        self.decomposition = decomposition
+        self.n_workers = n_workers
+        self.decomposition_tolerance = decomposition_tolerance
 
         self._check_inputs()
 
@@ -324,6 +373,8 @@ class StochasticProgramBidder(AbstractBidder):
 
         model = self._set_up_bidding_problem(self.day_ahead_horizon)
         self._add_DA_bidding_constraints(model)
+        if self.decomposition:
+            self._add_scenario_objectives(model, "day_ahead_power")
 
         # do not relax the DA offering UB
         for i in model.SCENARIOS:
@@ -343,6 +394,8 @@ class StochasticProgramBidder(AbstractBidder):
 
         model = self._set_up_bidding_problem(self.real_time_horizon)
         self._add_RT_bidding_constraints(model)
+        if self.decomposition:
+            self._add_scenario_objectives(model, "power_output_ref")
 
         # relax the DA offering UB
         for i in model.SCENARIOS:
@@ -445,9 +498,6 @@ class StochasticProgramBidder(AbstractBidder):
             None
         """
 
-        # declare an empty objective
-        model.obj = pyo.Objective(expr=0, sense=pyo.maximize)
-
         for k in model.SCENARIOS:
             time_index = model.fs[k].power_output_ref.index_set()
 
@@ -458,8 +508,9 @@ class StochasticProgramBidder(AbstractBidder):
             cost = getattr(model.fs[k], cost_name)
             weight = self.bidding_model_object.total_cost[1]
 
-            for t in time_index:
-                model.obj.expr += (
+            # profit of each scenario, so that scenarios can also be solved separately
+            model.fs[k].scenario_profit = pyo.Expression(
+                expr=sum(
                     model.fs[k].day_ahead_energy_price[t]
                     * model.fs[k].day_ahead_power[t]
                     + model.fs[k].real_time_energy_price[t]
@@ -467,10 +518,220 @@ class StochasticProgramBidder(AbstractBidder):
                     - weight * cost[t]
                     - model.fs[k].real_time_underbid_penalty
                     * model.fs[k].real_time_underbid_power[t]
+                    for t in time_index
                 )
+            )
+
+        model.obj = pyo.Objective(
+            expr=sum(model.fs[k].scenario_profit for k in model.SCENARIOS),
+            sense=pyo.maximize,
+        )
+
+        return
+
+    def _add_scenario_objectives(self, model, first_stage_var_name):
+
+        """
+        Add a deactivated objective to each price scenario block, which is
+        activated to solve the scenario as a subproblem in decomposition mode.
+
+        Arguments:
+            model: bidding model
+
+            first_stage_var_name: the name of the power output shared across the scenarios (str)
+
+        Returns:
+            None
+        """
+
+        for k in model.SCENARIOS:
+            model.fs[k].scenario_obj = pyo.Objective(
+                expr=model.fs[k].scenario_profit, sense=pyo.maximize
+            )
+            model.fs[k].scenario_obj.deactivate()
+
+        return
+
+    def _update_scenario_objective(self, b, i, coordination_data):
+
+        """
+        Update the objective of a scenario subproblem with the data passed by
+        the coordination method. The scenario objectives of the base stochastic
+        bidder do not need any data.
+
+        Arguments:
+            b: the price scenario block
+
+            i: the price scenario
+
+            coordination_data: data returned by the coordination method
+
+        Returns:
+            None
+        """
 
         return
 
+    @staticmethod
+    def _scenario_vars(model, i):
+
+        """
+        Get the variables of a price scenario block, in a fixed order.
+        """
+
+        return list(model.fs[i].component_data_objects(pyo.Var, descend_into=True))
+
+    def _solve_scenario(self, model, i, coordination_data):
+
+        """
+        Solve a price scenario of the bidding model as a separate subproblem.
+
+        Arguments:
+            model: bidding model
+
+            i: the price scenario
+
+            coordination_data: data to update the scenario objective with
+
+        Returns:
+            bool: True if the subproblem was solved to optimality
+        """
+
+        b = model.fs[i]
+        if coordination_data is not None:
+            self._update_scenario_objective(b, i, coordination_data)
+
+        b.scenario_obj.activate()
+        try:
+            result = self.solver.solve(b)
+        finally:
+            b.scenario_obj.deactivate()
+
+        return pyo.check_optimal_termination(result)
+
+    def _coupling_constraints_satisfied(self, model):
+
+        """
+        Check if the bidding constraints that couple the price scenarios are
+        satisfied by the current solution.
+
+        Arguments:
+            model: bidding model
+
+        Returns:
+            bool: True if all the coupling constraints are satisfied
+        """
+
+        tol = self.decomposition_tolerance
+
+        # the constraints on the top level of the model are the ones across scenarios
+        for c in model.component_data_objects(
+            pyo.Constraint, active=True, descend_into=False
+        ):
+            body = pyo.value(c.body)
+            if c.has_lb() and body < pyo.value(c.lower) - tol:
+                return False
+            if c.has_ub() and body > pyo.value(c.upper) + tol:
+                return False
+
+        return True
+
+    def _coordinate_scenarios(self, model, first_stage_var_name, solve_scenarios):
+
+        """
+        Coordinate the solves of the price scenario subproblems. The
+        scenarios are solved independently once. If the solutions satisfy the
+        bidding constraints across the scenarios, they are also optimal for
+        the extensive form.
+
+        Arguments:
+            model: bidding model
+
+            first_stage_var_name: the name of the power output shared across the scenarios (str)
+
+            solve_scenarios: function that solves all the scenario subproblems given the coordination data, and returns True if they are all optimal
+
+        Returns:
+            bool: True if the scenario solutions solve the bidding problem
+        """
+
+        if not solve_scenarios(None):
+            return False
+
+        return self._coupling_constraints_satisfied(model)
+
+    def _solve_decomposed(self, model, first_stage_var_name):
+
+        """
+        Solve the bidding model by decomposing it into price scenario
+        subproblems, which are solved in parallel worker processes if
+        n_workers is greater than 1. The solution of each subproblem is the
+        starting point of its next solve, which warm starts the solves across
+        hours.
+
+        Arguments:
+            model: bidding model
+
+            first_stage_var_name: the name of the power output shared across the scenarios (str)
+
+        Returns:
+            bool: True if the scenario solutions solve the bidding problem
+        """
+
+        global _scenario_solve_data  # pylint: disable=global-statement
+        scenarios = list(model.SCENARIOS)
+
+        try:
+            mp_context = multiprocessing.get_context("fork")
+        except ValueError:
+            mp_context = None
+
+        if (
+            self.n_workers is None
+            or self.n_workers == 1
+            or len(scenarios) == 1
+            or mp_context is None
+        ):
+
+            def solve_scenarios(coordination_data):
+                optimal = [
+                    self._solve_scenario(model, i, coordination_data) for i in scenarios
+                ]
+                return all(optimal)
+
+            return self._coordinate_scenarios(
+                model, first_stage_var_name, solve_scenarios
+            )
+
+        _scenario_solve_data = (self, model)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(self.n_workers, len(scenarios)),
+                mp_context=mp_context,
+            ) as executor:
+
+                def solve_scenarios(coordination_data):
+                    all_optimal = True
+                    for i, optimal, values in executor.map(
+                        _solve_scenario_worker,
+                        scenarios,
+                        [coordination_data] * len(scenarios),
+                    ):
+                        for v, val in zip(self._scenario_vars(model, i), values):
+                            v.set_value(val, skip_validation=True)
+                        if coordination_data is not None:
+                            self._update_scenario_objective(
+                                model.fs[i], i, coordination_data
+                            )
+                        all_optimal = all_optimal and optimal
+                    return all_optimal
+
+                return self._coordinate_scenarios(
+                    model, first_stage_var_name, solve_scenarios
+                )
+        finally:
+            _scenario_solve_data = None
+
     def _compute_bids(
         self,
         day_ahead_price,
@@ -511,7 +772,16 @@ class StochasticProgramBidder(AbstractBidder):
         # update the price forecasts
         self._pass_price_forecasts(model, day_ahead_price, real_time_energy_price)
 
-        self.solver.solve(model, tee=True)
+        # fall back to the extensive form, warm started from the scenario
+        # solutions, if the decomposition does not solve the problem
+        if not self.decomposition:
+            self.solver.solve(model, tee=True)
+        elif not self._solve_decomposed(model, power_var_name):
+            _logger.warning(
+                f"The price scenario decomposition did not solve the {market} "
+                f"bidding problem on {date} hour {hour}, solving the extensive form."
+            )
+            self.solver.solve(model, tee=True)
 
         bids = self._assemble_bids(
             model,
@@ -822,6 +1092,11 @@ class SelfScheduler(StochasticProgramBidder):
         forecaster,
         real_time_underbid_penalty=10000,
         fixed_to_schedule=False,
+        decomposition=False,
+        n_workers=None,
+        decomposition_tolerance=1e-4,
+        ph_rho=1.0,
+        max_ph_iterations=10,
     ):
         """
         Initializes the stochastic self-scheduler object.
@@ -841,10 +1116,28 @@ class SelfScheduler(StochasticProgramBidder):
 
             fixed_to_schedule: If True, forece market simulator to give the same schedule.
 
+            decomposition: if True, solve the price scenarios as separate subproblems coordinated by progressive hedging, instead of solving the extensive form. The scenario subproblems are quadratic, so the extensive form is always solved if the solver does not support quadratic objectives.
+
+            n_workers: number of worker processes to solve the scenario subproblems in decomposition mode, if None or 1 they are solved in this process
+
+            decomposition_tolerance: tolerance on the difference of the scheduled power across scenarios in decomposition mode
+
+            ph_rho: penalty parameter of progressive hedging
+
+            max_ph_iterations: maximum number of progressive hedging iterations, the extensive form is solved if they do not converge. Progressive hedging is not guaranteed to converge if the bidding model has integer variables, so this should be small.
+
         Returns:
             None
         """
 
+        if decomposition and not self._supports_quadratic_objective(solver):
+            _logger.warning(
+                "The solver does not support the quadratic objectives of the "
+                "progressive hedging subproblems, so the extensive form of the "
+                "bidding problem is solved instead."
+            )
+            decomposition = False
+
         super().__init__(
             bidding_model_object,
             day_ahead_horizon,
@@ -853,8 +1146,32 @@ class SelfScheduler(StochasticProgramBidder):
             solver,
             forecaster,
             real_time_underbid_penalty,
+            decomposition=decomposition,
+            n_workers=n_workers,
+            decomposition_tolerance=decomposition_tolerance,
         )
         self.fixed_to_schedule = fixed_to_schedule
+        self.ph_rho = ph_rho
+        self.max_ph_iterations = max_ph_iterations
+
+    @staticmethod
+    def _supports_quadratic_objective(solver):
+
+        """
+        Check if a solver supports quadratic objectives, which are needed by
+        the price scenario subproblems of progressive hedging.
+
+        Arguments:
+            solver: a Pyomo mathematical programming solver object
+
+        Returns:
+            bool: True if the solver reports that it supports quadratic objectives
+        """
+
+        has_capability = getattr(solver, "has_capability", None)
+        if has_capability is None:
+            return False
+        return bool(has_capability("quadratic_objective"))
 
     def _add_DA_bidding_constraints(self, model):
 
@@ -916,6 +1233,132 @@ class SelfScheduler(StochasticProgramBidder):
 
         return
 
+    def _add_scenario_objectives(self, model, first_stage_var_name):
+
+        """
+        Add a deactivated progressive hedging objective to each price scenario
+        block, i.e., the scenario profit with the multiplier and proximal terms
+        that drive the scheduled power to be the same across the scenarios.
+
+        Arguments:
+            model: bidding model
+
+            first_stage_var_name: the name of the power output shared across the scenarios (str)
+
+        Returns:
+            None
+        """
+
+        for k in model.SCENARIOS:
+            b = model.fs[k]
+            power = getattr(b, first_stage_var_name)
+            time_index = power.index_set()
+
+            b.ph_weight = pyo.Param(time_index, initialize=0, mutable=True)
+            b.ph_average = pyo.Param(time_index, initialize=0, mutable=True)
+            b.ph_rho = pyo.Param(initialize=0, mutable=True)
+
+            b.scenario_obj = pyo.Objective(
+                expr=b.scenario_profit
+                - sum(
+                    b.ph_weight[t] * power[t]
+                    + b.ph_rho / 2 * (power[t] - b.ph_average[t]) ** 2
+                    for t in time_index
+                ),
+                sense=pyo.maximize,
+            )
+            b.scenario_obj.deactivate()
+
+        return
+
+    def _update_scenario_objective(self, b, i, coordination_data):
+
+        """
+        Pass the progressive hedging multipliers, average power and penalty
+        parameter into the objective of a price scenario block.
+
+        Arguments:
+            b: the price scenario block
+
+            i: the price scenario
+
+            coordination_data: tuple of the multipliers of all the scenarios, the average power and the penalty parameter
+
+        Returns:
+            None
+        """
+
+        weights, average, rho = coordination_data
+        for t in b.ph_weight.index_set():
+            b.ph_weight[t] = weights[i][t]
+            b.ph_average[t] = average[t]
+        b.ph_rho = rho
+
+        return
+
+    def _coordinate_scenarios(self, model, first_stage_var_name, solve_scenarios):
+
+        """
+        Coordinate the solves of the price scenario subproblems with
+        progressive hedging. The multipliers of the last solve are the
+        starting point of the next one, which warm starts the solves across
+        hours.
+
+        Arguments:
+            model: bidding model
+
+            first_stage_var_name: the name of the power output shared across the scenarios (str)
+
+            solve_scenarios: function that solves all the scenario subproblems given the coordination data, and returns True if they are all optimal
+
+        Returns:
+            bool: True if progressive hedging converged
+        """
+
+        scenarios = list(model.SCENARIOS)
+        time_index = list(model.fs[scenarios[0]].ph_weight.index_set())
+
+        def _array(name):
+            return np.array(
+                [
+                    [pyo.value(getattr(model.fs[i], name)[t]) for t in time_index]
+                    for i in scenarios
+                ]
+            )
+
+        weights = _array("ph_weight")
+        average = _array("ph_average")[0]
+
+        # the first iteration only uses the multipliers, without the proximal term
+        rho = 0
+        for _ in range(self.max_ph_iterations):
+            coordination_data = (
+                {i: dict(zip(time_index, w)) for i, w in zip(scenarios, weights)},
+                dict(zip(time_index, average)),
+                rho,
+            )
+            if not solve_scenarios(coordination_data):
+                return False
+
+            # the scenarios are equally likely
+            power = _array(first_stage_var_name)
+            average = power.mean(axis=0)
+            if np.max(np.ptp(power, axis=0)) <= self.decomposition_tolerance:
+                break
+
+            rho = self.ph_rho
+            weights = weights + rho * (power - average)
+        else:
+            return False
+
+        # keep the multipliers and the average power for the next solve
+        for i, w in zip(scenarios, weights):
+            for t, w_t, p_t in zip(time_index, w, average):
+                model.fs[i].ph_weight[t] = w_t
+                model.fs[i].ph_average[t] = p_t
+
+        return self._coupling_constraints_satisfied(model)
+
     def _assemble_bids(self, model, power_var_name, energy_price_param_name, hour):
 
         """
@@ -1046,6 +1489,9 @@ class Bidder(StochasticProgramBidder):
         solver,
         forecaster,
         real_time_underbid_penalty=10000,
+        decomposition=False,
+        n_workers=None,
+        decomposition_tolerance=1e-4,
     ):
 
         """
@@ -1066,6 +1512,12 @@ class Bidder(StochasticProgramBidder):
 
             real_time_underbid_penalty: penalty for RT power bid that's less than DA power bid, non-negative
 
+            decomposition: if True, solve the price scenarios as separate subproblems, which solve the bidding problem if their bids are nondecreasing with the prices. Otherwise the extensive form is solved, warm started from the scenario solutions.
+
+            n_workers: number of worker processes to solve the scenario subproblems in decomposition mode, if None or 1 they are solved in this process
+
+            decomposition_tolerance: tolerance on the bidding constraints across scenarios in decomposition mode
+
         Returns:
             None
         """
@@ -1078,6 +1530,9 @@ class Bidder(StochasticProgramBidder):
             solver,
             forecaster,
             real_time_underbid_penalty,
+            decomposition=decomposition,
+            n_workers=n_workers,
+            decomposition_tolerance=decomposition_tolerance,
         )
 
     def _add_DA_bidding_constraints(self, model):
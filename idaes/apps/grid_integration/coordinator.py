@@ -57,6 +57,10 @@ class DoubleLoopCoordinator:
         self.tracker = tracker
         self.projection_tracker = projection_tracker
 
+        # pairs of tracker and projection tracker data objects, populated on
+        # the first call to _clone_tracking_model
+        self._tracking_model_pairs = None
+
     def register_plugins(self, context, options, plugin_config):
 
         """
@@ -378,6 +382,12 @@ class DoubleLoopCoordinator:
         Clone the model in tracker and replace that of projection tracker. In this
         way, tracker and projection tracker have the same states before projection.
 
+        The corresponding variables and mutable parameters of the two models are
+        paired on the first call, so later calls only copy the values. Since
+        the projection tracker model is updated in place, it is warm started
+        from the state of the tracker and, if it uses a persistent solver, only
+        the changed parameters are passed to the solver.
+
         Arguments:
             None
 
@@ -385,7 +395,29 @@ class DoubleLoopCoordinator:
             None
         """
 
-        # iterate all the variables and params and clone the values
+        if self._tracking_model_pairs is None:
+            self._tracking_model_pairs = self._pair_tracking_model_data()
+
+        for tracker_data, proj_tracker_data in self._tracking_model_pairs:
+            val = tracker_data.value
+            if proj_tracker_data.value != val:
+                proj_tracker_data.set_value(None if val is None else round(val, 4))
+
+        return
+
+    def _pair_tracking_model_data(self):
+        """
+        Pair the variables and mutable parameters in the tracker model with the
+        corresponding ones in the projection tracker model.
+
+        Arguments:
+            None
+
+        Returns:
+            list: pairs of tracker and projection tracker data objects
+        """
+
+        pairs = []
         objects_list = [pyo.Var, pyo.Param]
         for obj in objects_list:
             for tracker_obj, proj_tracker_obj in zip_longest(
@@ -396,15 +428,21 @@ class DoubleLoopCoordinator:
                     obj, sort=pyo.SortComponents.alphabetizeComponentAndIndex
                 ),
             ):
-                if tracker_obj.name != proj_tracker_obj.name:
+                if (
+                    tracker_obj is None
+                    or proj_tracker_obj is None
+                    or tracker_obj.name != proj_tracker_obj.name
+                ):
                     raise ValueError(
                         f"Trying to copy the value of {tracker_obj} to {proj_tracker_obj}, but they do not have the same name and possibly not the corresponding objects. Please make sure tracker and projection tracker do not diverge. "
                     )
+                # immutable parameters can not be updated
+                if obj is pyo.Param and not tracker_obj.mutable:
+                    continue
                 for idx in tracker_obj.index_set():
-                    if pyo.value(proj_tracker_obj[idx]) != pyo.value(tracker_obj[idx]):
-                        proj_tracker_obj[idx] = round(pyo.value(tracker_obj[idx]), 4)
+                    pairs.append((tracker_obj[idx], proj_tracker_obj[idx]))
 
-        return
+        return pairs
 
     def _update_static_params(self, gen_dict):
 
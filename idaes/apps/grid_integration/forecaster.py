@@ -11,6 +11,7 @@
 # for full copyright and license information.
 #################################################################################
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from numbers import Real
 import numpy as np
 import idaes.logger as idaeslog
@@ -23,6 +24,167 @@ class ForecastError(Exception):
     """Error to indicate error with forecasters."""
 
 
+class _HistoricalPriceBuffer(Mapping):
+
+    """
+    Ring buffer for the hourly historical prices of a market, stored in one
+    2-D array with a row for each bus. Prices are appended a whole day at a
+    time and, once the buffer is full, overwrite the oldest day. Indexing with
+    a bus returns the stored prices from the oldest to the newest as a list.
+    """
+
+    def __init__(self, historical_price, max_historical_days):
+
+        """
+        Initialize the buffer.
+
+        Arguments:
+            historical_price: dictionary of list for historical hourly prices
+
+            max_historical_days: maximum number of days of prices to store
+
+        Returns:
+            None
+        """
+
+        self._rows = {b: i for i, b in enumerate(historical_price)}
+        self._capacity = max_historical_days * 24
+
+        n_buses = len(self._rows)
+        self._prices = np.empty((n_buses, self._capacity))
+        self._start = np.zeros(n_buses, dtype=int)
+        self._n_hours = np.zeros(n_buses, dtype=int)
+
+        for b, row in self._rows.items():
+            price = np.asarray(historical_price[b], dtype=float)[-self._capacity :]
+            self._prices[row, : len(price)] = price
+            self._n_hours[row] = len(price)
+
+        # prices of the current day, which are stored once the day is complete
+        self._current_day = np.empty((n_buses, 24))
+        self._n_current_hours = 0
+
+    def __getitem__(self, bus):
+        row = self._rows[bus]
+        idx = (self._start[row] + np.arange(self._n_hours[row])) % self._capacity
+        return self._prices[row, idx].tolist()
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, bus):
+        # Mapping.__contains__ would build the history list of the bus
+        return bus in self._rows
+
+    @property
+    def current_day(self):
+
+        """
+        Prices of the current (incomplete) day at each bus.
+
+        Returns:
+            dict: prices of the current day
+        """
+
+        return {
+            b: self._current_day[row, : self._n_current_hours].tolist()
+            for b, row in self._rows.items()
+        }
+
+    def append_day(self, prices):
+
+        """
+        Store a day of prices for all buses, dropping the oldest day at the
+        buses where the buffer is full.
+
+        Arguments:
+            prices: 2-D array-like of prices, a row of 24 prices for each bus in order
+
+        Returns:
+            None
+        """
+
+        rows = np.arange(len(self._rows))[:, None]
+        cols = ((self._start + self._n_hours)[:, None] + np.arange(24)) % self._capacity
+        self._prices[rows, cols] = prices
+
+        full = self._n_hours >= self._capacity
+        self._start[full] = (self._start[full] + 24) % self._capacity
+        self._n_hours[~full] += 24
+
+    def append_hour(self, prices):
+
+        """
+        Store an hour of prices for all buses. Once the day is complete, its
+        prices are appended to the historical prices.
+
+        Arguments:
+            prices: array-like of prices, one for each bus in order
+
+        Returns:
+            None
+        """
+
+        self._current_day[:, self._n_current_hours] = prices
+        self._n_current_hours += 1
+
+        if self._n_current_hours == 24:
+            self.append_day(self._current_day)
+            self._n_current_hours = 0
+
+    def resize(self, max_historical_days):
+
+        """
+        Change the maximum number of days of prices to store, dropping the
+        oldest days if needed.
+
+        Arguments:
+            max_historical_days: maximum number of days of prices to store
+
+        Returns:
+            None
+        """
+
+        current_day = self._current_day
+        n_current_hours = self._n_current_hours
+        self.__init__({b: self[b] for b in self._rows}, max_historical_days)
+        self._current_day = current_day
+        self._n_current_hours = n_current_hours
+
+    def samples(self, bus, hour, horizon, n_samples):
+
+        """
+        Build price samples for a bus from the historical prices. Sample i
+        starts at the given hour of the (i + 1)-th newest day, cycling through
+        the stored days, and prices past the newest one wrap around to the
+        oldest.
+
+        Arguments:
+            bus: the bus of the samples
+
+            hour: starting hour of the samples
+
+            horizon: number of the time periods of the samples
+
+            n_samples: number of the samples
+
+        Returns:
+            numpy.ndarray: samples, n_samples by horizon
+        """
+
+        row = self._rows[bus]
+        n_hours = self._n_hours[row]
+        n_days = n_hours // 24
+
+        day_idx = n_days - (np.arange(n_samples) % n_days) - 1
+        t = (day_idx[:, None] * 24 + hour + np.arange(horizon)) % n_hours
+
+        return self._prices[row, (self._start[row] + t) % self._capacity]
+
+
 class AbstractPriceForecaster(ABC):
 
     """
@@ -356,7 +518,10 @@ class Backcaster(AbstractPrescientPriceForecaster):
         self.max_historical_days = max_historical_days
         self.historical_da_prices = historical_da_prices
         self.historical_rt_prices = historical_rt_prices
-        self._current_day_rt_prices = {bus: [] for bus in historical_da_prices}
+
+    @property
+    def _current_day_rt_prices(self):
+        return self._historical_rt_prices.current_day
 
     def _validate_input_historical_price(self, historical_price):
 
@@ -446,6 +611,12 @@ class Backcaster(AbstractPrescientPriceForecaster):
 
         self._max_historical_days = value
 
+        # drop the oldest stored prices if needed
+        for attr in ("_historical_da_prices", "_historical_rt_prices"):
+            prices = getattr(self, attr, None)
+            if prices is not None:
+                prices.resize(value)
+
     @property
     def historical_da_prices(self):
 
@@ -453,7 +624,7 @@ class Backcaster(AbstractPrescientPriceForecaster):
         Property getter for historical_da_prices.
 
         Returns:
-            dict: saved historical day-ahead prices
+            Mapping: saved historical day-ahead prices, a list of prices for each bus
         """
 
         return self._historical_da_prices
@@ -472,7 +643,9 @@ class Backcaster(AbstractPrescientPriceForecaster):
         """
 
         self._validate_input_historical_price(value)
-        self._historical_da_prices = value
+        self._historical_da_prices = _HistoricalPriceBuffer(
+            value, self.max_historical_days
+        )
 
     @property
     def historical_rt_prices(self):
@@ -481,7 +654,7 @@ class Backcaster(AbstractPrescientPriceForecaster):
         Property getter for historical_rt_prices.
 
         Returns:
-            dict: saved historical real-time prices
+            Mapping: saved historical real-time prices, a list of prices for each bus
         """
 
         return self._historical_rt_prices
@@ -500,7 +673,9 @@ class Backcaster(AbstractPrescientPriceForecaster):
         """
 
         self._validate_input_historical_price(value)
-        self._historical_rt_prices = value
+        self._historical_rt_prices = _HistoricalPriceBuffer(
+            value, self.max_historical_days
+        )
 
     def forecast_day_ahead_and_real_time_prices(
         self, date, hour, bus, horizon, n_samples
@@ -605,7 +780,7 @@ class Backcaster(AbstractPrescientPriceForecaster):
 
         Arguments:
 
-            historical_price_dict: the dictionary that holds the intended historical prices
+            historical_price_dict: the buffer that holds the intended historical prices
 
             market: the market that the price forecast is for, e.g., day-ahead
 
@@ -627,20 +802,9 @@ class Backcaster(AbstractPrescientPriceForecaster):
         if bus not in historical_price_dict:
             raise ForecastError(f"No {bus} {market} price available.")
 
-        historical_price_len = len(historical_price_dict[bus])
-        n_days = historical_price_len // 24
+        samples = historical_price_dict.samples(bus, hour, horizon, n_samples)
 
-        forecast = {}
-
-        for i in range(n_samples):
-            day_idx = n_days - (i % n_days) - 1
-
-            forecast[i] = [
-                historical_price_dict[bus][t % historical_price_len]
-                for t in range(day_idx * 24 + hour, day_idx * 24 + hour + horizon)
-            ]
-
-        return forecast
+        return {i: sample.tolist() for i, sample in enumerate(samples)}
 
     def fetch_hourly_stats_from_prescient(self, prescient_hourly_stats):
 
@@ -656,21 +820,12 @@ class Backcaster(AbstractPrescientPriceForecaster):
             None
         """
 
-        # save the newest rt prices
-        for b, price_list in self._current_day_rt_prices.items():
-            price_list.append(prescient_hourly_stats.observed_bus_LMPs[b])
-
-        # update the historical
-        for b in self._current_day_rt_prices:
-
-            # if a full day's data is ready, get them ready for future forecasts
-            if len(self._current_day_rt_prices[b]) >= 24:
-                self._historical_rt_prices[b] += self._current_day_rt_prices[b]
-                self._current_day_rt_prices[b] = []
-
-            # drop oldest historical prices if total stored data exceeded the upper bound
-            while len(self._historical_rt_prices[b]) // 24 > self.max_historical_days:
-                self._historical_rt_prices[b] = self._historical_rt_prices[b][24:]
+        # save the newest rt prices, a full day's data is stored for future
+        # forecasts and the oldest day is dropped once the storage is full
+        observed_bus_LMPs = prescient_hourly_stats.observed_bus_LMPs
+        self._historical_rt_prices.append_hour(
+            [observed_bus_LMPs[b] for b in self._historical_rt_prices]
+        )
 
         return
 
@@ -692,16 +847,13 @@ class Backcaster(AbstractPrescientPriceForecaster):
             None
         """
 
-        for b in self._historical_da_prices:
-
-            # save the newest da prices
-            self._historical_da_prices[b] += [
-                day_ahead_result.ruc_market.day_ahead_prices.get((b, t))
-                for t in range(24)
+        # save the newest da prices, the oldest day is dropped once the storage is full
+        day_ahead_prices = day_ahead_result.ruc_market.day_ahead_prices
+        self._historical_da_prices.append_day(
+            [
+                [day_ahead_prices.get((b, t)) for t in range(24)]
+                for b in self._historical_da_prices
             ]
-
-            # drop oldest historical prices if total stored data exceeded the upper bound
-            while len(self._historical_da_prices[b]) // 24 > self.max_historical_days:
-                self._historical_da_prices[b] = self._historical_da_prices[b][24:]
+        )
 
         return
@@ -14,6 +14,7 @@ import pyomo.environ as pyo
 from pyomo.common.timing import TicTocTimer
 from idaes.core.solvers import get_solver
 from idaes.core.util import from_json, to_json
+from idaes.core.util.model_serializer import CompiledStoreSpec
 import matplotlib.pyplot as plt
 import logging
 
@@ -39,6 +40,10 @@ class MultiPeriodModel(pyo.ConcreteModel):
         initialization_func: function that fixes the degrees of freedom and initializes an
                              instance of the flowsheet.
         unfix_dof_func: function that unfixes a few degrees of freedom for optimization
+        period_data_func: function that applies the data of one time period to a
+                          cloned or recycled instance of the flowsheet. If not
+                          provided, each keyword is taken to be the name of a
+                          mutable Param (or Var) whose value is set.
         flowsheet_options: dictionary containing the arguments needed for `process_model_func`
         initialization_options: dictionary containing the arguments needed for `initialization_func`
         unfix_dof_options: dictionary containing the arguments needed for `unfix_dof_func`
@@ -61,6 +66,7 @@ class MultiPeriodModel(pyo.ConcreteModel):
         set_scenarios=None,
         initialization_func=None,
         unfix_dof_func=None,
+        period_data_func=None,
         flowsheet_options=None,
         initialization_options=None,
         unfix_dof_options=None,
@@ -84,10 +90,14 @@ class MultiPeriodModel(pyo.ConcreteModel):
         self.get_periodic_variable_pairs = periodic_variable_func
         self.initialization_func = initialization_func
         self.unfix_dof_func = unfix_dof_func
+        if period_data_func is None:
+            period_data_func = self._set_period_data
+        self.set_period_data = period_data_func
         # self.get_state_variable_pairs = state_variable_func
 
         # populated on 'build_multi_period_model'
         self._first_active_time = None
+        self._use_cloning = False
 
         # Create sets
         if use_stochastic_build:
@@ -139,6 +149,7 @@ class MultiPeriodModel(pyo.ConcreteModel):
         initialization_options=None,
         unfix_dof_options=None,
         solver=None,
+        use_cloning=False,
     ):
         """
         Build a multi-period capable model using user-provided functions
@@ -152,6 +163,11 @@ class MultiPeriodModel(pyo.ConcreteModel):
             initialization_options: dict containing the arguments needed for `initialization_func`
             unfix_dof_options: dict containing the arguments needed for `unfix_dof_func`
             solver: pyomo solver object
+            use_cloning: if True, the flowsheet is constructed only for the
+                         first time period and the remaining periods are
+                         clones of it, updated with `period_data_func`.
+                         `advance_time` then recycles the oldest block
+                         instead of constructing a new flowsheet.
         """
         if flowsheet_options is None:
             flowsheet_options = {}
@@ -175,9 +191,27 @@ class MultiPeriodModel(pyo.ConcreteModel):
 
         # create user defined steady-state models. Each block is a multi-period capable model.
         m.blocks = pyo.Block(m.TIME)
-        for t in m.TIME:
-            _logger.info(f"...Constructing the flowsheet model for {m.blocks[t].name}")
-            m.blocks[t].process = self.create_process_model(**model_data_kwargs[t])
+        self._use_cloning = use_cloning
+        if use_cloning:
+            first_time = m.TIME.first()
+            _logger.info(
+                f"...Constructing the flowsheet model for {m.blocks[first_time].name}"
+            )
+            template = self.create_process_model(**model_data_kwargs[first_time])
+            for t in m.TIME:
+                if t == first_time:
+                    continue
+                _logger.info(f"...Cloning the flowsheet model for {m.blocks[t].name}")
+                m.blocks[t].process = template.clone()
+                self.set_period_data(m.blocks[t].process, **model_data_kwargs[t])
+            m.blocks[first_time].process = template
+
+        else:
+            for t in m.TIME:
+                _logger.info(
+                    f"...Constructing the flowsheet model for {m.blocks[t].name}"
+                )
+                m.blocks[t].process = self.create_process_model(**model_data_kwargs[t])
 
         timer.toc("Completed the formulation of the multiperiod optimization problem.")
 
@@ -215,7 +249,9 @@ class MultiPeriodModel(pyo.ConcreteModel):
 
         Arguments:
             model_data_kwargs: keyword arguments passed to user provided
-                               `create_process_model` function
+                               `create_process_model` function, or to
+                               `period_data_func` if the model was built
+                               with `use_cloning=True`
         """
         m = self
         previous_time = self._first_active_time
@@ -230,8 +266,25 @@ class MultiPeriodModel(pyo.ConcreteModel):
         # populate new time for the end of the horizon
         last_time = m.TIME.last()
         new_time = last_time + 1
-        m.TIME.add(new_time)
-        m.blocks[new_time].process = self.create_process_model(**model_data_kwargs)
+
+        if self._use_cloning:
+            # detach the flowsheet of the previous time and drop its coupling
+            process = m.blocks[previous_time].process
+            m.blocks[previous_time].del_component(process)
+            del m.blocks[previous_time]
+            m.TIME.remove(previous_time)
+            for name in ("link_constraints", "periodic_constraints"):
+                if process.component(name) is not None:
+                    process.del_component(name)
+
+            m.TIME.add(new_time)
+            m.blocks[new_time].process = process
+            process.activate()
+            self.set_period_data(process, **model_data_kwargs)
+
+        else:
+            m.TIME.add(new_time)
+            m.blocks[new_time].process = self.create_process_model(**model_data_kwargs)
 
         # sequential time coupling
         link_variable_pairs = self.get_linking_variable_pairs(
@@ -283,6 +336,26 @@ class MultiPeriodModel(pyo.ConcreteModel):
         """
         return [b.process for b in self.blocks.values() if b.process.active]
 
+    @staticmethod
+    def _set_period_data(b1, **model_data_kwargs):
+        """
+        Default `period_data_func`: set the value of the component of `b1`
+        named by each keyword. Indexed components expect a dict of values.
+        """
+        for name, val in model_data_kwargs.items():
+            comp = b1.find_component(name)
+            if comp is None:
+                raise Exception(
+                    f"Component {name} does not exist on {b1.name}. Provide "
+                    f"period_data_func to apply the data of each time period."
+                )
+
+            if comp.is_indexed():
+                for idx, v in val.items():
+                    comp[idx].set_value(v)
+            else:
+                comp.set_value(val)
+
     def _create_linking_constraints(self, b1, variable_pairs):
         """
         Create linking constraint on `b1` using `variable_pairs`
@@ -472,25 +545,34 @@ class MultiPeriodModel(pyo.ConcreteModel):
                 "initialization_func argument."
             )
 
-        # Store the initialized model in `init_model` object
-        init_model = to_json(blk, return_dict=True)
+        # Index the state of the initialized model once, then broadcast it to
+        # all the period blocks that share its structure.
+        init_state = CompiledStoreSpec(blk)
+        init_arrays = init_state.to_arrays()
         timer.toc("Created an instance of the flowsheet and initialized it.")
 
         # Initialize the multiperiod optimization model
         if use_stochastic_build:
             if self._stochastic_model:
-                for s in self.set_scenarios:
-                    for p in self.scenario[s].period:
-                        from_json(self.scenario[s].period[p], sd=init_model)
+                blks = [
+                    self.scenario[s].period[p]
+                    for s in self.set_scenarios
+                    for p in self.scenario[s].period
+                ]
 
             else:
-                for p in self.period:
-                    from_json(self.period[p], sd=init_model)
+                blks = [self.period[p] for p in self.period]
 
         else:
             blks = self.get_active_process_blocks()
-            for blk in blks:
-                from_json(blk, init_model)
+
+        _, skipped = init_state.broadcast(blks, arrays=init_arrays, strict=False)
+
+        # Blocks that differ in structure from the template are loaded by name
+        if skipped:
+            init_model = to_json(blk, return_dict=True)
+            for b in skipped:
+                from_json(b, sd=init_model)
 
         timer.toc("Initialized the entire multiperiod optimization model.")
 
@@ -301,6 +301,10 @@ def test_multi_period_stochastic_model(build_multi_period_stochastic_model):
         for j in [1, 2, 3, 4]:
             assert hasattr(m.scenario[i].link_constraints[j], "link_constraints")
 
+        # the initialized state is broadcast to every period
+        for j in [1, 2, 3, 4, 5]:
+            assert m.scenario[i].period[j].fs.x.value == pytest.approx(0.5)
+
     assert degrees_of_freedom(m) == 3  # num_scenarios
 
 
@@ -490,3 +494,105 @@ def test_multi_period_model_manual(build_multi_period_model_manual):
     assert len(m.blocks) == 5
 
     assert degrees_of_freedom(m) == 1
+
+
+def build_flowsheet_with_price(m=None, price=1):
+    """This function builds a dummy flowsheet with a mutable price"""
+    m = build_flowsheet(m)
+    m.fs.price = pyo.Param(initialize=price, mutable=True)
+    m.fs.revenue = pyo.Expression(expr=m.fs.price * m.fs.x)
+
+    return m
+
+
+def set_price(m, price):
+    """This function updates the price of a cloned dummy flowsheet"""
+    m.fs.price.set_value(price)
+
+
+@pytest.fixture
+def build_multi_period_model_cloned():
+    m = MultiPeriodModel(
+        n_time_points=4,
+        process_model_func=build_flowsheet_with_price,
+        linking_variable_func=get_linking_variable_pairs,
+        periodic_variable_func=get_linking_variable_pairs,
+        period_data_func=set_price,
+    )
+    m.build_multi_period_model(
+        model_data_kwargs={t: {"price": 10 * t} for t in range(4)},
+        use_cloning=True,
+    )
+    return m
+
+
+@pytest.mark.unit
+def test_multi_period_model_cloned(build_multi_period_model_cloned):
+    m = build_multi_period_model_cloned
+
+    assert len(m.blocks) == 4
+    for t in range(4):
+        assert pyo.value(m.blocks[t].process.fs.price) == 10 * t
+    for t in range(3):
+        assert hasattr(m.blocks[t].process, "link_constraints")
+    assert hasattr(m.blocks[3].process, "periodic_constraints")
+
+    assert degrees_of_freedom(m) == 0
+
+
+@pytest.mark.unit
+def test_advance_time_recycles_blocks(build_multi_period_model_cloned):
+    m = build_multi_period_model_cloned
+    first_process = m.blocks[0].process
+
+    m.advance_time(price=40)
+
+    assert m.current_time == 1
+    assert list(m.TIME) == [1, 2, 3, 4]
+    assert 0 not in m.blocks
+    assert m.blocks[4].process is first_process
+    assert m.blocks[4].process.active
+    assert pyo.value(m.blocks[4].process.fs.price) == 40
+    assert len(m.get_active_process_blocks()) == 4
+
+    # the recycled block only carries the new periodic constraint
+    assert not hasattr(m.blocks[4].process, "link_constraints")
+    assert m.blocks[4].process.periodic_constraints.active
+    assert not m.blocks[3].process.periodic_constraints.active
+    assert (
+        m.blocks[3].process.link_constraints[0].body.to_string()
+        == (m.blocks[3].process.fs.y - m.blocks[4].process.fs.y).to_string()
+    )
+
+    assert degrees_of_freedom(m) == 0
+
+
+@pytest.mark.unit
+def test_cloned_default_period_data():
+    m = MultiPeriodModel(
+        n_time_points=3,
+        process_model_func=build_flowsheet_with_price,
+        linking_variable_func=get_linking_variable_pairs,
+    )
+    m.build_multi_period_model(
+        model_data_kwargs={0: {"price": 2}, 1: {"fs.price": 5}, 2: {}},
+        use_cloning=True,
+    )
+
+    assert [pyo.value(m.blocks[t].process.fs.price) for t in range(3)] == [2, 5, 2]
+
+    m.advance_time(**{"fs.price": 7})
+    assert pyo.value(m.blocks[3].process.fs.price) == 7
+
+
+@pytest.mark.unit
+def test_cloned_period_data_unknown_component():
+    m = MultiPeriodModel(
+        n_time_points=2,
+        process_model_func=build_flowsheet_with_price,
+        linking_variable_func=get_linking_variable_pairs,
+    )
+    with pytest.raises(Exception, match="Component cost does not exist"):
+        m.build_multi_period_model(
+            model_data_kwargs={0: {}, 1: {"cost": 5}}, use_cloning=True
+        )
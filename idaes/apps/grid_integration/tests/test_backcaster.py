@@ -35,8 +35,8 @@ def base_backcaster(historical_da_prices, historical_rt_prices):
 @pytest.mark.unit
 def test_create_backcaster(historical_da_prices, historical_rt_prices):
     backcaster = Backcaster(historical_da_prices, historical_rt_prices)
-    assert backcaster.historical_da_prices is historical_da_prices
-    assert backcaster.historical_rt_prices is historical_rt_prices
+    assert dict(backcaster.historical_da_prices) == historical_da_prices
+    assert dict(backcaster.historical_rt_prices) == historical_rt_prices
 
 
 @pytest.mark.unit
@@ -325,3 +325,64 @@ def test_fetch_day_ahead_stats_from_prescient(base_backcaster, historical_da_pri
         first=expected_historical_da_prices,
         second=base_backcaster._historical_da_prices,
     )
+
+
+@pytest.mark.unit
+def test_forecast_after_buffer_wraps_around(base_backcaster):
+
+    # overwrite the oldest days in the price buffer
+    base_backcaster.max_historical_days = 3
+    for day in [4, 5]:
+        for t in range(24):
+            prescient_hourly_stats = MockPrescientHourlyStats({"test_bus": day * 10})
+            base_backcaster.fetch_hourly_stats_from_prescient(prescient_hourly_stats)
+
+    pyo_unittest.assertStructuredAlmostEqual(
+        first=[30] * 24 + [40] * 24 + [50] * 24,
+        second=base_backcaster.historical_rt_prices["test_bus"],
+    )
+
+    result_forecasts = base_backcaster.forecast_real_time_prices(
+        date=None, hour=20, bus="test_bus", horizon=8, n_samples=4
+    )
+    expected_forecasts = {
+        0: [50] * 4 + [30] * 4,
+        1: [40] * 4 + [50] * 4,
+        2: [30] * 4 + [40] * 4,
+        3: [50] * 4 + [30] * 4,
+    }
+
+    pyo_unittest.assertStructuredAlmostEqual(
+        first=expected_forecasts, second=result_forecasts
+    )
+
+
+@pytest.mark.unit
+def test_reduce_max_historical_days(base_backcaster):
+
+    for t in range(12):
+        prescient_hourly_stats = MockPrescientHourlyStats({"test_bus": 40})
+        base_backcaster.fetch_hourly_stats_from_prescient(prescient_hourly_stats)
+
+    base_backcaster.max_historical_days = 1
+
+    pyo_unittest.assertStructuredAlmostEqual(
+        first=[30] * 24, second=base_backcaster.historical_rt_prices["test_bus"]
+    )
+    pyo_unittest.assertStructuredAlmostEqual(
+        first=[40] * 12, second=base_backcaster._current_day_rt_prices["test_bus"]
+    )
+
+
+@pytest.mark.unit
+def test_historical_prices_contains(base_backcaster, monkeypatch):
+
+    prices = base_backcaster.historical_rt_prices
+
+    # membership is checked without building the price history of the bus
+    def getitem(self, bus):
+        raise AssertionError("prices of the bus should not be built")
+
+    monkeypatch.setattr(type(prices), "__getitem__", getitem)
+    assert "test_bus" in prices
+    assert "other_bus" not in prices
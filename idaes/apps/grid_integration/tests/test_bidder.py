@@ -12,7 +12,7 @@
 #################################################################################
 import pytest
 import pyomo.environ as pyo
-from idaes.apps.grid_integration.bidder import Bidder
+from idaes.apps.grid_integration.bidder import Bidder, SelfScheduler
 from idaes.apps.grid_integration.tests.util import (
     TestingModel,
     TestingForecaster,
@@ -156,6 +156,159 @@ def test_solver_checker():
             )
 
 
+@pytest.mark.unit
+def test_n_workers_checker():
+
+    solver = pyo.SolverFactory("cbc")
+    forecaster = TestingForecaster(prediction=30)
+    bidding_model_object = TestingModel(model_data=testing_model_data)
+
+    with pytest.raises(TypeError, match=r".*should be an integer.*"):
+        Bidder(
+            bidding_model_object=bidding_model_object,
+            day_ahead_horizon=day_ahead_horizon,
+            real_time_horizon=real_time_horizon,
+            n_scenario=n_scenario,
+            solver=solver,
+            forecaster=forecaster,
+            n_workers=2.0,
+        )
+
+    with pytest.raises(ValueError, match=r".*greater than zero.*"):
+        Bidder(
+            bidding_model_object=bidding_model_object,
+            day_ahead_horizon=day_ahead_horizon,
+            real_time_horizon=real_time_horizon,
+            n_scenario=n_scenario,
+            solver=solver,
+            forecaster=forecaster,
+            n_workers=0,
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("n_workers", [None, 2])
+def test_decomposition_coupling_check(monkeypatch, n_workers):
+
+    solver = pyo.SolverFactory("cbc")
+    forecaster = TestingForecaster(prediction=30)
+    bidding_model_object = TestingModel(model_data=testing_model_data)
+    bidder_object = Bidder(
+        bidding_model_object=bidding_model_object,
+        day_ahead_horizon=day_ahead_horizon,
+        real_time_horizon=real_time_horizon,
+        n_scenario=n_scenario,
+        solver=solver,
+        forecaster=forecaster,
+        decomposition=True,
+        n_workers=n_workers,
+    )
+    model = bidder_object.day_ahead_model
+    for i in model.SCENARIOS:
+        assert not model.fs[i].scenario_obj.active
+
+    prices = [[20 + 10 * i] * horizon for i in range(n_scenario)]
+    bidder_object._pass_price_forecasts(model, prices, prices)
+
+    # stand-in for the scenario solves, the power of each scenario is given
+    power = {}
+
+    def solve_scenario(model, i, coordination_data):
+        for t in range(horizon):
+            model.fs[i].day_ahead_power[t] = power[i]
+        return True
+
+    monkeypatch.setattr(bidder_object, "_solve_scenario", solve_scenario)
+
+    # the bids are nondecreasing with the prices
+    power.update({0: 20, 1: 50, 2: 80})
+    assert bidder_object._solve_decomposed(model, "day_ahead_power")
+    assert pyo.value(model.fs[2].day_ahead_power[0]) == 80
+
+    # the bids are not nondecreasing, so the extensive form has to be solved
+    power.update({0: 20, 1: 80, 2: 50})
+    assert not bidder_object._solve_decomposed(model, "day_ahead_power")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("n_workers", [None, 2])
+def test_self_scheduler_progressive_hedging(monkeypatch, n_workers):
+
+    # the scenario subproblems are quadratic, the solver is not called
+    solver = pyo.SolverFactory("gurobi")
+    forecaster = TestingForecaster(prediction=30)
+    bidding_model_object = TestingModel(model_data=testing_model_data)
+    self_scheduler = SelfScheduler(
+        bidding_model_object=bidding_model_object,
+        day_ahead_horizon=day_ahead_horizon,
+        real_time_horizon=real_time_horizon,
+        n_scenario=n_scenario,
+        solver=solver,
+        forecaster=forecaster,
+        decomposition=True,
+        n_workers=n_workers,
+        ph_rho=2.0,
+    )
+    model = self_scheduler.day_ahead_model
+
+    # stand-in for the scenario solves: maximize -(p - target)^2 plus the
+    # progressive hedging terms, which has a closed form solution
+    target = {0: 30, 1: 50, 2: 70}
+
+    def solve_scenario(model, i, coordination_data):
+        b = model.fs[i]
+        self_scheduler._update_scenario_objective(b, i, coordination_data)
+        rho = pyo.value(b.ph_rho)
+        for t in range(horizon):
+            b.day_ahead_power[t] = (
+                2 * target[i]
+                - pyo.value(b.ph_weight[t])
+                + rho * pyo.value(b.ph_average[t])
+            ) / (2 + rho)
+        return True
+
+    monkeypatch.setattr(self_scheduler, "_solve_scenario", solve_scenario)
+
+    assert self_scheduler._solve_decomposed(model, "day_ahead_power")
+    for i in model.SCENARIOS:
+        for t in range(horizon):
+            assert pyo.value(model.fs[i].day_ahead_power[t]) == pytest.approx(
+                50, abs=1e-3
+            )
+            assert pyo.value(model.fs[i].ph_weight[t]) == pytest.approx(
+                2 * (target[i] - 50), abs=1e-2
+            )
+
+    # the multipliers are kept, so the next solve converges immediately
+    assert self_scheduler._solve_decomposed(model, "day_ahead_power")
+
+    # not enough iterations to converge
+    self_scheduler.max_ph_iterations = 1
+    for i in model.SCENARIOS:
+        for t in range(horizon):
+            model.fs[i].ph_weight[t] = 0
+    assert not self_scheduler._solve_decomposed(model, "day_ahead_power")
+
+
+@pytest.mark.unit
+def test_self_scheduler_progressive_hedging_linear_solver():
+
+    # cbc does not support the quadratic scenario subproblems
+    self_scheduler = SelfScheduler(
+        bidding_model_object=TestingModel(model_data=testing_model_data),
+        day_ahead_horizon=day_ahead_horizon,
+        real_time_horizon=real_time_horizon,
+        n_scenario=n_scenario,
+        solver=pyo.SolverFactory("cbc"),
+        forecaster=TestingForecaster(prediction=30),
+        decomposition=True,
+    )
+    assert not self_scheduler.decomposition
+    model = self_scheduler.day_ahead_model
+    for i in model.SCENARIOS:
+        assert not hasattr(model.fs[i], "scenario_obj")
+
+
 @pytest.fixture
 def bidder_object():
 
@@ -359,3 +512,33 @@ def test_compute_RT_bids_pcost(bidder_object_pcost):
     }
 
     pyo_unittest.assertStructuredAlmostEqual(first=expected_bids, second=bids)
+
+
+@pytest.mark.component
+@pytest.mark.skipif(
+    not prescient_avail, reason="Prescient (optional dependency) not available"
+)
+@pytest.mark.parametrize("n_workers", [None, 2])
+def test_compute_DA_bids_decomposition(bidder_object, n_workers):
+
+    bidding_model_object = TestingModel(model_data=testing_model_data)
+    decomposed_bidder = Bidder(
+        bidding_model_object=bidding_model_object,
+        day_ahead_horizon=day_ahead_horizon,
+        real_time_horizon=real_time_horizon,
+        n_scenario=n_scenario,
+        solver=pyo.SolverFactory("cbc"),
+        forecaster=TestingForecaster(prediction=30),
+        decomposition=True,
+        n_workers=n_workers,
+    )
+    marginal_cost = bidder_object.bidding_model_object.marginal_cost
+    date = "2021-08-20"
+
+    for shift in [-1, 1]:
+        bidder_object.forecaster.prediction = marginal_cost + shift
+        decomposed_bidder.forecaster.prediction = marginal_cost + shift
+        bids = bidder_object.compute_day_ahead_bids(date=date, hour=0)
+        decomposed_bids = decomposed_bidder.compute_day_ahead_bids(date=date, hour=0)
+
+        pyo_unittest.assertStructuredAlmostEqual(first=bids, second=decomposed_bids)
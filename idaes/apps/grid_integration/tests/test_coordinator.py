@@ -97,6 +97,34 @@ def test_static_params(coordinator_object):
     coordinator_object._update_static_params(gen_dict)
 
 
+@pytest.mark.unit
+def test_clone_tracking_model(coordinator_object):
+    tracker_model = coordinator_object.tracker.model
+    proj_model = coordinator_object.projection_tracker.model
+
+    tracker_model.fs.P_T[1] = 42.123456
+    tracker_model.fs.pre_P_T = 35
+    tracker_model.power_dispatch[2] = 50
+    coordinator_object._clone_tracking_model()
+
+    assert pyo.value(proj_model.fs.P_T[1]) == 42.1235
+    assert pyo.value(proj_model.fs.pre_P_T) == 35
+    assert pyo.value(proj_model.power_dispatch[2]) == 50
+
+    # the paired data are reused
+    pairs = coordinator_object._tracking_model_pairs
+    tracker_model.fs.P_T[1] = 40
+    coordinator_object._clone_tracking_model()
+    assert coordinator_object._tracking_model_pairs is pairs
+    assert pyo.value(proj_model.fs.P_T[1]) == 40
+
+    # the models diverge
+    coordinator_object._tracking_model_pairs = None
+    proj_model.x = pyo.Var()
+    with pytest.raises(ValueError, match=r".*do not have the same name.*"):
+        coordinator_object._clone_tracking_model()
+
+
 @pytest.mark.unit
 def test_assemble_sced_tracking_market_signals(coordinator_object):
 
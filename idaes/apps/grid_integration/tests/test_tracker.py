@@ -12,6 +12,7 @@
 #################################################################################
 import pytest
 import pyomo.environ as pyo
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
 from idaes.apps.grid_integration.tracker import Tracker
 from idaes.apps.grid_integration.tests.util import TestingModel, testing_model_data
 
@@ -49,6 +50,45 @@ class TestMissingModel:
                 setattr(self, a, self.attr_dict[a])
 
 
+class FakePersistentSolver(PersistentSolver):
+
+    """
+    A persistent solver that records the changes passed to it, and "solves"
+    the tracking problem by following the dispatch signals.
+    """
+
+    def __init__(self):
+        super().__init__(type="fake_persistent")
+        self.calls = []
+
+    def set_instance(self, model, **kwds):
+        self._pyomo_model = model
+        self.calls.append(("set_instance", model))
+
+    def add_constraint(self, con):
+        self.calls.append(("add_constraint", con))
+
+    def remove_constraint(self, con):
+        self.calls.append(("remove_constraint", con))
+
+    def set_objective(self, obj):
+        self.calls.append(("set_objective", obj))
+
+    def update_var(self, var):
+        self.calls.append(("update_var", var))
+
+    def warm_start_capable(self):
+        return True
+
+    def solve(self, *args, **kwds):
+        model = self._pyomo_model
+        assert args[0] is model
+        self.calls.append(("solve", kwds["warmstart"]))
+        for t, c in model.tracking_dispatch_constraints.items():
+            if c.active:
+                model.fs.P_T[t] = pyo.value(model.power_dispatch[t])
+
+
 horizon = 4
 
 
@@ -192,3 +232,54 @@ def test_track_deviation_penalty(tracker_object):
         assert pytest.approx(
             large_penalty / (horizon - tracker_object.n_tracking_hour)
         ) == pyo.value(tracker_object.model.deviation_penalty[t])
+
+
+@pytest.mark.unit
+def test_track_market_dispatch_persistent():
+    solver = FakePersistentSolver()
+    tracking_model_object = TestingModel(model_data=testing_model_data)
+    tracker_object = Tracker(
+        tracking_model_object=tracking_model_object,
+        tracking_horizon=horizon,
+        n_tracking_hour=1,
+        solver=solver,
+        warm_start=True,
+    )
+    model = tracker_object.model
+    cons = model.tracking_dispatch_constraints
+    assert solver.calls == [("set_instance", model)]
+
+    # only the constraints with new dispatch signals are passed to the solver
+    solver.calls.clear()
+    market_dispatch = [30, 40, 0]
+    tracker_object.track_market_dispatch(
+        market_dispatch=market_dispatch, date="2021-07-26", hour="17:00"
+    )
+    assert solver.calls == [
+        ("remove_constraint", cons[0]),
+        ("add_constraint", cons[0]),
+        ("remove_constraint", cons[1]),
+        ("add_constraint", cons[1]),
+        ("remove_constraint", cons[3]),
+        ("solve", True),
+    ]
+    assert pyo.value(model.fs.P_T[1]) == 40
+
+    # nothing changed
+    solver.calls.clear()
+    tracker_object.track_market_dispatch(
+        market_dispatch=market_dispatch, date="2021-07-26", hour="18:00"
+    )
+    assert solver.calls == [("solve", True)]
+
+    # reactivated constraint and fixed variable
+    solver.calls.clear()
+    model.fs.P_T[0].fix(30)
+    tracker_object.track_market_dispatch(
+        market_dispatch=[30, 40, 0, 0], date="2021-07-26", hour="19:00"
+    )
+    assert solver.calls == [
+        ("add_constraint", cons[3]),
+        ("update_var", model.fs.P_T[0]),
+        ("solve", True),
+    ]
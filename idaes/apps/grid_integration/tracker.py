@@ -12,9 +12,20 @@
 #################################################################################
 import pandas as pd
 import pyomo.environ as pyo
+from pyomo.common.collections import ComponentMap
+from pyomo.core.expr.visitor import identify_mutable_parameters
 from pyomo.opt.base.solvers import OptSolver
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
 import os
 
+# Ipopt options to start from the primal and dual solution of the previous solve
+_ipopt_warm_start_options = {
+    "warm_start_init_point": "yes",
+    "warm_start_bound_push": 1e-8,
+    "warm_start_mult_bound_push": 1e-8,
+    "mu_init": 1e-6,
+}
+
 
 class Tracker:
 
@@ -24,7 +35,12 @@ class Tracker:
     """
 
     def __init__(
-        self, tracking_model_object, tracking_horizon, n_tracking_hour, solver
+        self,
+        tracking_model_object,
+        tracking_horizon,
+        n_tracking_hour,
+        solver,
+        warm_start=False,
     ):
 
         """
@@ -37,7 +53,9 @@ class Tracker:
 
             n_tracking_hour: number of implemented hours after each solve
 
-            solver: a Pyomo mathematical programming solver object
+            solver: a Pyomo mathematical programming solver object. If it is a persistent solver, the tracking problem is loaded into it once and only the changes are passed to it before each solve.
+
+            warm_start: if True, warm start each solve from the previous solution, i.e., the primal and dual solution for Ipopt, or the primal solution for persistent solvers that support it
 
         Returns:
             None
@@ -48,6 +66,7 @@ class Tracker:
         self.tracking_horizon = tracking_horizon
         self.n_tracking_hour = n_tracking_hour
         self.solver = solver
+        self.warm_start = warm_start
         self._check_inputs()
 
         # add flowsheet to model
@@ -64,6 +83,14 @@ class Tracker:
 
         self.formulate_tracking_problem()
 
+        self._persistent = isinstance(self.solver, PersistentSolver)
+        self._warm_start_options = None
+        self._has_warm_start = False
+        if self._persistent:
+            self._set_up_persistent_solver()
+        elif self.warm_start and getattr(self.solver, "name", None) == "ipopt":
+            self._add_warm_start_suffixes()
+
         self.daily_stats = None
         self.projection = None
 
@@ -312,7 +339,7 @@ class Tracker:
         self._pass_market_dispatch(market_dispatch)
 
         # solve the model
-        self.solver.solve(self.model, tee=False)
+        self._solve()
 
         self.record_results(date=date, hour=hour)
 
@@ -325,6 +352,157 @@ class Tracker:
 
         return profiles
 
+    def _solve(self):
+
+        """
+        Solve the tracking problem. A persistent solver only receives the
+        changes to the model since the last solve, and if warm start is
+        enabled, the previous solution is used as the starting point.
+
+        Arguments:
+            None
+
+        Returns:
+            None
+        """
+
+        if self._persistent:
+            self._update_persistent_solver()
+            warm_start = self.warm_start and self.solver.warm_start_capable()
+            self.solver.solve(self.model, tee=False, warmstart=warm_start)
+
+        elif self._warm_start_options is not None:
+            if self._has_warm_start:
+                results = self.solver.solve(
+                    self.model, tee=False, options=self._warm_start_options
+                )
+            else:
+                results = self.solver.solve(self.model, tee=False)
+
+            # the multipliers of an optimal solve are the starting point of the next
+            self._has_warm_start = pyo.check_optimal_termination(results)
+            if self._has_warm_start:
+                self.model.ipopt_zL_in.update(self.model.ipopt_zL_out)
+                self.model.ipopt_zU_in.update(self.model.ipopt_zU_out)
+
+        else:
+            self.solver.solve(self.model, tee=False)
+
+        return
+
+    def _add_warm_start_suffixes(self):
+
+        """
+        Add the suffixes to pass the dual solution of a solve to the next one
+        for Ipopt.
+
+        Arguments:
+            None
+
+        Returns:
+            None
+        """
+
+        self.model.ipopt_zL_out = pyo.Suffix(direction=pyo.Suffix.IMPORT)
+        self.model.ipopt_zU_out = pyo.Suffix(direction=pyo.Suffix.IMPORT)
+        self.model.ipopt_zL_in = pyo.Suffix(direction=pyo.Suffix.EXPORT)
+        self.model.ipopt_zU_in = pyo.Suffix(direction=pyo.Suffix.EXPORT)
+        self.model.dual = pyo.Suffix(direction=pyo.Suffix.IMPORT_EXPORT)
+        self._warm_start_options = dict(_ipopt_warm_start_options)
+
+        return
+
+    @staticmethod
+    def _var_state(v):
+        return (v.fixed, v.lb, v.ub, v.value if v.fixed else None)
+
+    def _set_up_persistent_solver(self):
+
+        """
+        Load the tracking problem into the persistent solver, and record which
+        constraints and objectives depend on each mutable parameter, so only
+        those need to be passed to the solver again when the parameter values
+        change.
+
+        Arguments:
+            None
+
+        Returns:
+            None
+        """
+
+        self.solver.set_instance(self.model)
+
+        self._param_dependents = ComponentMap()
+        self._constraint_active = ComponentMap()
+        for c in self.model.component_data_objects(
+            (pyo.Constraint, pyo.Objective), descend_into=True
+        ):
+            if c.ctype is pyo.Constraint:
+                self._constraint_active[c] = c.active
+            for p in identify_mutable_parameters(c.expr):
+                self._param_dependents.setdefault(p, []).append(c)
+
+        self._param_values = ComponentMap(
+            (p, pyo.value(p)) for p in self._param_dependents
+        )
+        self._var_states = ComponentMap(
+            (v, self._var_state(v))
+            for v in self.model.component_data_objects(pyo.Var, descend_into=True)
+        )
+
+        return
+
+    def _update_persistent_solver(self):
+
+        """
+        Pass the changes to the model since the last solve to the persistent
+        solver, i.e., constraints and objectives with updated mutable
+        parameters, activated or deactivated constraints, and fixed, unfixed or
+        rebounded variables.
+
+        Arguments:
+            None
+
+        Returns:
+            None
+        """
+
+        changed = []
+        for p, old_value in self._param_values.items():
+            new_value = pyo.value(p)
+            if new_value != old_value:
+                self._param_values[p] = new_value
+                changed.extend(self._param_dependents[p])
+
+        changed_objective = False
+        changed_constraints = ComponentMap()
+        for c in changed:
+            if c.ctype is pyo.Objective:
+                changed_objective = True
+            else:
+                changed_constraints[c] = None
+
+        for c, was_active in self._constraint_active.items():
+            if c.active == was_active and c not in changed_constraints:
+                continue
+            if was_active:
+                self.solver.remove_constraint(c)
+            if c.active:
+                self.solver.add_constraint(c)
+            self._constraint_active[c] = c.active
+
+        if changed_objective:
+            self.solver.set_objective(self.model.obj)
+
+        for v, old_state in self._var_states.items():
+            new_state = self._var_state(v)
+            if new_state != old_state:
+                self.solver.update_var(v)
+                self._var_states[v] = new_state
+
+        return
+
     def _record_daily_stats(self, profiles):
 
         """
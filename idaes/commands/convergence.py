@@ -11,16 +11,19 @@
 # for full copyright and license information.
 #################################################################################
 """Commandline interface for convergence testing tools"""
-# This code is deprecated
+# The convergence-sample and convergence-search commands are deprecated
 # pylint: disable=missing-function-docstring
 
 __author__ = "John Eslick"
 
+import importlib
+
 import click
 from pyomo.common.dependencies import attempt_import
 from idaes.commands import cb
 
 cnv = attempt_import("idaes.core.util.convergence.convergence_base")[0]
+dmf_mod = attempt_import("idaes.core.dmf")[0]
 
 
 @cb.command(name="convergence-sample", help="Create a convergence sample file.")
@@ -113,12 +116,63 @@ def convergence_sample(
     type=str,
     help="Run only a single sample with given name",
 )
+@click.option(
+    "-n",
+    "--workers",
+    default=None,
+    type=int,
+    help="Evaluate samples with this many local processes instead of MPI",
+)
+@click.option(
+    "--timeout",
+    default=None,
+    type=float,
+    help="Maximum time in seconds to evaluate a sample in a local process",
+)
+@click.option(
+    "--results-file",
+    default=None,
+    type=str,
+    help="File to save sample results to as they complete, and to resume from",
+)
 def convergence_eval(
-    sample_file, dmf, report_file, json_file, convergence_module, single_sample
+    sample_file,
+    dmf,
+    report_file,
+    json_file,
+    convergence_module,
+    single_sample,
+    workers,
+    timeout,
+    results_file,
 ):
-    click.echo(
-        "The command line interface for convergence testing has been deprecated and no longer works. "
-        "A new API has been added to run convergence tests directly from the ConvergenceEvaluation object."
+    if convergence_module is not None:
+        importlib.import_module(convergence_module)
+    if single_sample is not None:
+        (
+            _,
+            solved,
+            iters,
+            iters_in_restoration,
+            iters_w_regularization,
+            time,
+        ) = cnv.run_single_sample_from_sample_file(sample_file, single_sample)
+        click.echo(
+            f"Sample: {single_sample}, solved: {solved}, iterations: {iters}, "
+            f"restoration iterations: {iters_in_restoration}, "
+            f"regularization iterations: {iters_w_regularization}, time: {time}"
+        )
+        return
+    inputs, _, results = cnv.run_convergence_evaluation_from_sample_file(
+        sample_file, n_workers=workers, timeout=timeout, results_file=results_file
+    )
+    # only the root MPI process has the results
+    if results is None:
+        return
+    if dmf is not None:
+        dmf = dmf_mod.DMF(dmf)
+    cnv.save_convergence_statistics(
+        inputs, results, dmf=dmf, json_path=json_file, report_path=report_file
     )
 
 
@@ -17,6 +17,7 @@ Tests for idaes.commands
 from functools import partial
 import json
 import logging
+import multiprocessing
 import os
 from pathlib import Path
 from shutil import rmtree
@@ -217,6 +218,54 @@ def test_conf_set(runner):
     _tst(["--file", fname])
 
 
+###############
+# convergence #
+###############
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="Test replaces the solve in forked worker processes",
+)
+@pytest.mark.unit
+def test_convergence_eval_workers(runner, monkeypatch, tmp_path):
+    import idaes.core.util.convergence.convergence_base as cb
+
+    ceval_str = (
+        "idaes.core.util.convergence.tests."
+        "conv_eval_classes.ConvEvalFixedVarMutableParam"
+    )
+    ceval = cb._class_import(ceval_str)()
+    sample_file = str(tmp_path / "samples.json")
+    cb.write_sample_file(ceval.get_specification(), sample_file, ceval_str, 3, seed=42)
+    monkeypatch.setattr(
+        cb,
+        "_run_ipopt_with_stats",
+        lambda model, solver, **kwargs: (None, True, 5, 0, 0, 0.1),
+    )
+    results_file = str(tmp_path / "results.jsonl")
+    json_file = str(tmp_path / "stats.json")
+    result = runner.invoke(
+        convergence.convergence_eval,
+        [
+            "-s",
+            sample_file,
+            "-j",
+            json_file,
+            "-n",
+            "2",
+            "--timeout",
+            "30",
+            "--results-file",
+            results_file,
+        ],
+    )
+    assert result.exit_code == 0
+    with open(results_file) as f:
+        assert len(f.readlines()) == 3
+    assert cb.Stats(from_json=json_file).iters_max == 5
+
+
 ##############
 # env info   #
 ##############
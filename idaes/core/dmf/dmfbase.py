@@ -312,7 +312,7 @@ class DMF(workspace.Workspace, HasTraits):
                 raise errors.WorkspaceError(msg)
         # set up rest of DMF
         path = os.path.join(self.root, self.db_file)
-        self._db = resourcedb.ResourceDB(path)
+        self._db = resourcedb.ResourceDB.create(path)
         self._datafile_path = os.path.join(self.root, self.datafile_dir)
         if not os.path.exists(self._datafile_path):
             os.mkdir(self._datafile_path, 0o750)
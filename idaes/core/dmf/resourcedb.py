@@ -15,8 +15,11 @@ Resource database.
 """
 # system
 from datetime import datetime
+import json
 import logging
+import os
 import re
+import sqlite3
 
 # third party
 from tinydb import TinyDB, Query
@@ -32,7 +35,16 @@ _log = logging.getLogger(__name__)
 
 
 class ResourceDB(object):
-    """A database interface to all the resources within a given DMF workspace."""
+    """A database interface to all the resources within a given DMF workspace.
+
+    Resources are stored with TinyDB. The relations between resources are also
+    kept in an index, maintained by :meth:`put`, :meth:`update` and :meth:`delete`,
+    so that :meth:`find_related` only visits the related resources. The index is
+    built on first use, and rebuilt if the database file is changed by another
+    process.
+
+    For large workspaces, see :class:`SQLiteResourceDB`.
+    """
 
     def __init__(self, dbfile=None, connection=None):
         """Initialize from DMF and given configuration field.
@@ -49,6 +61,8 @@ class ResourceDB(object):
         """
         self._db = None
         self._gr = None
+        self._dbfile = None
+        self._index, self._index_stamp = None, None
 
         if connection is not None:
             self._db = connection
@@ -59,6 +73,34 @@ class ResourceDB(object):
                 raise errors.FileError('Cannot open resource DB "{}"'.format(dbfile))
             # turn off caching, otherwise update() does not work properly
             self._db = db.table("resources", cache_size=0)
+            self._dbfile = dbfile
+
+    @staticmethod
+    def create(dbfile):
+        """Create the resource database for a file. An existing, non-empty file
+        is opened with SQLite if it starts with the SQLite file header, and with
+        TinyDB otherwise. A new file uses SQLite if its extension is one of
+        :attr:`SQLiteResourceDB.EXTENSIONS` and TinyDB otherwise.
+
+        Args:
+            dbfile (str): DB location
+
+        Returns:
+            ResourceDB: Resource database
+        """
+        path = str(dbfile)
+        if os.path.isfile(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                use_sqlite = f.read(len(SQLiteResourceDB.HEADER)) == (
+                    SQLiteResourceDB.HEADER
+                )
+        else:
+            use_sqlite = (
+                os.path.splitext(path)[1].lower() in SQLiteResourceDB.EXTENSIONS
+            )
+        if use_sqlite:
+            return SQLiteResourceDB(dbfile)
+        return ResourceDB(dbfile)
 
     def __len__(self):
         return len(self._db)
@@ -250,45 +292,45 @@ class ResourceDB(object):
         """
         if maxdepth <= 0:
             maxdepth = 9223372036854775807
-        # Get an iterator over all the resources, optionally
-        # filtered by an expression, as for find().
+        index = self._relation_index()
+        # Get all the resources that may be reached in one read, and keep
+        # those matching the filter, as for find().
+        doc_ids = [
+            index.doc_ids[uuid] for uuid in index.reachable(id_, outgoing, maxdepth)
+        ]
+        records = {}
+        if doc_ids:
+            for rsrc in self._db.get(doc_ids=doc_ids):
+                records[rsrc[Resource.ID_FIELD]] = rsrc
         if filter_dict:
             filter_expr = self._create_filter_expr(filter_dict)
-            resource_list = self._db.search(filter_expr)
-        else:
-            resource_list = self._db.all()
-        # build adjacency list representing connections between resources
-        relation_map = {}
-        for rsrc in resource_list:
-            # print(f"@@ process resource: {rsrc[Resource.ID_FIELD]}")
-            # print(f"@@ resource relations: {rsrc['relations']}")
-            for rrel in rsrc["relations"]:
-                uuid = rsrc[Resource.ID_FIELD]
-                rel = triple_from_resource_relations(uuid, rrel)
-                # skip start of edge, get metadata, etc. at end of edge
-                if (outgoing and rel.subject == uuid) or (
-                    not outgoing and rel.object == uuid
-                ):
-                    # print(f"@@ do nothing for: {uuid}")
-                    continue
-                # add entry in map
-                key = rel.subject if outgoing else rel.object
-                # print(f"@@ add to relation map, key={key}")
-                meta_info = {k: rsrc[k] for k in meta}
-                value = (rel.subject, rel.predicate, rel.object, meta_info)
-                value_list = relation_map.get(key, None)
-                if value_list is None:
-                    relation_map[key] = [value]
-                else:
-                    value_list.append(value)
-        _log.debug(f"built relation map: {relation_map}")
-        # stop if there are no connections
-        if id_ not in relation_map:
-            return
-        # Do a depth-first search through the edges, yield-ing
-        # the relations as we go
+            records = {k: v for k, v in records.items() if filter_expr(v)}
+
+        def relations(key):
+            result = []
+            for end_id, rel in index.relations(key, outgoing):
+                if end_id in records:
+                    meta_info = {k: records[end_id][k] for k in meta}
+                    result.append((rel.subject, rel.predicate, rel.object, meta_info))
+            return result
+
+        yield from self._search_related(id_, relations, outgoing, maxdepth)
+
+    @staticmethod
+    def _search_related(id_, relations, outgoing, maxdepth):
+        """Search the relations from a resource, breadth-first.
+
+        Args:
+            id_ (str): Unique ID of target resource.
+            relations: Function returning the list of relations, as tuples
+                (subject, predicate, object, metadata), to follow from a resource
+            outgoing: Direction of the relations
+            maxdepth: Maximum depth of search
+        Returns:
+            Generator of (depth, relation, metadata)
+        """
         q, depth, visited = [], 0, set()
-        q.extend(relation_map[id_])
+        q.extend(relations(id_))
         visited.add(id_)
         while len(q) > 0 and depth < maxdepth:
             depth += 1
@@ -301,14 +343,42 @@ class ResourceDB(object):
                     # Follow relations from subject or object, depending on
                     # the "direction" that we are searching.
                     next_id = relation.object if outgoing else relation.subject
-                    # If there are relations, and we haven't already been to
-                    # this node, add them at the end of the queue; we will
-                    # visit them at the next depth increment.
-                    if next_id in relation_map and next_id not in visited:
-                        q.extend(relation_map[next_id])
+                    # If we haven't already been to this node, add its relations
+                    # at the end of the queue; we will visit them at the next
+                    # depth increment.
+                    if next_id not in visited:
+                        q.extend(relations(next_id))
                         visited.add(next_id)
             q = q[n:]  # pop off all the nodes we just visited
 
+    def _relation_index(self):
+        """Get the relation index, building it if missing or out of date."""
+        if self._index is None or self._index_stamp != self._file_stamp():
+            _log.debug("build relation index")
+            index = _RelationIndex()
+            for rsrc in self._db.all():
+                index.add(rsrc, rsrc.doc_id)
+            self._index, self._index_stamp = index, self._file_stamp()
+        return self._index
+
+    def _current_index(self):
+        """Get the relation index to maintain when the database is changed,
+        or None if it is not built yet or out of date.
+        """
+        if self._index is not None and self._index_stamp != self._file_stamp():
+            self._index = None
+        return self._index
+
+    def _file_stamp(self):
+        # Modification time and size of the DB file, to detect changes
+        if self._dbfile is None:
+            return None
+        try:
+            st = os.stat(self._dbfile)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
     def get(self, identifier):
         """Get a resource by identifier.
 
@@ -348,7 +418,11 @@ class ResourceDB(object):
         if self._db.contains(qry.id_ == resource.id):
             raise errors.DuplicateResourceError("put", resource.id)
         # add resource
-        self._db.insert(resource.v)
+        index = self._current_index()
+        doc_id = self._db.insert(resource.v)
+        if index is not None:
+            index.add(resource.v, doc_id)
+            self._index_stamp = self._file_stamp()
 
     def delete(self, id_=None, idlist=None, filter_dict=None, internal_ids=False):
         """Delete one or more resources with given identifiers.
@@ -364,9 +438,10 @@ class ResourceDB(object):
         Returns:
             (list[str]) Identifiers
         """
+        index = self._current_index()
         if internal_ids:
             doc_ids = idlist if idlist else [id_]
-            self._db.remove(doc_ids=doc_ids)
+            removed = self._db.remove(doc_ids=doc_ids)
         else:
             ID = Resource.ID_FIELD
             if filter_dict:
@@ -377,7 +452,11 @@ class ResourceDB(object):
                 cond = self._create_filter_expr({ID: [idlist]})
             else:
                 return
-            self._db.remove(cond=cond)
+            removed = self._db.remove(cond=cond)
+        if index is not None:
+            for doc_id in removed:
+                index.remove_doc(doc_id)
+            self._index_stamp = self._file_stamp()
 
     def update(self, id_, new_dict):
         """Update the identified resource with new values.
@@ -410,4 +489,376 @@ class ResourceDB(object):
             elif old.v[k] != v:
                 changed[k] = v
         _log.debug(f"update resource {id_} with new values: {changed}")
+        self._update_resource(old, changed)
+
+    def _update_resource(self, old, changed):
+        """Update stored resource with changed values.
+
+        Args:
+            old (Resource): Stored resource
+            changed (dict): Changed values
+        Returns:
+            None
+        """
+        index = self._current_index()
+        id_cond = {Resource.ID_FIELD: old.id}
         self._db.update(changed, self._create_filter_expr(id_cond))
+        if index is not None:
+            index.add(dict(old.v, **changed), old.v["doc_id"])
+            self._index_stamp = self._file_stamp()
+
+
+class SQLiteResourceDB(ResourceDB):
+    """A database interface to the resources of a DMF workspace, stored with SQLite.
+
+    Resources are stored as JSON documents, with indexed columns for their
+    identifier and type, and the relations between resources are stored in an
+    indexed table, so :meth:`find_related` only queries the related resources.
+    Filters on the identifier or type of resources in :meth:`find` are done with
+    the indexes, and other filters are applied to the documents, with the same
+    syntax and results as for :class:`ResourceDB`.
+    """
+
+    #: Extensions of DB files stored with SQLite, see :meth:`ResourceDB.create`
+    EXTENSIONS = (".sqlite", ".sqlite3")
+
+    #: Header at the start of SQLite database files
+    HEADER = b"SQLite format 3\x00"
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS resources (
+            doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id_ TEXT NOT NULL UNIQUE,
+            type TEXT,
+            doc TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS resources_type ON resources (type);
+        CREATE TABLE IF NOT EXISTS relations (
+            end_id TEXT NOT NULL,
+            outgoing INTEGER NOT NULL,
+            start_id TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            predicate TEXT NOT NULL,
+            object TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS relations_start ON relations (outgoing, start_id);
+        CREATE INDEX IF NOT EXISTS relations_end ON relations (end_id);
+    """
+
+    def __init__(self, dbfile=None, connection=None):
+        """Initialize from DMF and given configuration field.
+
+        Args:
+            dbfile (str): DB location
+            connection: If non-empty, this is an existing
+                :class:`sqlite3.Connection` that should be re-used, instead of
+                trying to connect to the location in `dbfile`.
+
+        Raises:
+            ValueError, if dbfile and connection are both None
+        """
+        self._gr = None
+        if connection is not None:
+            self._conn = connection
+        elif dbfile is None:
+            raise ValueError("One of 'dbfile' or 'connection' is required")
+        try:
+            if connection is None:
+                self._conn = sqlite3.connect(str(dbfile))
+            self._conn.executescript(self._SCHEMA)
+        except sqlite3.Error as err:
+            raise errors.FileError(f'Cannot open resource DB "{dbfile}": {err}')
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM resources").fetchone()[0]
+
+    def find(self, filter_dict, id_only=False, flags=0):
+        """Find and return records based on the provided filter.
+
+        Args:
+            filter_dict (dict): Search filter. For syntax, see docs in
+                                :meth:`.dmf.DMF.find`.
+            id_only (bool): If true, return only the identifier of each
+                resource; otherwise a Resource object is returned.
+            flags (int): Flag values for, e.g., regex searches
+
+        Returns:
+            generator of int|Resource, depending on the value of `id_only`
+        """
+        filter_expr = None
+        if filter_dict:
+            filter_expr = self._create_filter_expr(filter_dict, flags)
+        where, params = self._indexed_conditions(filter_dict)
+        rows = self._conn.execute(
+            f"SELECT doc_id, doc FROM resources{where} ORDER BY doc_id", params
+        ).fetchall()
+        for doc_id, doc in rows:
+            record = json.loads(doc)
+            if filter_expr is not None and not filter_expr(record):
+                continue
+            if id_only:
+                yield doc_id
+            else:
+                yield self._as_resource(record, doc_id)
+
+    @classmethod
+    def _indexed_conditions(cls, filter_dict):
+        # SQL conditions for equality filters on the indexed columns. The whole
+        # filter is still applied to the documents that are found.
+        clauses, params = [], []
+        for field in Resource.ID_FIELD, Resource.TYPE_FIELD:
+            v = filter_dict.get(field, None) if filter_dict else None
+            if isinstance(v, str) and cls._value_transform(v) == v:
+                clauses.append(f"{field} = ?")
+                params.append(v)
+        if not clauses:
+            return "", params
+        return " WHERE " + " AND ".join(clauses), params
+
+    @staticmethod
+    def _as_resource(record, doc_id):
+        rsrc = Resource(value=record)
+        rsrc.v["doc_id"] = doc_id
+        return rsrc
+
+    def find_related(self, id_, filter_dict=None, outgoing=True, maxdepth=0, meta=None):
+        """Find all resources connected to the identified one.
+
+        Args:
+            id_ (str): Unique ID of target resource.
+            filter_dict (dict): Filter to these resources
+            outgoing:
+            maxdepth:
+            meta (List[str]): Metadata fields to extract
+        Returns:
+            Generator of (depth, relation, metadata)
+        Raises:
+            KeyError if the resource is not found.
+        """
+        if maxdepth <= 0:
+            maxdepth = 9223372036854775807
+        filter_expr = None
+        if filter_dict:
+            filter_expr = self._create_filter_expr(filter_dict)
+
+        def relations(key):
+            rows = self._conn.execute(
+                "SELECT r.subject, r.predicate, r.object, d.doc "
+                "FROM relations r JOIN resources d ON d.id_ = r.end_id "
+                "WHERE r.outgoing = ? AND r.start_id = ? "
+                "ORDER BY d.doc_id, r.rowid",
+                (int(outgoing), key),
+            ).fetchall()
+            result = []
+            for subj, pred, obj, doc in rows:
+                record = json.loads(doc)
+                if filter_expr is None or filter_expr(record):
+                    meta_info = {k: record[k] for k in meta}
+                    result.append((subj, pred, obj, meta_info))
+            return result
+
+        yield from self._search_related(id_, relations, outgoing, maxdepth)
+
+    def get(self, identifier):
+        """Get a resource by identifier.
+
+        Args:
+          identifier: Internal identifier
+
+        Returns:
+            (Resource) A resource or None
+        """
+        row = self._conn.execute(
+            "SELECT doc FROM resources WHERE doc_id = ?", (identifier,)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._as_resource(json.loads(row[0]), identifier)
+
+    def put(self, resource):
+        """Put this resource into the database.
+
+        Args:
+            resource (Resource): The resource to add
+
+        Returns:
+            None
+
+        Raises:
+            errors.DuplicateResourceError: If there is already a resource
+                in the database with the same "id".
+        """
+        _log.debug(f"put resource id={resource.id}")
+        try:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO resources (id_, type, doc) VALUES (?, ?, ?)",
+                    (
+                        resource.id,
+                        resource.v.get(Resource.TYPE_FIELD, None),
+                        json.dumps(resource.v),
+                    ),
+                )
+                self._insert_relations(resource.v)
+        except sqlite3.IntegrityError:
+            raise errors.DuplicateResourceError("put", resource.id)
+
+    def _insert_relations(self, record):
+        self._conn.executemany(
+            "INSERT INTO relations VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (record[Resource.ID_FIELD], int(outgoing), key) + tuple(rel)
+                for outgoing, key, rel in _indexed_relations(record)
+            ],
+        )
+
+    def delete(self, id_=None, idlist=None, filter_dict=None, internal_ids=False):
+        """Delete one or more resources with given identifiers.
+
+        Args:
+            id_ (Union[str,int]): If given, delete this id.
+            idlist (list): If given, delete ids in this list
+            filter_dict (dict): If given, perform a search and
+                           delete ids it finds.
+            internal_ids (bool): If True, treat identifiers as numeric
+                (internal) identifiers. Otherwise treat them as
+                resource (string) indentifiers.
+        Returns:
+            (list[str]) Identifiers
+        """
+        if internal_ids:
+            doc_ids = idlist if idlist else [id_]
+        else:
+            ID = Resource.ID_FIELD
+            if filter_dict:
+                cond = filter_dict
+            elif id_:
+                cond = {ID: id_}
+            elif idlist:
+                cond = {ID: [idlist]}
+            else:
+                return
+            doc_ids = list(self.find(cond, id_only=True))
+        with self._conn:
+            for doc_id in doc_ids:
+                row = self._conn.execute(
+                    "SELECT id_ FROM resources WHERE doc_id = ?", (doc_id,)
+                ).fetchone()
+                if row is None:
+                    continue
+                self._conn.execute("DELETE FROM relations WHERE end_id = ?", row)
+                self._conn.execute("DELETE FROM resources WHERE doc_id = ?", (doc_id,))
+
+    def _update_resource(self, old, changed):
+        """Update stored resource with changed values.
+
+        Args:
+            old (Resource): Stored resource
+            changed (dict): Changed values
+        Returns:
+            None
+        """
+        doc_id = old.v["doc_id"]
+        row = self._conn.execute(
+            "SELECT doc FROM resources WHERE doc_id = ?", (doc_id,)
+        ).fetchone()
+        record = json.loads(row[0])
+        record.update(changed)
+        with self._conn:
+            self._conn.execute(
+                "UPDATE resources SET type = ?, doc = ? WHERE doc_id = ?",
+                (record.get(Resource.TYPE_FIELD, None), json.dumps(record), doc_id),
+            )
+            if "relations" in changed:
+                self._conn.execute(
+                    "DELETE FROM relations WHERE end_id = ?",
+                    (record[Resource.ID_FIELD],),
+                )
+                self._insert_relations(record)
+
+
+def _indexed_relations(record):
+    """Get the relations of a resource, as they are followed by find_related().
+
+    Each relation belongs to the resource at its end: a relation where the
+    resource is the object is followed from its subject in an outgoing search,
+    and one where it is the subject is followed from its object in an incoming
+    search.
+
+    Args:
+        record (dict): Resource values
+    Returns:
+        Generator of (outgoing, start id, Triple)
+    """
+    uuid = record[Resource.ID_FIELD]
+    for rrel in record.get("relations", []):
+        rel = triple_from_resource_relations(uuid, rrel)
+        if rel.subject != uuid:
+            yield True, rel.subject, rel
+        elif rel.object != uuid:
+            yield False, rel.object, rel
+
+
+class _RelationIndex:
+    """In-memory index of the relations between resources, for
+    :meth:`ResourceDB.find_related`. See :func:`_indexed_relations`.
+    """
+
+    def __init__(self):
+        self.doc_ids = {}  # {resource id: doc id}
+        self._ids = {}  # {doc id: resource id}
+        # {outgoing: {start id: {end id: [Triple, ..]}}}
+        self._relations = {True: {}, False: {}}
+        self._keys = {}  # {end id: {(outgoing, start id), ..}}
+
+    def add(self, record, doc_id):
+        """Add, or replace, the relations of a resource."""
+        uuid = record[Resource.ID_FIELD]
+        self.remove(uuid)
+        self.doc_ids[uuid], self._ids[doc_id] = doc_id, uuid
+        keys = set()
+        for outgoing, key, rel in _indexed_relations(record):
+            ends = self._relations[outgoing].setdefault(key, {})
+            ends.setdefault(uuid, []).append(rel)
+            keys.add((outgoing, key))
+        self._keys[uuid] = keys
+
+    def remove(self, uuid):
+        """Remove the relations of a resource."""
+        for outgoing, key in self._keys.pop(uuid, ()):
+            ends = self._relations[outgoing][key]
+            del ends[uuid]
+            if not ends:
+                del self._relations[outgoing][key]
+        doc_id = self.doc_ids.pop(uuid, None)
+        self._ids.pop(doc_id, None)
+
+    def remove_doc(self, doc_id):
+        """Remove the relations of a resource, by internal identifier."""
+        uuid = self._ids.get(doc_id, None)
+        if uuid is not None:
+            self.remove(uuid)
+
+    def relations(self, key, outgoing):
+        """Generate (end id, Triple) for the relations followed from a resource."""
+        for uuid, rels in self._relations[outgoing].get(key, {}).items():
+            for rel in rels:
+                yield uuid, rel
+
+    def reachable(self, key, outgoing, maxdepth):
+        """Get the identifiers of resources at the end of relations reachable
+        from a resource, within the maximum depth.
+        """
+        found, visited, keys, depth = set(), {key}, [key], 0
+        while keys and depth < maxdepth:
+            depth += 1
+            next_keys = []
+            for k in keys:
+                for uuid, rel in self.relations(k, outgoing):
+                    found.add(uuid)
+                    next_id = rel.object if outgoing else rel.subject
+                    if next_id not in visited:
+                        visited.add(next_id)
+                        next_keys.append(next_id)
+            keys = next_keys
+        return found
@@ -0,0 +1,148 @@
+#################################################################################
+# The Institute for the Design of Advanced Energy Systems Integrated Platform
+# Framework (IDAES IP) was produced under the DOE Institute for the
+# Design of Advanced Energy Systems (IDAES).
+#
+# Copyright (c) 2018-2023 by the software owners: The Regents of the
+# University of California, through Lawrence Berkeley National Laboratory,
+# National Technology & Engineering Solutions of Sandia, LLC, Carnegie Mellon
+# University, West Virginia University Research Corporation, et al.
+# All rights reserved.  Please see the files COPYRIGHT.md and LICENSE.md
+# for full copyright and license information.
+#################################################################################
+"""
+Tests for resourcedb module
+"""
+# third-party
+import pytest
+
+# local
+from idaes.core.dmf import errors, resource
+from idaes.core.dmf.resource import Predicates, Resource
+from idaes.core.dmf.resourcedb import ResourceDB, SQLiteResourceDB
+
+__author__ = "Dan Gunter"
+
+
+@pytest.fixture(params=["resourcedb.json", "resourcedb.sqlite"])
+def dbfile(request, tmp_path):
+    return str(tmp_path / request.param)
+
+
+def _names(results):
+    return sorted(m["aliases"][0] for _, _, m in results)
+
+
+def _add_chain(rdb, n):
+    # r0 -> derived -> r1 -> derived -> ... -> r(n-1)
+    r = [Resource({"name": f"r{i}", "type": "data"}) for i in range(n)]
+    for i in range(n - 1):
+        resource.create_relation(r[i], Predicates.derived, r[i + 1])
+    for rr in r:
+        rdb.put(rr)
+    return r
+
+
+@pytest.mark.unit
+def test_create(dbfile):
+    rdb = ResourceDB.create(dbfile)
+    assert isinstance(rdb, SQLiteResourceDB) == dbfile.endswith(".sqlite")
+    assert len(rdb) == 0
+
+
+@pytest.mark.unit
+def test_create_existing_file(tmp_path):
+    # existing files are opened with the backend that wrote them, whatever
+    # their extension
+    tinydb_file = str(tmp_path / "tinydb.db")
+    _add_chain(ResourceDB(tinydb_file), 2)
+    rdb = ResourceDB.create(tinydb_file)
+    assert not isinstance(rdb, SQLiteResourceDB)
+    assert len(rdb) == 2
+
+    sqlite_file = str(tmp_path / "sqlite.db")
+    _add_chain(SQLiteResourceDB(sqlite_file), 3)
+    rdb = ResourceDB.create(sqlite_file)
+    assert isinstance(rdb, SQLiteResourceDB)
+    assert len(rdb) == 3
+
+    # new .db files use TinyDB
+    assert not isinstance(ResourceDB.create(str(tmp_path / "new.db")), SQLiteResourceDB)
+
+
+@pytest.mark.unit
+def test_put_find_get(dbfile):
+    rdb = ResourceDB.create(dbfile)
+    r = _add_chain(rdb, 3)
+    assert len(rdb) == 3
+    with pytest.raises(errors.DuplicateResourceError):
+        rdb.put(r[0])
+    found = rdb.find_one({Resource.ID_FIELD: r[1].id})
+    assert found.v["aliases"] == ["r1"]
+    assert rdb.get(found.v["doc_id"]).id == r[1].id
+    assert len(list(rdb.find({Resource.TYPE_FIELD: "data"}))) == 3
+    assert len(list(rdb.find({"aliases": ["r2"]}, id_only=True))) == 1
+    assert len(list(rdb.find({"aliases": ["r2"], Resource.TYPE_FIELD: "code"}))) == 0
+
+
+@pytest.mark.unit
+def test_find_related(dbfile):
+    rdb = ResourceDB.create(dbfile)
+    r = _add_chain(rdb, 4)
+    meta = ["aliases"]
+    assert _names(rdb.find_related(r[0].id, meta=meta)) == ["r1", "r2", "r3"]
+    assert _names(rdb.find_related(r[0].id, meta=meta, maxdepth=2)) == ["r1", "r2"]
+    assert _names(rdb.find_related(r[3].id, meta=meta, outgoing=False)) == [
+        "r0",
+        "r1",
+        "r2",
+    ]
+    # the filter stops the search at resources that do not match
+    filter_dict = {"aliases": ["r1", "r3"]}
+    results = list(rdb.find_related(r[0].id, meta=meta, filter_dict=filter_dict))
+    assert _names(results) == ["r1"]
+    depths = [d for d, _, _ in rdb.find_related(r[0].id, meta=meta)]
+    assert depths == [1, 2, 3]
+
+
+@pytest.mark.unit
+def test_find_related_after_changes(dbfile):
+    rdb = ResourceDB.create(dbfile)
+    r = _add_chain(rdb, 3)
+    meta = ["aliases"]
+    assert _names(rdb.find_related(r[0].id, meta=meta)) == ["r1", "r2"]
+    # add a relation r2 -> r3
+    r3 = Resource({"name": "r3", "type": "data"})
+    resource.create_relation(r[2], Predicates.uses, r3)
+    rdb.put(r3)
+    rdb.update(r[2].id, r[2].v)
+    assert _names(rdb.find_related(r[0].id, meta=meta)) == ["r1", "r2", "r3"]
+    # remove r1
+    rdb.delete(id_=r[1].id)
+    assert _names(rdb.find_related(r[0].id, meta=meta)) == []
+    assert _names(rdb.find_related(r[2].id, meta=meta)) == ["r3"]
+
+
+@pytest.mark.unit
+def test_find_related_changed_by_other(tmp_path):
+    dbfile = str(tmp_path / "resourcedb.json")
+    rdb, other = ResourceDB(dbfile), ResourceDB(dbfile)
+    r = _add_chain(rdb, 2)
+    meta = ["aliases"]
+    assert _names(rdb.find_related(r[0].id, meta=meta)) == ["r1"]
+    # the index is rebuilt after the file is changed by another instance
+    r2 = Resource({"name": "r2", "type": "data"})
+    resource.create_relation(r[1], Predicates.uses, r2)
+    other.put(r2)
+    other.update(r[1].id, r[1].v)
+    assert _names(rdb.find_related(r[0].id, meta=meta)) == ["r1", "r2"]
+
+
+@pytest.mark.unit
+def test_sqlite_bad_file(tmp_path):
+    dbfile = tmp_path / "resourcedb.sqlite"
+    dbfile.write_text("not a database")
+    with pytest.raises(errors.FileError):
+        SQLiteResourceDB(str(dbfile))
+    with pytest.raises(ValueError):
+        SQLiteResourceDB()
@@ -118,6 +118,10 @@ class Workspace(object):
             Full path to the location of the built (not source) Sphinx HTML
             documentation for the `idaes.core.dmf` package. See
             DMF Help Configuration for more details.
+        db_file
+            Name of the resource database file, "resourcedb.json" by default.
+            A name ending in ".sqlite", ".sqlite3" or ".db" stores the resources
+            with SQLite instead of TinyDB, which is faster for large workspaces.
 
     There are many different possible "styles" of formatting a list of values
     in YAML, but we prefer the simple block-indented style, where the key is
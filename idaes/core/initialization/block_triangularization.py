@@ -13,23 +13,139 @@
 """
 Initializer class for implementing Block Triangularization initialization
 """
-from pyomo.environ import SolverFactory
-from pyomo.common.config import ConfigDict, ConfigValue
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import os
+import threading
+
+from pyomo.environ import check_optimal_termination, Constraint, SolverFactory
+from pyomo.common.collections import ComponentMap, ComponentSet
+from pyomo.common.config import ConfigDict, ConfigValue, In
+from pyomo.core.expr.visitor import identify_variables
 from pyomo.contrib.incidence_analysis import (
     IncidenceGraphInterface,
     solve_strongly_connected_components,
 )
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
+from pyomo.util.subsystems import (
+    generate_subsystem_blocks,
+    TemporarySubsystemManager,
+)
 
 from idaes.core.initialization.initializer_base import (
     InitializerBase,
     InitializationStatus,
 )
 from idaes.core.util.exceptions import InitializationError
+from idaes.core.util.model_statistics import IncidenceCache
 from idaes.core.solvers import get_solver
 
 __author__ = "Andrew Lee"
 
 
+# Strongly connected components, solver and solver arguments used by the worker
+# processes of the "process" parallel backend. Worker processes are forked, so
+# they inherit these (and the current state of the model) instead of having
+# them pickled.
+_level_solve_data = None
+
+# Pyomo's TempfileManager and solver plugins keep global state, so external
+# solvers can't be called from several threads at once. Solves of NxN blocks
+# with the "thread" parallel backend are serialized with this lock.
+_block_solver_lock = threading.Lock()
+
+# Number of block triangular forms (for different fixed variables) kept for
+# each BlockData in the decomposition cache
+_MAX_CACHED_DECOMPOSITIONS = 8
+
+
+class _DecompositionCacheEntry:
+    """
+    Cached block triangular forms of a BlockData, for the most recent
+    combinations of fixed variables seen with the same active constraints.
+    """
+
+    def __init__(self, block_data, constraints, con_vars):
+        # Keep references to the BlockData, constraints and variables so that
+        # the ids used as keys are not reused
+        self.block_data = block_data
+        self.constraints = constraints
+        self.con_vars = con_vars
+        var_set = ComponentSet()
+        self.variables = []
+        for variables in con_vars:
+            for var in variables:
+                if var not in var_set:
+                    self.variables.append(var)
+                    var_set.add(var)
+        # Tuple of fixed flags of variables: (sccs, levels, depends), least
+        # recently used first
+        self.decompositions = OrderedDict()
+
+    def matches(self, constraints, con_vars):
+        """
+        Check if the active constraints of the BlockData, and the variables in
+        each of them, are the same as when the entry was created.
+        """
+        if len(constraints) != len(self.constraints):
+            return False
+        for k, (c, variables) in enumerate(zip(constraints, con_vars)):
+            if c is not self.constraints[k]:
+                return False
+            # The incidence cache returns the same tuple unless the expression
+            # was replaced, in which case the variables are compared
+            if variables is not self.con_vars[k]:
+                if tuple(id(v) for v in variables) != tuple(
+                    id(v) for v in self.con_vars[k]
+                ):
+                    return False
+                self.con_vars[k] = variables
+        return True
+
+
+def _solve_scc(scc, solver, solve_kwds, calc_var_kwds):
+    """
+    Solve a single strongly connected component with its inputs fixed.
+
+    Returns:
+        None if the block was solved successfully, otherwise a message
+        describing the failure.
+    """
+    if len(scc.vars) == 1:
+        calculate_variable_from_constraint(scc.vars[0], scc.cons[0], **calc_var_kwds)
+        return None
+    if solver is None:
+        raise RuntimeError(
+            "An external solver is required to solve strongly connected "
+            "components of size greater than one."
+        )
+    results = solver.solve(scc, **solve_kwds)
+    if not check_optimal_termination(results):
+        return (
+            f"block solver returned termination condition "
+            f"{results.solver.termination_condition}"
+        )
+    return None
+
+
+def _solve_scc_worker(task):
+    i, input_values = task
+    sccs, solver, solve_kwds, calc_var_kwds = _level_solve_data
+    # Workers are forked once for all the levels, so the inputs solved in
+    # earlier levels are passed with the block and fixed here
+    inputs = list(sccs[i].input_vars.values())
+    for v, val in zip(inputs, input_values):
+        v.set_value(val, skip_validation=True)
+    try:
+        with TemporarySubsystemManager(to_fix=inputs):
+            message = _solve_scc(sccs[i], solver, solve_kwds, calc_var_kwds)
+    except Exception as err:  # pylint: disable=broad-except
+        # Failures are isolated to the block, and reported with the results
+        message = str(err)
+    return i, [v.value for v in sccs[i].vars.values()], message
+
+
 class BlockTriangularizationInitializer(InitializerBase):
     """
     Block Triangularization based Initializer object.
@@ -67,6 +183,83 @@ class BlockTriangularizationInitializer(InitializerBase):
             "solve_strongly_connected_components method.",
         ),
     )
+    CONFIG.declare(
+        "parallel_blocks",
+        ConfigValue(
+            default=False,
+            domain=bool,
+            description="Solve independent diagonal blocks in parallel",
+            doc="If True, the diagonal blocks (strongly connected components) of "
+            "the block triangular form are grouped into levels of mutually "
+            "independent blocks, and the blocks in each level are solved in a "
+            "pool of workers. A failure in one block is reported without "
+            "aborting its independent siblings; blocks which depend on a "
+            "failed block are skipped.",
+        ),
+    )
+    CONFIG.declare(
+        "parallel_backend",
+        ConfigValue(
+            default="process",
+            domain=In(["thread", "process"]),
+            description="Worker pool to use when parallel_blocks is True",
+            doc="Worker pool to use when parallel_blocks is True. Processes are "
+            "forked once for all the levels (on platforms which support it, "
+            "otherwise threads are used) and only solve the NxN blocks of "
+            "levels with several of them, while the 1x1 blocks are solved in "
+            "the main process. The solutions are copied back into the model. "
+            "Threads share the model directly, but pure Python 1x1 "
+            "blocks do not run concurrently, and calls to the external block "
+            "solver for NxN blocks are serialized, as Pyomo's temporary file "
+            "management is not thread safe. Threads thus only isolate "
+            "failures of independent blocks, and do not speed up the solve.",
+        ),
+    )
+    CONFIG.declare(
+        "max_workers",
+        ConfigValue(
+            default=None,
+            domain=int,
+            description="Maximum number of workers when parallel_blocks is True",
+            doc="Maximum number of workers when parallel_blocks is True "
+            "(default = number of CPUs).",
+        ),
+    )
+    CONFIG.declare(
+        "cache_decomposition",
+        ConfigValue(
+            default=False,
+            domain=bool,
+            description="Reuse block triangularization between calls",
+            doc="If True, the block triangular form and the subsystem blocks "
+            "for each diagonal block are kept between calls to initialize, "
+            "keyed on a structural fingerprint of each BlockData (its active "
+            "constraints, the variables appearing in each of them, including "
+            "through named Expressions, and which of those are fixed). "
+            "Re-initializing a model with the same structure then only "
+            "recomputes the numerical solution. The forms for the most recently "
+            "used combinations of fixed variables of each BlockData are kept. "
+            "Use clear_decomposition_cache to release the cached blocks.",
+        ),
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        # id(BlockData): _DecompositionCacheEntry
+        self._decomposition_cache = {}
+        # Variables in each constraint, used to check the cached entries
+        self._incidence_cache = IncidenceCache()
+
+    def clear_decomposition_cache(self):
+        """
+        Clear cached block triangular forms and subsystem blocks.
+
+        Returns:
+            None
+        """
+        self._decomposition_cache = {}
+        self._incidence_cache.clear()
 
     def precheck(self, model):
         """
@@ -86,6 +279,13 @@ class BlockTriangularizationInitializer(InitializerBase):
         """
         Run incidence analysis on given block data and check matching.
         """
+        if self.config.cache_decomposition:
+            entry, fixed_key = self._get_cache_entry(block_data)
+            if fixed_key in entry.decompositions:
+                # A block triangular form was found for this structure before,
+                # so it has a perfect matching
+                return
+
         igraph = IncidenceGraphInterface(block_data, include_inequality=False)
         matching = igraph.maximum_matching()
         if len(matching) != len(igraph.variables):
@@ -101,10 +301,7 @@ class BlockTriangularizationInitializer(InitializerBase):
         """
         Call Block Triangularization solver on model.
         """
-        if self.config.block_solver is not None:
-            solver = SolverFactory(self.config.block_solver)
-        else:
-            solver = get_solver()
+        solver = self._get_block_solver()
 
         if model.is_indexed():
             for d in model.values():
@@ -112,10 +309,38 @@ class BlockTriangularizationInitializer(InitializerBase):
         else:
             self._solve_block_data(model, solver)
 
+    def _get_block_solver(self):
+        """
+        Get a new solver object for NxN blocks.
+        """
+        if self.config.block_solver is not None:
+            return SolverFactory(self.config.block_solver)
+        return get_solver()
+
     def _solve_block_data(self, block_data, solver):
         """
         Call solve_strongly_connected_components on a given BlockData.
         """
+        if self.config.parallel_blocks:
+            self._solve_block_data_parallel(block_data)
+            return
+        if self.config.cache_decomposition:
+            sccs, _, _ = self._get_decomposition(block_data)
+            failed = {}
+            for i, scc in enumerate(sccs):
+                with TemporarySubsystemManager(to_fix=list(scc.input_vars.values())):
+                    message = _solve_scc(
+                        scc,
+                        solver,
+                        self.config.block_solver_options,
+                        self.config.calculate_variable_options,
+                    )
+                if message is not None:
+                    failed[i] = message
+            if failed:
+                self._report_failed_blocks(block_data, sccs, failed)
+            return
+
         # TODO: Can we get diagnostic output from this method?
         solve_strongly_connected_components(
             block_data,
@@ -123,3 +348,260 @@ class BlockTriangularizationInitializer(InitializerBase):
             solve_kwds=self.config.block_solver_options,
             calc_var_kwds=self.config.calculate_variable_options,
         )
+
+    def _get_cache_entry(self, block_data):
+        """
+        Get the decomposition cache entry for a BlockData, replacing it if its
+        active constraints have changed.
+
+        Returns:
+            cache entry and key of the fixed status of its variables
+        """
+        constraints = list(block_data.component_data_objects(Constraint, active=True))
+        # The incidence cache only walks the expressions of constraints, or
+        # of named Expressions in them, which were replaced since the last call
+        con_vars = [self._incidence_cache.variables(c) for c in constraints]
+        entry = self._decomposition_cache.get(id(block_data))
+        if entry is None or not entry.matches(constraints, con_vars):
+            entry = _DecompositionCacheEntry(block_data, constraints, con_vars)
+            self._decomposition_cache[id(block_data)] = entry
+        return entry, tuple(v.fixed for v in entry.variables)
+
+    def _get_decomposition(self, block_data):
+        """
+        Get the diagonal blocks of a BlockData grouped into levels, from the
+        cache if enabled and the structure of the BlockData is unchanged.
+
+        Returns:
+            see _get_scc_levels
+        """
+        if not self.config.cache_decomposition:
+            return self._get_scc_levels(block_data)
+
+        entry, fixed_key = self._get_cache_entry(block_data)
+        decomposition = entry.decompositions.get(fixed_key)
+        if decomposition is None:
+            decomposition = self._get_scc_levels(block_data, entry.constraints)
+            entry.decompositions[fixed_key] = decomposition
+            if len(entry.decompositions) > _MAX_CACHED_DECOMPOSITIONS:
+                entry.decompositions.popitem(last=False)
+        else:
+            entry.decompositions.move_to_end(fixed_key)
+        return decomposition
+
+    @staticmethod
+    def _get_scc_levels(block_data, constraints=None):
+        """
+        Get the diagonal blocks of the block triangular form of a BlockData,
+        grouped into levels of mutually independent blocks.
+
+        Args:
+            block_data: BlockData to decompose
+            constraints: active constraints of block_data (optional)
+
+        Returns:
+            list of subsystem blocks for each strongly connected component
+            in topological order, list of lists of indices of the blocks in
+            each level, and list of sets of indices of the blocks each block
+            depends on.
+        """
+        if constraints is None:
+            constraints = list(
+                block_data.component_data_objects(Constraint, active=True)
+            )
+        var_set = ComponentSet()
+        variables = []
+        for con in constraints:
+            for var in identify_variables(con.expr, include_fixed=False):
+                if var not in var_set:
+                    variables.append(var)
+                    var_set.add(var)
+
+        igraph = IncidenceGraphInterface()
+        var_blocks, con_blocks = igraph.block_triangularize(
+            variables=variables, constraints=constraints
+        )
+        sccs = [
+            scc
+            for scc, _ in generate_subsystem_blocks(
+                [(cblock, vblock) for vblock, cblock in zip(var_blocks, con_blocks)]
+            )
+        ]
+
+        # Blocks are in topological order, so every input of a block belongs
+        # to an earlier block
+        owner = ComponentMap()
+        for i, vblock in enumerate(var_blocks):
+            for v in vblock:
+                owner[v] = i
+        depends = []
+        block_level = []
+        levels = []
+        for i, scc in enumerate(sccs):
+            predecessors = set(owner[v] for v in scc.input_vars.values())
+            level = 1 + max((block_level[j] for j in predecessors), default=-1)
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(i)
+            block_level.append(level)
+            depends.append(predecessors)
+
+        return sccs, levels, depends
+
+    def _solve_block_data_parallel(self, block_data):
+        """
+        Solve the strongly connected components of a given BlockData level by
+        level, solving the independent blocks in each level in parallel.
+        """
+        _log = self.get_logger(block_data)
+        sccs, levels, depends = self._get_decomposition(block_data)
+
+        mp_context = None
+        if self.config.parallel_backend == "process":
+            try:
+                mp_context = multiprocessing.get_context("fork")
+            except ValueError:
+                _log.warning(
+                    "Worker processes can not be forked on this platform, "
+                    "using threads instead."
+                )
+
+        global _level_solve_data  # pylint: disable=global-statement
+        failed = {}
+        # The process pool is created when a level first has several NxN
+        # blocks, and is shared by all the later levels
+        executor = None
+        try:
+            for level in levels:
+                to_solve = []
+                for i in level:
+                    if any(j in failed for j in depends[i]):
+                        failed[i] = "skipped as it depends on a failed block"
+                    else:
+                        to_solve.append(i)
+                if not to_solve:
+                    continue
+
+                inputs = ComponentSet()
+                for i in to_solve:
+                    inputs.update(sccs[i].input_vars.values())
+                large = [i for i in to_solve if len(sccs[i].vars) > 1]
+                # Inputs are fixed once for the whole level, so that blocks
+                # sharing an input do not fix and unfix it underneath each other
+                with TemporarySubsystemManager(to_fix=list(inputs)):
+                    if mp_context is not None and len(large) > 1:
+                        if executor is None:
+                            _level_solve_data = (
+                                sccs,
+                                self._get_block_solver(),
+                                self.config.block_solver_options,
+                                self.config.calculate_variable_options,
+                            )
+                            executor = ProcessPoolExecutor(
+                                max_workers=self.config.max_workers,
+                                mp_context=mp_context,
+                            )
+                        messages = self._solve_level_processes(executor, sccs, to_solve)
+                    else:
+                        messages = self._solve_level_threads(sccs, to_solve)
+                for i, message in zip(to_solve, messages):
+                    if message is not None:
+                        failed[i] = message
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            _level_solve_data = None
+
+        if failed:
+            self._report_failed_blocks(block_data, sccs, failed)
+
+    def _report_failed_blocks(self, block_data, sccs, failed):
+        """
+        Log the diagonal blocks of a BlockData which failed, record them in
+        the summary and raise an InitializationError.
+        """
+        _log = self.get_logger(block_data)
+        for i in sorted(failed):
+            names = [c.name for c in sccs[i].cons.values()][:10]
+            _log.warning(
+                f"Block {i} ({len(sccs[i].vars)}x{len(sccs[i].vars)}) "
+                f"including constraints {names} failed: {failed[i]}"
+            )
+        self._update_summary(block_data, "failed_blocks", sorted(failed))
+        self._update_summary(block_data, "status", InitializationStatus.Failed)
+        raise InitializationError(
+            f"{len(failed)} of {len(sccs)} diagonal blocks of {block_data.name} "
+            f"failed to solve or were skipped. Please check the logs for more "
+            f"information."
+        )
+
+    def _solve_level_threads(self, sccs, to_solve):
+        """
+        Solve a level of independent blocks in a thread pool.
+
+        Returns:
+            list of failure messages (or None) for each block.
+        """
+        solver = self._get_block_solver()
+
+        def solve(i):
+            try:
+                if len(sccs[i].vars) == 1:
+                    return _solve_scc(
+                        sccs[i],
+                        solver,
+                        self.config.block_solver_options,
+                        self.config.calculate_variable_options,
+                    )
+                with _block_solver_lock:
+                    return _solve_scc(
+                        sccs[i],
+                        solver,
+                        self.config.block_solver_options,
+                        self.config.calculate_variable_options,
+                    )
+            except Exception as err:  # pylint: disable=broad-except
+                return str(err)
+
+        if len(to_solve) == 1:
+            return [solve(to_solve[0])]
+        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
+            return list(executor.map(solve, to_solve))
+
+    def _solve_level_processes(self, executor, sccs, to_solve):
+        """
+        Solve a level of independent blocks, sending the NxN blocks to a pool
+        of forked processes and copying their solutions back into the model.
+        The 1x1 blocks are solved in this process while the workers run, as
+        they are much cheaper to solve than to send to a worker.
+
+        Returns:
+            list of failure messages (or None) for each block.
+        """
+        large = [i for i in to_solve if len(sccs[i].vars) > 1]
+        tasks = [(i, [v.value for v in sccs[i].input_vars.values()]) for i in large]
+        n_workers = self.config.max_workers or os.cpu_count() or 1
+        block_results = executor.map(
+            _solve_scc_worker,
+            tasks,
+            chunksize=max(1, len(tasks) // (4 * n_workers)),
+        )
+
+        messages = {}
+        for i in to_solve:
+            if len(sccs[i].vars) == 1:
+                try:
+                    messages[i] = _solve_scc(
+                        sccs[i],
+                        None,
+                        self.config.block_solver_options,
+                        self.config.calculate_variable_options,
+                    )
+                except Exception as err:  # pylint: disable=broad-except
+                    messages[i] = str(err)
+
+        for i, values, message in block_results:
+            for v, val in zip(sccs[i].vars.values(), values):
+                v.set_value(val, skip_validation=True)
+            messages[i] = message
+        return [messages[i] for i in to_solve]
@@ -14,15 +14,22 @@
 Tests for Block Triangularization initialization
 """
 import pytest
+import time
 import types
 
-from pyomo.environ import ConcreteModel, Constraint, units, value, Var
+import numpy as np
+from pyomo.environ import ConcreteModel, Constraint, Expression, units, value, Var
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
+from pyomo.repn import generate_standard_repn
 
 from idaes.core import FlowsheetBlock
+import idaes.core.initialization.block_triangularization as bt
 from idaes.core.initialization.block_triangularization import (
     BlockTriangularizationInitializer,
 )
 from idaes.core.initialization.initializer_base import InitializationStatus
+from idaes.core.util.exceptions import InitializationError
+import idaes.core.util.model_statistics as model_statistics
 from idaes.models.unit_models.pressure_changer import (
     Turbine,
 )
@@ -82,3 +89,391 @@ class TestBTSubMethods:
         assert not model.v1.fixed
 
         assert status == InitializationStatus.Ok
+
+
+class TestParallelBlocks:
+    @pytest.fixture
+    def model(self):
+        m = ConcreteModel()
+
+        m.x = Var([1, 2, 3, 4], initialize=1)
+        m.y = Var(initialize=1)
+        m.z = Var(initialize=1)
+
+        # x[1] and x[2] only depend on fixed y, x[3] and x[4] on x[1] and x[2]
+        m.c1 = Constraint(expr=m.x[1] == 2 * m.y)
+        m.c2 = Constraint(expr=m.x[2] == 3 * m.y)
+        m.c3 = Constraint(expr=m.x[3] == m.x[1] + m.x[2])
+        m.c4 = Constraint(expr=m.x[4] == m.x[1] * m.x[2])
+        # z is independent of all x
+        m.c5 = Constraint(expr=m.z == 7 * m.y)
+
+        def fix_initialization_states(blk):
+            blk.y.fix(2)
+
+        m.fix_initialization_states = types.MethodType(fix_initialization_states, m)
+
+        return m
+
+    @pytest.mark.unit
+    def test_config(self):
+        initializer = BlockTriangularizationInitializer()
+
+        assert not initializer.config.parallel_blocks
+        assert initializer.config.parallel_backend == "process"
+        assert initializer.config.max_workers is None
+
+        with pytest.raises(ValueError):
+            BlockTriangularizationInitializer(parallel_backend="foo")
+
+    @pytest.mark.unit
+    def test_get_scc_levels(self, model):
+        model.y.fix(2)
+        sccs, levels, depends = BlockTriangularizationInitializer._get_scc_levels(model)
+
+        assert len(sccs) == 5
+        assert len(levels) == 2
+        assert len(levels[0]) == 3
+        assert len(levels[1]) == 2
+
+        index = {id(scc.vars[0]): i for i, scc in enumerate(sccs)}
+        x1 = index[id(model.x[1])]
+        x2 = index[id(model.x[2])]
+        z = index[id(model.z)]
+
+        assert set(levels[0]) == {x1, x2, z}
+        for i in levels[0]:
+            assert depends[i] == set()
+        for i in levels[1]:
+            assert depends[i] == {x1, x2}
+
+    @pytest.mark.component
+    @pytest.mark.parametrize("backend", ["thread", "process"])
+    def test_workflow(self, model, backend):
+        initializer = BlockTriangularizationInitializer(
+            parallel_blocks=True, parallel_backend=backend, max_workers=2
+        )
+
+        status = initializer.initialize(model)
+
+        assert value(model.x[1]) == pytest.approx(4)
+        assert value(model.x[2]) == pytest.approx(6)
+        assert value(model.x[3]) == pytest.approx(10)
+        assert value(model.x[4]) == pytest.approx(24)
+        assert value(model.z) == pytest.approx(14)
+
+        assert not model.y.fixed
+
+        assert status == InitializationStatus.Ok
+
+    @pytest.mark.component
+    @pytest.mark.parametrize("backend", ["thread", "process"])
+    def test_failed_block(self, model, backend):
+        # x[1] has no real solution, so x[3] and x[4] can not be solved, but
+        # x[2] and z are independent and should still be solved
+        model.c1.deactivate()
+        model.c1b = Constraint(expr=model.x[1] ** 2 == -model.y)
+
+        initializer = BlockTriangularizationInitializer(
+            parallel_blocks=True, parallel_backend=backend, max_workers=2
+        )
+
+        with pytest.raises(
+            InitializationError, match="3 of 5 diagonal blocks of unknown failed"
+        ):
+            initializer.initialize(model)
+
+        assert value(model.x[2]) == pytest.approx(6)
+        assert value(model.z) == pytest.approx(14)
+        assert value(model.x[3]) == 1
+        assert value(model.x[4]) == 1
+
+        assert len(initializer.summary[model]["failed_blocks"]) == 3
+        assert initializer.summary[model]["status"] == InitializationStatus.Failed
+
+    @pytest.mark.unit
+    def test_thread_block_solves_serialized(self):
+        # Two independent 2x2 blocks, solved by a stand-in for an external
+        # solver which records how many solves run at the same time
+        m = ConcreteModel()
+        m.x = Var([1, 2, 3, 4], initialize=1)
+        m.c1 = Constraint(expr=m.x[1] + m.x[2] == 3)
+        m.c2 = Constraint(expr=m.x[1] * m.x[2] == 2)
+        m.c3 = Constraint(expr=m.x[3] + m.x[4] == 3)
+        m.c4 = Constraint(expr=m.x[3] * m.x[4] == 2)
+
+        class FakeSolver:
+            running = 0
+            max_running = 0
+
+            def solve(self, blk, **kwargs):
+                FakeSolver.running += 1
+                FakeSolver.max_running = max(FakeSolver.max_running, FakeSolver.running)
+                time.sleep(0.05)
+                FakeSolver.running -= 1
+                results = SolverResults()
+                results.solver.status = SolverStatus.ok
+                results.solver.termination_condition = TerminationCondition.optimal
+                return results
+
+        initializer = BlockTriangularizationInitializer(
+            parallel_blocks=True, parallel_backend="thread", max_workers=2
+        )
+        initializer._get_block_solver = FakeSolver
+        initializer._solve_block_data_parallel(m)
+
+        assert FakeSolver.max_running == 1
+
+    @pytest.mark.unit
+    def test_process_pool_shared_by_levels(self, monkeypatch):
+        # Two levels of two independent 2x2 blocks and a 1x1 block, the 2x2
+        # blocks of the second level depend on those of the first
+        m = ConcreteModel()
+        m.x = Var(range(1, 9), initialize=1)
+        m.y = Var(initialize=2)
+        m.z = Var(initialize=1)
+        m.w = Var(initialize=1)
+        m.y.fix()
+        m.c1 = Constraint(expr=m.x[1] + m.x[2] == 3 * m.y)
+        m.c2 = Constraint(expr=m.x[1] - m.x[2] == m.y)
+        m.c3 = Constraint(expr=m.x[3] + m.x[4] == m.y)
+        m.c4 = Constraint(expr=m.x[3] - m.x[4] == 3 * m.y)
+        m.c5 = Constraint(expr=m.z == 7 * m.y)
+        m.c6 = Constraint(expr=m.x[5] + m.x[6] == m.x[1] + m.x[3])
+        m.c7 = Constraint(expr=m.x[5] - m.x[6] == m.x[2])
+        m.c8 = Constraint(expr=m.x[7] + m.x[8] == m.x[4])
+        m.c9 = Constraint(expr=m.x[7] - m.x[8] == m.x[1])
+        m.c10 = Constraint(expr=m.w == m.x[1] * m.x[3])
+
+        class LinearSolver:
+            # Stand-in for an external solver, for square linear blocks
+            def solve(self, blk, **kwargs):
+                variables = list(blk.vars.values())
+                index = {id(v): k for k, v in enumerate(variables)}
+                a = np.zeros((len(variables), len(variables)))
+                b = np.zeros(len(variables))
+                for k, c in enumerate(blk.cons.values()):
+                    repn = generate_standard_repn(c.body)
+                    for v, coef in zip(repn.linear_vars, repn.linear_coefs):
+                        a[k, index[id(v)]] = coef
+                    b[k] = value(c.upper) - repn.constant
+                for v, x in zip(variables, np.linalg.solve(a, b)):
+                    v.set_value(x)
+                results = SolverResults()
+                results.solver.status = SolverStatus.ok
+                results.solver.termination_condition = TerminationCondition.optimal
+                return results
+
+        pools = []
+
+        class CountingPool(bt.ProcessPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                pools.append(self)
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(bt, "ProcessPoolExecutor", CountingPool)
+
+        initializer = BlockTriangularizationInitializer(
+            parallel_blocks=True, parallel_backend="process", max_workers=2
+        )
+        initializer._get_block_solver = LinearSolver
+        initializer._solve_block_data_parallel(m)
+
+        assert len(pools) == 1
+        expected = {1: 4, 2: 2, 3: 4, 4: -2, 5: 5, 6: 3, 7: 1, 8: -3}
+        for i, x in expected.items():
+            assert value(m.x[i]) == pytest.approx(x)
+        assert value(m.z) == pytest.approx(14)
+        assert value(m.w) == pytest.approx(16)
+        assert m.y.fixed
+        for i in expected:
+            assert not m.x[i].fixed
+
+
+class TestDecompositionCache:
+    @pytest.fixture
+    def model(self):
+        m = ConcreteModel()
+
+        m.x = Var([1, 2, 3], initialize=1)
+        m.y = Var(initialize=1)
+
+        m.c1 = Constraint(expr=m.x[1] == 2 * m.y)
+        m.c2 = Constraint(expr=m.x[2] == m.x[1] + m.y)
+        m.c3 = Constraint(expr=m.x[3] == m.x[1] * m.x[2])
+
+        def fix_initialization_states(blk):
+            blk.y.fix()
+
+        m.fix_initialization_states = types.MethodType(fix_initialization_states, m)
+
+        return m
+
+    @pytest.mark.unit
+    def test_config(self):
+        initializer = BlockTriangularizationInitializer()
+
+        assert not initializer.config.cache_decomposition
+        assert initializer._decomposition_cache == {}
+
+    @pytest.mark.component
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_reuse(self, model, parallel):
+        initializer = BlockTriangularizationInitializer(
+            cache_decomposition=True, parallel_blocks=parallel
+        )
+
+        for y in [1, 2, 3]:
+            model.y.set_value(y)
+            initializer.initialize(model)
+
+            assert value(model.x[1]) == pytest.approx(2 * y)
+            assert value(model.x[2]) == pytest.approx(3 * y)
+            assert value(model.x[3]) == pytest.approx(6 * y**2)
+
+        assert len(initializer._decomposition_cache) == 1
+        entry = initializer._decomposition_cache[id(model)]
+        assert len(entry.decompositions) == 1
+        sccs, levels, _ = list(entry.decompositions.values())[0]
+        assert len(sccs) == 3
+        assert len(levels) == 3
+
+        # Cached subsystem blocks are reused
+        model.y.fix()
+        assert initializer._get_decomposition(model)[0] is sccs
+
+        initializer.clear_decomposition_cache()
+        assert initializer._decomposition_cache == {}
+
+    @pytest.mark.unit
+    def test_structure_change(self, model):
+        initializer = BlockTriangularizationInitializer(cache_decomposition=True)
+
+        model.y.fix()
+        sccs, _, _ = initializer._get_decomposition(model)
+        entry = initializer._decomposition_cache[id(model)]
+
+        # Same constraints, different fixed variables
+        model.y.unfix()
+        model.x[1].fix()
+        sccs2, _, _ = initializer._get_decomposition(model)
+        assert sccs2 is not sccs
+        assert initializer._decomposition_cache[id(model)] is entry
+        assert len(entry.decompositions) == 2
+
+        model.x[1].unfix()
+        model.y.fix()
+        assert initializer._get_decomposition(model)[0] is sccs
+
+        # Changing a constraint expression without changing its variables
+        # keeps the cached blocks, which refer to the constraint
+        model.c1.set_value(model.x[1] == 3 * model.y)
+        assert initializer._get_decomposition(model)[0] is sccs
+        assert initializer._decomposition_cache[id(model)] is entry
+
+        # Changing the variables in a constraint gives a new cache entry
+        model.c2.set_value(model.x[2] == 3 * model.y)
+        sccs3, _, _ = initializer._get_decomposition(model)
+        assert sccs3 is not sccs
+        assert initializer._decomposition_cache[id(model)] is not entry
+
+        # As does deactivating a constraint
+        entry = initializer._decomposition_cache[id(model)]
+        model.c3.deactivate()
+        model.x[3].fix()
+        sccs4, _, _ = initializer._get_decomposition(model)
+        assert len(sccs4) == 2
+        assert initializer._decomposition_cache[id(model)] is not entry
+
+    @pytest.mark.unit
+    def test_named_expression_change(self, model):
+        initializer = BlockTriangularizationInitializer(cache_decomposition=True)
+        model.e = Expression(expr=model.x[1])
+        model.c4 = Constraint(expr=model.x[3] == model.e)
+        model.c3.deactivate()
+
+        model.y.fix()
+        sccs, _, _ = initializer._get_decomposition(model)
+        entry = initializer._decomposition_cache[id(model)]
+        assert initializer._get_decomposition(model)[0] is sccs
+
+        # Changing a named Expression used by a constraint changes the
+        # structure, without changing the constraint expression
+        model.e.set_value(model.x[2])
+        sccs2, _, _ = initializer._get_decomposition(model)
+        assert sccs2 is not sccs
+        assert initializer._decomposition_cache[id(model)] is not entry
+        x3 = [scc for scc in sccs2 if scc.vars[0] is model.x[3]][0]
+        assert [v.name for v in x3.input_vars.values()] == ["x[2]"]
+
+    @pytest.mark.unit
+    def test_cache_check_does_not_walk_expressions(self, model, monkeypatch):
+        initializer = BlockTriangularizationInitializer(cache_decomposition=True)
+        model.y.fix()
+        sccs, _, _ = initializer._get_decomposition(model)
+
+        walked = []
+
+        class CountingVisitor(model_statistics._IncidenceVisitor):
+            def walk_expression(self, expr):
+                walked.append(expr)
+                return super().walk_expression(expr)
+
+        monkeypatch.setattr(model_statistics, "_IncidenceVisitor", CountingVisitor)
+
+        assert initializer._get_decomposition(model)[0] is sccs
+        assert walked == []
+
+        # Only the replaced expression is walked
+        model.c1.set_value(model.x[1] == 3 * model.y)
+        assert initializer._get_decomposition(model)[0] is sccs
+        assert len(walked) == 1
+
+    @pytest.mark.unit
+    def test_decompositions_lru(self, model, monkeypatch):
+        monkeypatch.setattr(bt, "_MAX_CACHED_DECOMPOSITIONS", 2)
+        initializer = BlockTriangularizationInitializer(cache_decomposition=True)
+
+        model.y.fix()
+        sccs, _, _ = initializer._get_decomposition(model)
+        entry = initializer._decomposition_cache[id(model)]
+        model.y.unfix()
+        model.x[1].fix()
+        initializer._get_decomposition(model)
+        # Using the first decomposition again makes the second the oldest
+        model.x[1].unfix()
+        model.y.fix()
+        assert initializer._get_decomposition(model)[0] is sccs
+        model.y.unfix()
+        model.x[2].fix()
+        initializer._get_decomposition(model)
+
+        assert len(entry.decompositions) == 2
+        model.x[2].unfix()
+        model.y.fix()
+        assert initializer._get_decomposition(model)[0] is sccs
+
+    @pytest.mark.component
+    def test_failed_block_serial(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2], initialize=1)
+        m.c1 = Constraint(expr=m.x[1] + m.x[2] == 3)
+        m.c2 = Constraint(expr=m.x[1] * m.x[2] == 2)
+
+        class FakeSolver:
+            def solve(self, blk, **kwargs):
+                results = SolverResults()
+                results.solver.status = SolverStatus.warning
+                results.solver.termination_condition = TerminationCondition.infeasible
+                return results
+
+        initializer = BlockTriangularizationInitializer(cache_decomposition=True)
+        initializer._get_block_solver = FakeSolver
+
+        with pytest.raises(
+            InitializationError, match="1 of 1 diagonal blocks of unknown failed"
+        ):
+            initializer.initialization_routine(m)
+
+        assert initializer.summary[m]["failed_blocks"] == [0]
+        assert initializer.summary[m]["status"] == InitializationStatus.Failed
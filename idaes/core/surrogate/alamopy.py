@@ -24,7 +24,7 @@ import json
 import numpy as np
 import pandas as pd
 
-from pyomo.environ import Constraint, Expression, value, sin, cos, log, exp, Set, Reals
+from pyomo.environ import Constraint, Expression, sin, cos, log, exp, Set, Reals
 from pyomo.common.config import ConfigValue, In, Path, ListOf, Bool
 from pyomo.common.tee import TeeStream
 from pyomo.common.fileutils import Executable
@@ -44,6 +44,8 @@ alamo = Executable("alamo")
 
 # Define mapping of Pyomo function names for expression evaluation
 GLOBAL_FUNCS = {"sin": sin, "cos": cos, "ln": log, "exp": exp}
+# NumPy equivalents of GLOBAL_FUNCS, used to evaluate the surrogates on arrays
+NUMPY_FUNCS = {"sin": np.sin, "cos": np.cos, "ln": np.log, "exp": np.exp}
 
 
 # The values associated with these must match those expected in the .alm file
@@ -1200,41 +1202,54 @@ class AlamoSurrogate(SurrogateBase):
         self._surrogate_expressions = surrogate_expressions
         self._fcn = None
 
-    def evaluate_surrogate(self, inputs):
+    def evaluate_surrogate(self, inputs, chunk_size=None):
         """
         Method to evaluate the ALAMO surrogate model at a set of user provided values.
 
+        The right-hand side of each surrogate expression is compiled once (and cached)
+        and evaluated on whole columns of the inputs using NumPy.
+
         Args:
            dataframe: pandas DataFrame
               The dataframe of input values to be used in the evaluation. The dataframe
               needs to contain a column corresponding to each of the input labels. Additional
               columns are fine, but are not used.
+           chunk_size: int
+              Maximum number of rows evaluated at once, to bound the memory used by the
+              intermediate arrays. Default is None (all rows at once).
 
         Returns:
             output: pandas Dataframe
               Returns a dataframe of the output values evaluated at the provided inputs.
               The index of the output dataframe should match the index of the provided inputs.
         """
-        # Create a set of lambda functions for evaluating the surrogate.
+        # Compile the surrogate expressions for evaluation on arrays.
         if self._fcn is None:
             fcn = dict()
             for o in self._output_labels:
-                # We need to evaluate the string returned by ALAMO
-                # pylint: disable=W0123
-                fcn[o] = eval(
-                    f"lambda {', '.join(self._input_labels)}: "
-                    f"{self._surrogate_expressions[o].split('==')[1]}",
-                    GLOBAL_FUNCS,
+                fcn[o] = compile(
+                    self._surrogate_expressions[o].split("==")[1].strip(),
+                    f"<surrogate {o}>",
+                    "eval",
                 )
             self._fcn = fcn
 
         # Use numpy to do the calculations as it is faster
-        inputdata = inputs[self._input_labels].to_numpy()
+        inputdata = inputs[self._input_labels].to_numpy(dtype=float)
         outputs = np.zeros(shape=(inputs.shape[0], len(self._output_labels)))
-
-        for i in range(inputdata.shape[0]):
+        if chunk_size is None:
+            chunk_size = max(1, inputdata.shape[0])
+
+        for start in range(0, inputdata.shape[0], chunk_size):
+            stop = min(start + chunk_size, inputdata.shape[0])
+            columns = {
+                i_name: inputdata[start:stop, i]
+                for i, i_name in enumerate(self._input_labels)
+            }
             for o, o_name in enumerate(self._output_labels):
-                outputs[i, o] = value(self._fcn[o_name](*inputdata[i, :]))
+                # We need to evaluate the string returned by ALAMO
+                # pylint: disable=W0123
+                outputs[start:stop, o] = eval(self._fcn[o_name], NUMPY_FUNCS, columns)
 
         return pd.DataFrame(
             data=outputs, index=inputs.index, columns=self._output_labels
@@ -26,12 +26,18 @@ import numpy as np
 import pandas as pd
 from scipy.optimize import basinhopping
 import scipy.optimize as opt
+import scipy.linalg
+
 
 from pyomo.core import Param, exp
 
 # Imports from IDAES namespace
 from idaes.core.surrogate.pysmo.sampling import FeatureScaling as fs
 
+# Default number of elements of the (rows x samples x features) array of
+# differences built at once when computing distance matrices (~32 MB in float64)
+_DISTANCE_CHUNK_ELEMENTS = 2**22
+
 
 class MyBounds(object):
     """
@@ -90,6 +96,9 @@ class KrigingModel:
         regularization=True,
         fname=None,
         overwrite=False,
+        analytical_gradients=False,
+        chunk_size=None,
+        single_precision=False,
     ):
         """
         Initialization of **KrigingModel** class.
@@ -107,6 +116,14 @@ class KrigingModel:
 
                                                             - When regularization is turned off, the model generates an interpolating kriging model.
 
+            analytical_gradients(bool)              : Whether the analytical gradients of the concentrated likelihood are used instead of central differencing when numerical_gradients is True. Default is False.
+
+                                                            - Analytical gradients need a single factorization of the co-variance matrix per gradient evaluation, rather than two per Kriging parameter.
+
+            chunk_size(int)                         : Number of rows of the distance matrices computed at once. By default, this is chosen to keep the temporary arrays of feature differences to about 32 MB.
+
+            single_precision(bool)                  : Whether the co-variance matrices used during parameter optimization are built and factorized in single precision (float32). This halves the memory needed for large training sets, at the cost of accuracy. Default is False.
+
         Returns:
             self object with the input information and settings.
 
@@ -193,6 +210,25 @@ class KrigingModel:
         else:
             raise Exception("Choice of regularization must be boolean.")
 
+        if isinstance(analytical_gradients, bool):
+            self.analytical_gradients = analytical_gradients
+        else:
+            raise Exception("analytical_gradients must be boolean.")
+
+        if chunk_size is None or (
+            isinstance(chunk_size, int)
+            and not isinstance(chunk_size, bool)
+            and chunk_size > 0
+        ):
+            self.chunk_size = chunk_size
+        else:
+            raise Exception("chunk_size must be a positive integer.")
+
+        if isinstance(single_precision, bool):
+            self.dtype = np.float32 if single_precision else np.float64
+        else:
+            raise Exception("single_precision must be boolean.")
+
         # Results
         self.optimal_weights = None
         self.optimal_p = None
@@ -207,7 +243,44 @@ class KrigingModel:
         self.training_rmse = None
 
     @staticmethod
-    def covariance_matrix_generator(x, theta, reg_param, p):
+    def distance_matrix_generator(x1, x2, theta, p, chunk_size=None, dtype=None):
+        """
+        The distance_matrix_generator method generates the matrix of weighted distances between two sets of points,
+
+        d(i, j) = sum_k theta(k) * abs(x1(i, k) - x2(j, k)) ** p
+
+        The differences are broadcast over blocks of chunk_size rows of x1 at a time to bound memory use.
+
+        Args:
+            x1                      : first set of (scaled) points, one per row
+            x2                      : second set of (scaled) points, one per row
+            theta                   : Kriging weights
+            p                       : Kriging exponent
+            chunk_size              : number of rows of x1 handled at once (optional)
+            dtype                   : floating point type of the result (default = float64)
+
+        Returns:
+            distance_matrix         : Matrix of weighted distances, of shape (x1 rows, x2 rows)
+
+        """
+        if dtype is None:
+            dtype = np.float64
+        x1 = np.asarray(x1, dtype=dtype)
+        x2 = np.asarray(x2, dtype=dtype)
+        theta = np.asarray(theta, dtype=dtype).reshape(x2.shape[1])
+        if chunk_size is None:
+            chunk_size = max(1, _DISTANCE_CHUNK_ELEMENTS // max(1, x2.size))
+        distance_matrix = np.empty((x1.shape[0], x2.shape[0]), dtype=dtype)
+        for start in range(0, x1.shape[0], chunk_size):
+            stop = min(start + chunk_size, x1.shape[0])
+            differences = np.abs(x1[start:stop, np.newaxis, :] - x2[np.newaxis, :, :])
+            distance_matrix[start:stop, :] = np.matmul(differences**p, theta)
+        return distance_matrix
+
+    @staticmethod
+    def covariance_matrix_generator(
+        x, theta, reg_param, p, chunk_size=None, dtype=None
+    ):
         """
         The covariance_matrix_generator method generates the regularized co-variance matrix for a Kriging model
 
@@ -216,20 +289,20 @@ class KrigingModel:
             theta                   : Kriging weights
             reg_param               : regularization parameter
             p                       : Kriging exponent, fixed at 2 for smoothness.
+            chunk_size              : number of rows of the distance matrix computed at once (optional)
+            dtype                   : floating point type of the co-variance matrix (default = float64)
 
         Returns:
             cov_matrix              : Regularized co-variance matrix
 
         """
-        distance_matrix = np.zeros((x.shape[0], x.shape[0]))
-        for i in range(0, x.shape[0]):
-            distance_matrix[i, :] = (
-                np.matmul(((np.abs(x[i, :] - x)) ** p), theta)
-            ).transpose()
-        cov_matrix = np.exp(-1 * distance_matrix)
-        cov_matrix = cov_matrix + reg_param * np.eye(
-            cov_matrix.shape[0]
-        )  # Regularization parameter addition, see Forrester book
+        cov_matrix = KrigingModel.distance_matrix_generator(
+            x, x, theta, p, chunk_size=chunk_size, dtype=dtype
+        )
+        np.negative(cov_matrix, out=cov_matrix)
+        np.exp(cov_matrix, out=cov_matrix)
+        # Regularization parameter addition, see Forrester book
+        cov_matrix[np.diag_indices_from(cov_matrix)] += reg_param
         return cov_matrix
 
     @staticmethod
@@ -306,6 +379,37 @@ class KrigingModel:
         # sigma_sq = np.matmul(y_mu.transpose(), np.matmul(cov_inv, y_mu)) / ns
         return sigma_sq
 
+    @staticmethod
+    def cholesky_likelihood(cov_mat, y):
+        """
+        The cholesky_likelihood method calculates the concentrated likelihood function from a Cholesky factorization of the co-variance matrix, using triangular solves instead of its inverse.
+
+        Args:
+            cov_mat (NumPy Array)           : Regularized co-variance matrix
+            y (NumPy Array)                 : Output values of the training data
+
+        Returns:
+            conc_log_like                   : Concentrated likelihood value
+            factor                          : Cholesky factorization of cov_mat, as returned by scipy.linalg.cho_factor
+            alpha                           : Solution of cov_mat * alpha = (y - mean)
+            sigma_sq                        : MLE estimate of the Kriging variance
+
+        Raises:
+            LinAlgError: cov_mat is not positive definite
+
+        """
+        ns = y.shape[0]
+        factor = scipy.linalg.cho_factor(cov_mat, lower=True)
+        lndetcov = 2 * np.sum(np.log(np.abs(np.diag(factor[0]))))
+        ones_vec = np.ones((ns, 1))
+        cov_inv_y = scipy.linalg.cho_solve(factor, y)
+        cov_inv_ones = scipy.linalg.cho_solve(factor, ones_vec)
+        mean = np.sum(cov_inv_y) / np.sum(cov_inv_ones)
+        alpha = cov_inv_y - mean * cov_inv_ones
+        sigma_sq = np.sum((y - mean) * alpha) / ns
+        conc_log_like = (0.5 * ns * np.log(sigma_sq)) + (0.5 * lndetcov)
+        return conc_log_like, factor, alpha, sigma_sq
+
     @staticmethod
     def print_fun(x, f, accepted):
         print("at minimum %.4f accepted %d" % (f, int(accepted)))
@@ -331,25 +435,74 @@ class KrigingModel:
         theta = var_vector[:-1]
         reg_param = var_vector[-1]
         theta = 10**theta  # Assumes log(theta) provided
-        ns = y.shape[0]
-        cov_mat = self.covariance_matrix_generator(x, theta, reg_param, p)
+        cov_mat = self.covariance_matrix_generator(
+            x, theta, reg_param, p, chunk_size=self.chunk_size, dtype=self.dtype
+        )
         try:  # Check Cholesky factorization
-            L = np.linalg.cholesky(cov_mat)
-            lndetcov = 2 * np.sum(
-                np.log(np.abs(np.diag(L)))
-            )  # Approximation to 2nd term from Forrester book, making use of the Ch. factorization
-            cov_inv = self.covariance_inverse_generator(cov_mat)
-            km = self.kriging_mean(cov_inv, y)
-            y_mu = self.y_mu_calculation(y, km)
-            ssd = self.kriging_sd(cov_inv, y_mu, ns)
-            # log_like = (0.5 * ns * np.log(ssd)) + (0.5 * np.log(np.abs(np.linalg.det(cov_mat))))
-            log_like = (0.5 * ns * np.log(ssd)) + (0.5 * lndetcov)
-            conc_log_like = log_like[0, 0]
+            conc_log_like = float(self.cholesky_likelihood(cov_mat, y)[0])
         except Exception:  # pylint: disable=W0703
             # When Cholesky fails - non-positive definite covariance matrix
             conc_log_like = 1e4
         return conc_log_like
 
+    def analytical_gradient(self, var_vector, x, y, p):
+        """
+        The analytical_gradient method calculates the exact gradients of the concentrated likelihood function with respect to the Kriging hyperparameters.
+
+        With R the regularized co-variance matrix, alpha = R^-1 (y - mean) and W = R^-1 - alpha * alpha^T / variance, the gradient with respect to a parameter t is
+
+        grad(t) = 0.5 * sum(W * dR/dt)
+
+        where dR/d(log10(theta_k)) = -ln(10) * theta_k * abs(x_ik - x_jk) ** p * exp(-d_ij) and dR/d(reg_param) is the identity matrix.
+
+        Args:
+            var_vector(NumPy Array): Numpy array containing the Kriging parameters (Kriging weights and
+                regularization parameter)
+            x(NumPy Array): Scaled version of input features/variables
+            y(NumPy Array): Output variable y (unscaled)
+            p(float): Kriging model exponent (fixed to 2) to ensure model smoothness
+
+        Returns:
+            grad_vec(NumPy Array): Array of the gradients of the variables in var_vector. The gradient is zero where the co-variance matrix is not positive definite, matching the constant penalty of the objective function.
+
+        """
+        theta = 10 ** np.asarray(var_vector[:-1], dtype=np.float64)
+        reg_param = var_vector[-1]
+        grad_vec = np.zeros(
+            len(var_vector),
+        )
+        corr_mat = self.covariance_matrix_generator(
+            x, theta, 0, p, chunk_size=self.chunk_size, dtype=self.dtype
+        )
+        cov_mat = corr_mat.copy()
+        cov_mat[np.diag_indices_from(cov_mat)] += reg_param
+        try:
+            _, factor, alpha, sigma_sq = self.cholesky_likelihood(cov_mat, y)
+        except Exception:  # pylint: disable=W0703
+            return grad_vec
+        del cov_mat
+
+        w_mat = scipy.linalg.cho_solve(factor, np.eye(y.shape[0], dtype=self.dtype))
+        w_mat -= np.matmul(alpha, alpha.transpose()) / sigma_sq
+        if self.regularization is True:
+            grad_vec[-1] = 0.5 * np.trace(w_mat)
+        w_mat *= corr_mat
+        del corr_mat
+
+        x = np.asarray(x, dtype=self.dtype)
+        chunk_size = self.chunk_size
+        if chunk_size is None:
+            chunk_size = max(1, _DISTANCE_CHUNK_ELEMENTS // max(1, x.size))
+        weighted_sums = np.zeros(x.shape[1])
+        for start in range(0, x.shape[0], chunk_size):
+            stop = min(start + chunk_size, x.shape[0])
+            differences = np.abs(x[start:stop, np.newaxis, :] - x[np.newaxis, :, :])
+            weighted_sums += np.einsum(
+                "ij,ijk->k", w_mat[start:stop, :], differences**p
+            )
+        grad_vec[:-1] = -0.5 * np.log(10) * theta * weighted_sums
+        return grad_vec
+
     def numerical_gradient(self, var_vector, x, y, p):
         """
         The numerical_gradient method calculates numerical gradients for the Kriging hyperparameters
@@ -417,13 +570,17 @@ class KrigingModel:
         if self.num_grads:
             print("Optimizing kriging parameters using L-BFGS-B algorithm...")
             other_args = (self.x_data_scaled, self.y_data, p)
+            if self.analytical_gradients:
+                gradient = self.analytical_gradient
+            else:
+                gradient = self.numerical_gradient
             # opt_results = opt.minimize(self.objective_function, initial_value, args=other_args, method='L-BFGS-B', jac=self.numerical_gradient, bounds=bounds, options={'gtol': 1e-7}) #, 'disp': True})
             opt_results1 = opt.minimize(
                 self.objective_function,
                 initial_value,
                 args=other_args,
                 method="tnc",
-                jac=self.numerical_gradient,
+                jac=gradient,
                 bounds=bounds,
                 options={"gtol": 1e-7},
             )
@@ -432,7 +589,7 @@ class KrigingModel:
                 initial_value,
                 args=other_args,
                 method="L-BFGS-B",
-                jac=self.numerical_gradient,
+                jac=gradient,
                 bounds=bounds,
                 options={"gtol": 1e-7},
             )  # , 'disp': True})
@@ -527,13 +684,10 @@ class KrigingModel:
             y_prediction    : Predicted values of y
 
         """
-        y_prediction = np.zeros((x.shape[0], 1))
-        for i in range(0, x.shape[0]):
-            cmt = (np.matmul(((np.abs(x[i, :] - x)) ** p), theta)).transpose()
-            cov_matrix_tests = np.exp(-1 * cmt)
-            y_prediction[i, 0] = mean + np.matmul(
-                np.matmul(cov_matrix_tests.transpose(), cov_inv), y_mu
-            )
+        cov_matrix_tests = np.exp(
+            -1 * KrigingModel.distance_matrix_generator(x, x, theta, p)
+        )
+        y_prediction = mean + np.matmul(np.matmul(cov_matrix_tests, cov_inv), y_mu)
         ss_error = (1 / y_data.shape[0]) * (np.sum((y_data - y_prediction) ** 2))
         rmse_error = np.sqrt(ss_error)
         return ss_error, rmse_error, y_prediction
@@ -559,13 +713,16 @@ class KrigingModel:
         r_square = 1 - (ss_residual / ss_total)
         return r_square
 
-    def predict_output(self, x_pred):
+    def predict_output(self, x_pred, chunk_size=None):
         """
         The ``predict_output`` method generates output predictions for input data x_pred based a previously trained Kriging model.
 
         Args:
             x_pred(NumPy Array)             : Array of designs for which the output is to be evaluated/predicted.
 
+        Keyword Args:
+            chunk_size(int)                 : Number of designs evaluated at once. By default, the model's **chunk_size** is used.
+
         Returns:
              NumPy Array                    : Output variable predictions based on the Kriging model.
 
@@ -574,21 +731,50 @@ class KrigingModel:
         x_pred = x_pred_scaled.reshape(x_pred.shape)
         if x_pred.ndim == 1:
             x_pred = x_pred.reshape(1, len(x_pred))
-        y_pred = np.zeros((x_pred.shape[0], 1))
-        for i in range(0, x_pred.shape[0]):
-            cmt = (
-                np.matmul(
-                    ((np.abs(x_pred[i, :] - self.x_data_scaled)) ** self.optimal_p),
-                    self.optimal_weights,
-                )
-            ).transpose()
-            cov_matrix_tests = np.exp(-1 * cmt)
-            y_pred[i, 0] = self.optimal_mean + np.matmul(
-                np.matmul(cov_matrix_tests.transpose(), self.covariance_matrix_inverse),
-                self.optimal_y_mu,
+        if chunk_size is None:
+            # Models reloaded from json do not carry the training options
+            chunk_size = getattr(self, "chunk_size", None)
+        if chunk_size is None:
+            chunk_size = max(
+                1, _DISTANCE_CHUNK_ELEMENTS // max(1, self.x_data_scaled.size)
+            )
+        weights = self._prediction_weights()
+        y_pred = np.empty((x_pred.shape[0], 1))
+        # Only the covariances of chunk_size designs with the training data are
+        # held in memory at once
+        for start in range(0, x_pred.shape[0], chunk_size):
+            stop = min(start + chunk_size, x_pred.shape[0])
+            cov_matrix_tests = self.distance_matrix_generator(
+                x_pred[start:stop, :],
+                self.x_data_scaled,
+                self.optimal_weights,
+                self.optimal_p,
+                chunk_size=chunk_size,
             )
+            np.negative(cov_matrix_tests, out=cov_matrix_tests)
+            np.exp(cov_matrix_tests, out=cov_matrix_tests)
+            y_pred[start:stop, :] = np.matmul(cov_matrix_tests, weights).reshape(
+                stop - start, 1
+            )
+        y_pred += self.optimal_mean
         return y_pred
 
+    def _prediction_weights(self):
+        """
+        Returns the product of the inverse of the co-variance matrix and the deviations of the training outputs from the mean, which weights the co-variances in the predictions.
+        It is computed once per trained or loaded model, and recomputed if the model's co-variance matrix inverse or deviations are replaced.
+        """
+        cached = getattr(self, "_cached_prediction_weights", None)
+        if (
+            cached is None
+            or cached[0] is not self.covariance_matrix_inverse
+            or cached[1] is not self.optimal_y_mu
+        ):
+            weights = np.matmul(self.covariance_matrix_inverse, self.optimal_y_mu)
+            cached = (self.covariance_matrix_inverse, self.optimal_y_mu, weights)
+            self._cached_prediction_weights = cached
+        return cached[2]
+
     def training(self):
         """
         Main function for Kriging training.
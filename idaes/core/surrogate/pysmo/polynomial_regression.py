@@ -36,7 +36,6 @@ from pyomo.environ import (
     Expression,
     SolverFactory,
     ComponentMap,
-    value,
 )
 from pyomo.core.expr.visitor import replace_expressions
 
@@ -67,6 +66,12 @@ c. Optimization with Pyomo
 The Pyomo optimization approach is enabled as the default at this time.
 """
 
+# Number of feature matrix elements generated at once by predict_output
+_PREDICTION_CHUNK_ELEMENTS = 2**22
+
+# Relative cutoff for small singular values, as in numpy.linalg.pinv
+_PINV_RCOND = 1e-15
+
 
 class FeatureScaling:
     """
@@ -888,6 +893,151 @@ class PolynomialRegression:
 
         return phi_vector, training_error, crossval_error
 
+    def polyregression_all_orders(
+        self,
+        training_data,
+        test_data,
+        additional_x_training_data=None,
+        additional_x_test_data=None,
+    ):
+        """
+
+        Function that performs the polynomial regression of ``polyregression`` for every polynomial order between 1 and max_polynomial_order on one training/test split. It
+
+            - calls the method self.polygeneration once to generate the feature arrays for the maximum polynomial order; the features of the lower orders are column subsets of these arrays,
+            - for the "mle" solution method, computes a single QR factorization of the training features with the columns ordered so that the features of each polynomial order form a leading block, and obtains the Moore-Penrose solution of every order from the SVD of the (small) leading block of the R factor,
+            - for the other solution methods, calls the pre-selected solution algorithm on the column subset of each order, and
+            - calls the cross_validation_error_calculation method to calculate the training and cross-validation errors.
+
+        Args:
+            training_data(NumPy Array) : The training data to be regressed
+            test_data(NumPy Array)    : The test data to be used to cross-validate the polynomial fit
+
+        Keyword Args:
+            additional_x_training_data  : Array containing additional training features based on additional_features list supplied by the user. Will have same number of rows as training_data.
+            additional_x_test_data      : Array of additional cross-validation features based on additional_features list supplied by the user. Will have same number of rows as test_data.
+
+        Returns:
+            list                        : the results of ``polyregression`` (phi_vector, training_error, crossval_error) for each polynomial order, in increasing order.
+
+        """
+        x_training_data = training_data[:, :-1]
+        y_training_data = training_data[:, -1].reshape(training_data.shape[0], 1)
+        x_test_data = test_data[:, :-1]
+        y_test_data = test_data[:, -1].reshape(test_data.shape[0], 1)
+        max_order = self.max_polynomial_order
+        x_polynomial_data = self.polygeneration(
+            max_order, self.multinomials, x_training_data, additional_x_training_data
+        )
+        x_polynomial_data_test = self.polygeneration(
+            max_order, self.multinomials, x_test_data, additional_x_test_data
+        )
+
+        # Column order [constant, multinomials, extra terms, x, x^2, ..., x^max_order]:
+        # the features of each polynomial order are a leading block.
+        nx = x_training_data.shape[1]
+        n_columns = x_polynomial_data.shape[1]
+        permutation = np.concatenate(
+            (
+                [0],
+                np.arange(1 + max_order * nx, n_columns),
+                np.arange(1, 1 + max_order * nx),
+            )
+        ).astype(int)
+        n_common = n_columns - max_order * nx
+        x_permuted = x_polynomial_data[:, permutation]
+        x_permuted_test = x_polynomial_data_test[:, permutation]
+
+        if self.solution_method == "mle":
+            q_matrix, r_matrix = np.linalg.qr(x_permuted)
+            qty = np.matmul(q_matrix.transpose(), y_training_data)
+
+        results = []
+        for poly_order in range(1, max_order + 1):
+            n_order = n_common + poly_order * nx
+            # Position of each feature of polygeneration(poly_order) in the permuted columns
+            order_columns = np.argsort(permutation[:n_order])
+            if x_polynomial_data.shape[0] < n_order:
+                phi_vector = np.zeros((n_order, 1))
+                phi_vector[:, 0] = np.Inf
+                results.append((phi_vector, np.Inf, np.Inf))
+                continue
+
+            if self.solution_method == "mle":
+                # Moore-Penrose solution from the SVD of the leading block of R, which has the same singular values as the features of this order
+                u_matrix, singular_values, vt_matrix = np.linalg.svd(
+                    r_matrix[:n_order, :n_order]
+                )
+                cutoff = _PINV_RCOND * singular_values.max()
+                inverse_values = np.zeros(singular_values.shape)
+                inverse_values[singular_values > cutoff] = (
+                    1 / singular_values[singular_values > cutoff]
+                )
+                phi_permuted = np.matmul(
+                    vt_matrix.transpose(),
+                    inverse_values.reshape(n_order, 1)
+                    * np.matmul(u_matrix.transpose(), qty[:n_order, :]),
+                )
+            else:
+                x_order = x_permuted[:, :n_order][:, order_columns]
+                if self.solution_method == "bfgs":
+                    phi_vector = self.bfgs_parameter_optimization(
+                        x_order, y_training_data[:, 0]
+                    )
+                elif self.solution_method == "pyomo":
+                    phi_vector = self.pyomo_optimization(x_order, y_training_data[:, 0])
+                phi_permuted = np.zeros((n_order, 1))
+                phi_permuted[order_columns, :] = phi_vector.reshape(n_order, 1)
+
+            training_error = self.cross_validation_error_calculation(
+                phi_permuted, x_permuted[:, :n_order], y_training_data
+            )
+            crossval_error = self.cross_validation_error_calculation(
+                phi_permuted, x_permuted_test[:, :n_order], y_test_data
+            )
+            results.append(
+                (phi_permuted[order_columns, :], training_error, crossval_error)
+            )
+        return results
+
+    def crossvalidation_order_selection(self, training_data, cross_val_data):
+        """
+
+        Function that selects the polynomial order and weights with the lowest cross-validation error over all the training/test splits created by training_test_data_creation, using ``polyregression_all_orders`` on each split.
+
+        Args:
+            training_data(dict)     : The training datasets (and additional features, when present) returned by training_test_data_creation
+            cross_val_data(dict)    : The test datasets (and additional features, when present) returned by training_test_data_creation
+
+        Returns:
+            tuple                   : (best_error, phi_best, order_best, train_error_fit); the cross-validation error, weights, polynomial order and training error of the best fit.
+
+        """
+        fold_results = []
+        for cv_number in range(1, self.number_of_crossvalidations + 1):
+            fold_results.append(
+                self.polyregression_all_orders(
+                    training_data["training_set_" + str(cv_number)],
+                    cross_val_data["test_set_" + str(cv_number)],
+                    training_data.get("training_extras_" + str(cv_number)),
+                    cross_val_data.get("test_extras_" + str(cv_number)),
+                )
+            )
+
+        best_error = 1e20
+        train_error_fit = 1e20
+        phi_best = 0
+        order_best = 0
+        for poly_order in range(1, self.max_polynomial_order + 1):
+            for cv_number in range(1, self.number_of_crossvalidations + 1):
+                phi, train_error, cv_error = fold_results[cv_number - 1][poly_order - 1]
+                if cv_error < best_error:
+                    best_error = cv_error
+                    phi_best = phi
+                    order_best = poly_order
+                    train_error_fit = train_error
+        return best_error, phi_best, order_best, train_error_fit
+
     def surrogate_performance(
         self, phi_best, order_best, additional_features_array=None
     ):
@@ -1162,18 +1312,12 @@ class PolynomialRegression:
             print("Maximum number of iterations (Max_iter) set at: ", self.max_iter)
 
             training_data, cross_val_data = self.training_test_data_creation()
-            for poly_order in range(1, self.max_polynomial_order + 1):
-                for cv_number in range(1, self.number_of_crossvalidations + 1):
-                    phi, train_error, cv_error = self.polyregression(
-                        poly_order,
-                        training_data["training_set_" + str(cv_number)],
-                        cross_val_data["test_set_" + str(cv_number)],
-                    )
-                    if cv_error < best_error:
-                        best_error = cv_error
-                        phi_best = phi
-                        order_best = poly_order
-                        train_error_fit = train_error
+            (
+                best_error,
+                phi_best,
+                order_best,
+                train_error_fit,
+            ) = self.crossvalidation_order_selection(training_data, cross_val_data)
             print(
                 "\nInitial surrogate model is of order",
                 order_best,
@@ -1239,7 +1383,6 @@ class PolynomialRegression:
             ):
                 print("\n-------------------------------------------------")
                 print("\nIteration ", iteration_number)
-                best_error = 1e20
 
                 # Select n_adaptive_samples worst fitting points to be added to the dataset used in the previous evaluation.
                 scv_input_data = sorted_comparison_vector[:, :-2]
@@ -1272,19 +1415,12 @@ class PolynomialRegression:
                 )
 
                 training_data, cross_val_data = self.training_test_data_creation()
-
-                for poly_order in range(1, self.max_polynomial_order + 1):
-                    for cv_number in range(1, self.number_of_crossvalidations + 1):
-                        phi, train_error, cv_error = self.polyregression(
-                            poly_order,
-                            training_data["training_set_" + str(cv_number)],
-                            cross_val_data["test_set_" + str(cv_number)],
-                        )
-                        if cv_error < best_error:
-                            best_error = cv_error
-                            phi_best = phi
-                            order_best = poly_order
-                            train_error_fit = train_error
+                (
+                    best_error,
+                    phi_best,
+                    order_best,
+                    train_error_fit,
+                ) = self.crossvalidation_order_selection(training_data, cross_val_data)
                 print(
                     "\nThe best regression model is of order",
                     order_best,
@@ -1431,20 +1567,12 @@ class PolynomialRegression:
             training_data, cross_val_data = self.training_test_data_creation(
                 additional_features_array
             )
-            for poly_order in range(1, self.max_polynomial_order + 1):
-                for cv_number in range(1, self.number_of_crossvalidations + 1):
-                    phi, train_error, cv_error = self.polyregression(
-                        poly_order,
-                        training_data["training_set_" + str(cv_number)],
-                        cross_val_data["test_set_" + str(cv_number)],
-                        training_data["training_extras_" + str(cv_number)],
-                        cross_val_data["test_extras_" + str(cv_number)],
-                    )
-                    if cv_error < best_error:
-                        best_error = cv_error
-                        phi_best = phi
-                        order_best = poly_order
-                        train_error_fit = train_error
+            (
+                best_error,
+                phi_best,
+                order_best,
+                train_error_fit,
+            ) = self.crossvalidation_order_selection(training_data, cross_val_data)
             print(
                 "\nBest surrogate model is of order",
                 order_best,
@@ -1647,30 +1775,49 @@ class PolynomialRegression:
                 ans += float(w) * replace_expressions(expr, user_term_map)
         return ans
 
-    def predict_output(self, x_data):
+    def predict_output(self, x_data, chunk_size=None):
         """
 
         The ``predict_output`` method generates output predictions for input data x_data based a previously generated polynomial fitting.
 
+        The polynomial features of x_data are generated with ``polygeneration`` (and the user-defined terms evaluated with NumPy), and the predictions are obtained as their product with the polynomial coefficients.
+
         Args:
             x_data          : Numpy array of designs for which the output is to be evaluated/predicted.
 
+        Keyword Args:
+            chunk_size(int) : Number of designs evaluated at once. By default, this is chosen to keep the feature matrix of each chunk to about 32 MB.
+
         Returns:
              Numpy Array    : Output variable predictions based on the polynomial fit.
 
         """
-        nf = x_data.shape[1]
-        x_list = [i for i in range(0, nf)]
-
-        m = ConcreteModel()
-        i = Set(initialize=x_list)
-        m.xx = Var(i)
-        m.o2 = Objective(expr=self.generate_expression([m.xx[i] for i in x_list]))
+        x_data = np.asarray(x_data, dtype=float)
+        weights = np.asarray(self.optimal_weights_array, dtype=float).reshape(-1, 1)
+        if chunk_size is None:
+            chunk_size = max(1, _PREDICTION_CHUNK_ELEMENTS // weights.shape[0])
         y_eq = np.zeros((x_data.shape[0], 1))
-        for j in range(0, x_data.shape[0]):
-            for i in x_list:
-                m.xx[i] = x_data[j, i]
-            y_eq[j, 0] = value(m.o2([m.xx[i] for i in x_list]))
+        for start in range(0, x_data.shape[0], chunk_size):
+            stop = min(start + chunk_size, x_data.shape[0])
+            x_chunk = x_data[start:stop, :]
+            additional_data = None
+            if len(self.additional_term_expressions) > 0:
+                cMap = ComponentMap()
+                for i, feature in enumerate(self.extra_terms_feature_vector):
+                    cMap[feature] = x_chunk[:, i]
+                npe = NumpyEvaluator(cMap)
+                additional_data = np.zeros(
+                    (x_chunk.shape[0], len(self.additional_term_expressions))
+                )
+                for j, term in enumerate(self.additional_term_expressions):
+                    additional_data[:, j] = npe.walk_expression(term)
+            features = self.polygeneration(
+                self.final_polynomial_order,
+                self.multinomials,
+                x_chunk,
+                additional_data,
+            )
+            y_eq[start:stop, :] = np.matmul(features, weights)
         return y_eq
 
     def pickle_save(self, solutions):
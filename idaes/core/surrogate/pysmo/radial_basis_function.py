@@ -17,6 +17,8 @@
 # pylint: disable=consider-using-enumerate
 
 # Imports from the python standard library
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import os.path
 import warnings
 import pickle
@@ -26,9 +28,13 @@ from matplotlib import pyplot as plt
 import numpy as np
 import pandas as pd
 import scipy.optimize as opt
+import scipy.sparse
+import scipy.sparse.linalg
+from scipy.spatial import cKDTree
 
 from pyomo.environ import (
     ConcreteModel,
+    Expr_if,
     Param,
     Set,
     Var,
@@ -50,6 +56,19 @@ __author__ = "Oluwamayowa Amusat"
 The purpose of this file is to perform radial basis functions in Pyomo.
 """
 
+# Number of elements of the differences between designs and centres handled at once by predict_output
+_PREDICTION_CHUNK_ELEMENTS = 2**22
+
+# RBF model and hyperparameter grid used by the worker processes of
+# leave_one_out_crossvalidation. Worker processes are forked, so they inherit
+# these instead of having them pickled.
+_loocv_data = None
+
+
+def _loocv_worker(sigma):
+    model, reg_parameter = _loocv_data
+    return model.loo_errors_for_shape_parameter(sigma, reg_parameter)
+
 
 class FeatureScaling:
     """
@@ -197,6 +216,8 @@ class RadialBasisFunctions:
         regularization=None,
         fname=None,
         overwrite=False,
+        fast_loocv=False,
+        n_workers=None,
     ):
         """
 
@@ -219,6 +240,7 @@ class RadialBasisFunctions:
                     (a) 'gaussian'    : Gaussian basis transformation (Default)
                     (b) 'mq'          : Multiquadric basis transformation
                     (c) 'imq'         : Inverse multiquadric basis transformation
+                    (d) 'wendland'    : Compactly supported Wendland C2 basis transformation. With the 'algebraic' solution method, the RBF systems are built and factorized as sparse matrices.
 
 
             solution_method(str): The method to be used for solving the RBF least squares optimization problem. Three options are available:
@@ -229,6 +251,10 @@ class RadialBasisFunctions:
 
             regularization(bool): This option determines whether or not the regularization parameter :math:`\lambda` is considered during RBF fitting. Default setting is True.
 
+            fast_loocv(bool): This option determines whether the leave-one-out cross-validation errors are evaluated from a single eigendecomposition of the basis matrix per shape parameter, giving the errors for all regularization parameters in closed form. Only available with the 'algebraic' solution method. Default setting is False.
+
+            n_workers(int): Number of worker processes used to evaluate the shape parameters of the leave-one-out cross-validation grid in parallel. Default is None (serial evaluation).
+
 
         Returns:
             **self** object with the input information
@@ -242,6 +268,10 @@ class RadialBasisFunctions:
                 * **solution_method** is not 'algebraic', 'pyomo' or 'bfgs'.
             Exception:
                 - :math:`\lambda` is not boolean.
+            Exception:
+                - **fast_loocv** is not boolean, or is used with a solution method other than 'algebraic'.
+            Exception:
+                - **n_workers** is not a positive integer.
 
         **Example:**
 
@@ -342,6 +372,7 @@ class RadialBasisFunctions:
             or (basis_function.lower() == "mq")
             or (basis_function.lower() == "imq")
             or (basis_function.lower() == "spline")
+            or (basis_function.lower() == "wendland")
         ):
             basis_function = basis_function.lower()
             self.basis_function = basis_function
@@ -360,6 +391,22 @@ class RadialBasisFunctions:
             self.regularization = regularization
         print("Regularization done: ", self.regularization)
 
+        if not isinstance(fast_loocv, bool):
+            raise Exception("fast_loocv must be boolean.")
+        elif fast_loocv is True and self.solution_method != "algebraic":
+            raise Exception(
+                'fast_loocv is only available with the algebraic solution method (solution_method="algebraic").'
+            )
+        self.fast_loocv = fast_loocv
+
+        if n_workers is not None and (
+            not isinstance(n_workers, int)
+            or isinstance(n_workers, bool)
+            or n_workers < 1
+        ):
+            raise Exception("n_workers must be a positive integer.")
+        self.n_workers = n_workers
+
         # Results
         self.weights = None
         self.sigma = None
@@ -555,6 +602,82 @@ class RadialBasisFunctions:
         x_mod = np.nan_to_num(x_mod)
         return x_mod
 
+    @staticmethod
+    def wendland_basis_transformation(x, shape_parameter):
+        """
+        The function wendland_basis_transformation returns the element-by-element compactly supported Wendland C2 transformation of the input data x.
+
+        Args:
+            x(NumPy Array): Input data to be transformed
+            shape_parameter(float): Shape parameter of the Wendland function, the inverse of its support radius
+
+        Returns:
+            x_mod(NumPy Array): Wendland transformation of the input data x; x_mod = (1 - c.x)**4 * (4c.x + 1) for c.x < 1 and 0 otherwise, where c = shape parameter
+
+        Examples:
+            Wendland transformation of 0, 0.25 and 0.5 for a shape parameter of 2:
+                [In]>>  rbf.RadialBasisFunctions.wendland_basis_transformation(np.array([0, 0.25, 0.5]), 2)
+                [Out]>> array([1.    , 0.1875, 0.    ])
+
+        For more information, see Wendland H. (1995) Piecewise polynomial, positive definite and compactly supported radial functions of minimal degree.
+        https://doi.org/10.1007/BF02123482
+
+        """
+        t = x * shape_parameter
+        x_mod = (np.clip(1 - t, 0, None) ** 4) * (4 * t + 1)
+        return x_mod
+
+    def sparse_basis_generation(self, r):
+        """
+        The function sparse_basis_generation returns the Wendland basis transformation of the input data as a sparse matrix.
+        Only pairs of points within the support radius (1/r) of each other are found (with a KD-tree), so the matrix is built without forming all pairwise distances.
+
+        Args:
+            r(float)        : The shape parameter of the Wendland basis function.
+
+        Returns:
+            x_transformed(SciPy sparse matrix): Sparse (CSC) array of transformed data
+
+        """
+        tree = cKDTree(self.x_data)
+        pairs = tree.sparse_distance_matrix(
+            cKDTree(self.centres), 1 / r, output_type="ndarray"
+        )
+        x_transformed = scipy.sparse.csc_matrix(
+            (
+                self.wendland_basis_transformation(pairs["v"], r),
+                (pairs["i"], pairs["j"]),
+            ),
+            shape=(self.x_data.shape[0], self.centres.shape[0]),
+        )
+        return x_transformed
+
+    @staticmethod
+    def sparse_condition_number(x):
+        """
+        The function sparse_condition_number estimates the 1-norm condition number of a sparse square matrix x from its LU factorization, without forming its inverse.
+
+        Args:
+            x(SciPy sparse matrix): Square matrix
+
+        Returns:
+            float: Estimated condition number (infinite when x is singular)
+
+        """
+        try:
+            lu = scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(x))
+        except RuntimeError:
+            return np.inf
+        inverse_operator = scipy.sparse.linalg.LinearOperator(
+            x.shape,
+            matvec=lu.solve,
+            rmatvec=lambda b: lu.solve(b, trans="T"),
+            dtype=x.dtype,
+        )
+        return scipy.sparse.linalg.onenormest(x) * scipy.sparse.linalg.onenormest(
+            inverse_operator
+        )
+
     def basis_generation(self, r):
         """
         The function basis_generation converts the input data to the requisite basis specified by the user.
@@ -593,6 +716,8 @@ class RadialBasisFunctions:
             )
         elif self.basis_function == "spline":
             x_transformed = self.thin_plate_spline_transformation(basis_functions)
+        elif self.basis_function == "wendland":
+            x_transformed = self.wendland_basis_transformation(basis_functions, r)
         return x_transformed
 
     @staticmethod
@@ -865,6 +990,9 @@ class RadialBasisFunctions:
         https://doi.org/10.1137/11S010840
 
         """
+        if self.basis_function == "wendland" and self.solution_method == "algebraic":
+            return self._sparse_loo_error_estimation(sigma, lambda_reg)
+
         x_transformed = self.basis_generation(sigma)
         condition_number_pure = np.linalg.cond(x_transformed)
 
@@ -894,6 +1022,121 @@ class RadialBasisFunctions:
         loo_error_estimate = np.linalg.norm(error_vector)
         return condition_number_pure, condition_number_regularized, loo_error_estimate
 
+    def _sparse_loo_error_estimation(self, sigma, lambda_reg):
+        """
+        Sparse version of loo_error_estimation_with_rippa_method for compactly supported basis functions.
+        The diagonal of the inverse needed by Rippa's formula is found from a sparse LU factorization, solving for blocks of columns of the identity matrix at a time.
+        Condition numbers are 1-norm estimates (see sparse_condition_number).
+        """
+        x_transformed = self.sparse_basis_generation(sigma)
+        condition_number_pure = self.sparse_condition_number(x_transformed)
+
+        x_regularized = scipy.sparse.csc_matrix(
+            x_transformed + lambda_reg * scipy.sparse.eye(x_transformed.shape[0])
+        )
+        try:
+            lu = scipy.sparse.linalg.splu(x_regularized)
+        except RuntimeError:
+            # Singular matrix: fall back to the dense pseudo-inverse
+            x_regularized = x_regularized.toarray()
+            radial_weights = self.explicit_linear_algebra_solution(
+                x_regularized, self.y_data
+            )
+            inverse_diagonal = np.diag(np.linalg.pinv(x_regularized))
+            condition_number_regularized = np.inf
+        else:
+            condition_number_regularized = self.sparse_condition_number(x_regularized)
+            radial_weights = lu.solve(self.y_data.reshape(self.y_data.shape[0], 1))
+            n = x_regularized.shape[0]
+            inverse_diagonal = np.zeros(n)
+            block = 256
+            for start in range(0, n, block):
+                stop = min(start + block, n)
+                identity_columns = np.zeros((n, stop - start))
+                identity_columns[np.arange(start, stop), np.arange(stop - start)] = 1
+                inverse_columns = lu.solve(identity_columns)
+                inverse_diagonal[start:stop] = inverse_columns[
+                    np.arange(start, stop), np.arange(stop - start)
+                ]
+
+        error_vector = radial_weights.reshape(radial_weights.shape[0], 1) / (
+            inverse_diagonal.reshape(inverse_diagonal.shape[0], 1)
+        )
+        loo_error_estimate = np.linalg.norm(error_vector)
+        return condition_number_pure, condition_number_regularized, loo_error_estimate
+
+    def eigen_loo_error_estimation(self, sigma, reg_parameter):
+        """
+        The function eigen_loo_error_estimation evaluates the leave-one-out cross-validation (LOOCV) error with Rippa's equation for a list of regularization parameters, from a single eigendecomposition of the (symmetric) basis matrix.
+
+        With A = Q.diag(e).Q^T, the regularized inverse is (A + lambda.I)^-1 = Q.diag(1/(e + lambda)).Q^T, so both the radial weights and the diagonal of the inverse are available in closed form for every lambda.
+        As with the pseudo-inverse, eigenvalues of (A + lambda.I) which are negligible compared to the largest one are discarded.
+
+        Args:
+            self                          : contains, among other things, the input data
+            sigma(float)                  : shape parameter for the parametric bases
+            reg_parameter(list)           : regularization parameters
+
+        Returns:
+            condition_number_pure           : condition number of transformed matrix generated from the input data before regularization
+            condition_numbers_regularized   : condition numbers of the regularized matrices, for each regularization parameter
+            loo_error_estimates             : norms of the leave-one-out cross-validation error vectors, for each regularization parameter
+
+        """
+        x_transformed = self.basis_generation(sigma)
+        eigenvalues, eigenvectors = np.linalg.eigh(x_transformed)
+        reg_parameter = np.asarray(reg_parameter, dtype=float)
+
+        abs_eigenvalues = np.abs(eigenvalues)
+        condition_number_pure = np.max(abs_eigenvalues) / np.min(abs_eigenvalues)
+
+        shifted = eigenvalues[:, np.newaxis] + reg_parameter[np.newaxis, :]
+        abs_shifted = np.abs(shifted)
+        condition_numbers_regularized = np.max(abs_shifted, axis=0) / np.min(
+            abs_shifted, axis=0
+        )
+        cutoff = (
+            np.finfo(float).eps
+            * 10
+            * max(x_transformed.shape)
+            * np.max(abs_shifted, axis=0)
+        )
+        with np.errstate(divide="ignore"):
+            inverse_shifted = np.where(abs_shifted > cutoff, 1 / shifted, 0)
+
+        projected_y = np.matmul(eigenvectors.transpose(), self.y_data).reshape(-1)
+        radial_weights = np.matmul(
+            eigenvectors, projected_y[:, np.newaxis] * inverse_shifted
+        )
+        inverse_diagonal = np.matmul(eigenvectors**2, inverse_shifted)
+        loo_error_estimates = np.linalg.norm(radial_weights / inverse_diagonal, axis=0)
+        return condition_number_pure, condition_numbers_regularized, loo_error_estimates
+
+    def loo_errors_for_shape_parameter(self, sigma, reg_parameter):
+        """
+        The function loo_errors_for_shape_parameter evaluates the LOOCV errors of all regularization parameters for one shape parameter, either from a single eigendecomposition (fast_loocv) or by calling loo_error_estimation_with_rippa_method for each regularization parameter.
+
+        Args:
+            sigma(float)                  : shape parameter
+            reg_parameter(list)           : regularization parameters
+
+        Returns:
+            list of (condition number before regularization, condition number after regularization, LOOCV error) for each regularization parameter
+
+        """
+        if self.fast_loocv and self.basis_function != "wendland":
+            cond_no_pure, cond_nos_reg, cv_errors = self.eigen_loo_error_estimation(
+                sigma, reg_parameter
+            )
+            return [
+                (cond_no_pure, cond_no_reg, cv_error)
+                for cond_no_reg, cv_error in zip(cond_nos_reg, cv_errors)
+            ]
+        return [
+            self.loo_error_estimation_with_rippa_method(sigma, lambda_reg)
+            for lambda_reg in reg_parameter
+        ]
+
     def leave_one_out_crossvalidation(self):
         """
         The function leave_one_out_crossvalidation determines the best hyperparameters (shape and regularization parameters) for a given RBF fitting problem.
@@ -917,6 +1160,7 @@ class RadialBasisFunctions:
             (self.basis_function == "gaussian")
             or (self.basis_function == "mq")
             or (self.basis_function.lower() == "imq")
+            or (self.basis_function == "wendland")
         ):
             r_set = [
                 0.001,
@@ -982,15 +1226,12 @@ class RadialBasisFunctions:
         print(
             "==========================================================================================================="
         )
+        loo_results = self._shape_parameter_grid_evaluation(r_set, reg_parameter)
         for i in range(0, len(r_set)):
             sigma = r_set[i]
             for j in range(0, len(reg_parameter)):
                 lambda_reg = reg_parameter[j]
-                (
-                    cond_no_pure,
-                    cond_no_reg,
-                    cv_error,
-                ) = self.loo_error_estimation_with_rippa_method(sigma, lambda_reg)
+                cond_no_pure, cond_no_reg, cv_error = loo_results[i][j]
                 error_vector[counter, :] = [sigma, lambda_reg, cv_error]
                 counter += 1
                 print(
@@ -1014,6 +1255,36 @@ class RadialBasisFunctions:
         error_best = error_vector[minimum_value_column, 2]
         return r_best, lambda_best, error_best
 
+    def _shape_parameter_grid_evaluation(self, r_set, reg_parameter):
+        """
+        Evaluate the LOOCV errors for each shape parameter in r_set (see loo_errors_for_shape_parameter), in a pool of worker processes when n_workers > 1.
+        Worker processes are forked (where supported); otherwise the shape parameters are evaluated serially.
+        """
+        global _loocv_data  # pylint: disable=global-statement
+        try:
+            mp_context = multiprocessing.get_context("fork")
+        except ValueError:
+            mp_context = None
+        if (
+            self.n_workers is None
+            or self.n_workers == 1
+            or len(r_set) == 1
+            or mp_context is None
+        ):
+            return [
+                self.loo_errors_for_shape_parameter(sigma, reg_parameter)
+                for sigma in r_set
+            ]
+
+        _loocv_data = (self, reg_parameter)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(self.n_workers, len(r_set)), mp_context=mp_context
+            ) as executor:
+                return list(executor.map(_loocv_worker, r_set))
+        finally:
+            _loocv_data = None
+
     def training(self):
         """
         Main function for RBF training.
@@ -1044,13 +1315,31 @@ class RadialBasisFunctions:
         best_r_value, best_lambda_param, _ = self.leave_one_out_crossvalidation()
 
         # Generate x matrix
-        x_transformed = self.basis_generation(best_r_value)
-        x_transformed = x_transformed + (
-            best_lambda_param * np.eye(x_transformed.shape[0], x_transformed.shape[1])
-        )
-        x_condition_number = np.linalg.cond(x_transformed)
+        if self.basis_function == "wendland" and self.solution_method == "algebraic":
+            x_transformed = scipy.sparse.csc_matrix(
+                self.sparse_basis_generation(best_r_value)
+                + best_lambda_param
+                * scipy.sparse.eye(self.x_data.shape[0], self.centres.shape[0])
+            )
+            x_condition_number = self.sparse_condition_number(x_transformed)
+        else:
+            x_transformed = self.basis_generation(best_r_value)
+            x_transformed = x_transformed + (
+                best_lambda_param
+                * np.eye(x_transformed.shape[0], x_transformed.shape[1])
+            )
+            x_condition_number = np.linalg.cond(x_transformed)
 
-        if self.solution_method == "algebraic":
+        if scipy.sparse.issparse(x_transformed):
+            try:
+                radial_weights = scipy.sparse.linalg.splu(x_transformed).solve(
+                    self.y_data
+                )
+            except RuntimeError:
+                radial_weights = self.explicit_linear_algebra_solution(
+                    x_transformed.toarray(), self.y_data
+                )
+        elif self.solution_method == "algebraic":
             radial_weights = self.explicit_linear_algebra_solution(
                 x_transformed, self.y_data
             )
@@ -1099,7 +1388,7 @@ class RadialBasisFunctions:
         self.pickle_save({"model": self})
         return self
 
-    def predict_output(self, x_data):
+    def predict_output(self, x_data, chunk_size=None):
         """
 
         The ``predict_output`` method generates output predictions for input data x_data based a previously generated RBF fitting.
@@ -1107,6 +1396,9 @@ class RadialBasisFunctions:
         Args:
             x_data(NumPy Array)    : Designs for which the output is to be evaluated/predicted.
 
+        Keyword Args:
+            chunk_size(int)        : Number of designs evaluated at once. By default, this is chosen to keep the temporary arrays of differences from the centres to about 32 MB.
+
         Returns:
              Numpy Array    : Output variable predictions based on the rbf fit.
 
@@ -1117,47 +1409,58 @@ class RadialBasisFunctions:
         scale = self.x_data_max - self.x_data_min
         scale[scale == 0.0] = 1.0
         x_pred_scaled = (x_data - self.x_data_min) / scale
-        x_data = x_pred_scaled.reshape(x_data.shape)
-
-        basis_vector = np.zeros((x_data.shape[0], centres_matrix.shape[0]))
-        # Calculate distances from centres
-        for i in range(0, centres_matrix.shape[0]):
-            basis_vector[:, i] = np.sqrt(
-                np.sum(((x_data - centres_matrix[i, :]) ** 2), axis=1)
+        x_data = np.asarray(x_pred_scaled).reshape(x_data.shape)
+        if chunk_size is None:
+            chunk_size = max(
+                1, _PREDICTION_CHUNK_ELEMENTS // max(1, centres_matrix.size)
             )
-        # Initialization of x_transformed
-        x_transformed = np.zeros((basis_vector.shape[0], basis_vector.shape[1]))
 
-        # Transform X
-        if self.basis_function == "gaussian":
-            x_transformed = RadialBasisFunctions.gaussian_basis_transformation(
-                basis_vector, r
-            )
-        elif self.basis_function == "linear":
-            x_transformed = RadialBasisFunctions.linear_transformation(basis_vector)
-        elif self.basis_function == "cubic":
-            x_transformed = RadialBasisFunctions.cubic_transformation(basis_vector)
-        elif self.basis_function == "mq":
-            x_transformed = RadialBasisFunctions.multiquadric_basis_transformation(
-                basis_vector, r
+        y_prediction_scaled = np.zeros((x_data.shape[0], radial_weights.shape[1]))
+        for start in range(0, x_data.shape[0], chunk_size):
+            stop = min(start + chunk_size, x_data.shape[0])
+            # Calculate distances from centres
+            basis_vector = np.sqrt(
+                np.sum(
+                    (
+                        x_data[start:stop, np.newaxis, :]
+                        - centres_matrix[np.newaxis, :, :]
+                    )
+                    ** 2,
+                    axis=2,
+                )
             )
-        elif self.basis_function == "imq":
-            x_transformed = (
-                RadialBasisFunctions.inverse_multiquadric_basis_transformation(
+
+            # Transform X
+            if self.basis_function == "gaussian":
+                x_transformed = RadialBasisFunctions.gaussian_basis_transformation(
                     basis_vector, r
                 )
-            )
-        elif self.basis_function == "spline":
-            x_transformed = RadialBasisFunctions.thin_plate_spline_transformation(
-                basis_vector
+            elif self.basis_function == "linear":
+                x_transformed = RadialBasisFunctions.linear_transformation(basis_vector)
+            elif self.basis_function == "cubic":
+                x_transformed = RadialBasisFunctions.cubic_transformation(basis_vector)
+            elif self.basis_function == "mq":
+                x_transformed = RadialBasisFunctions.multiquadric_basis_transformation(
+                    basis_vector, r
+                )
+            elif self.basis_function == "imq":
+                x_transformed = (
+                    RadialBasisFunctions.inverse_multiquadric_basis_transformation(
+                        basis_vector, r
+                    )
+                )
+            elif self.basis_function == "spline":
+                x_transformed = RadialBasisFunctions.thin_plate_spline_transformation(
+                    basis_vector
+                )
+            elif self.basis_function == "wendland":
+                x_transformed = RadialBasisFunctions.wendland_basis_transformation(
+                    basis_vector, r
+                )
+            y_prediction_scaled[start:stop, :] = np.matmul(
+                x_transformed, radial_weights
             )
 
-        # Add regularization shifting?
-        x_transformed = x_transformed + (
-            0 * np.eye(x_transformed.shape[0], x_transformed.shape[1])
-        )
-        # x_transformed = x_transformed + (lambda_reg * np.eye(x_transformed.shape[0], x_transformed.shape[1]))
-        y_prediction_scaled = np.matmul(x_transformed, radial_weights)
         y_prediction_unscaled = self.y_data_min + y_prediction_scaled * (
             self.y_data_max - self.y_data_min
         )
@@ -1221,6 +1524,16 @@ class RadialBasisFunctions:
         elif self.basis_function == "spline":
             for k in range(0, len(basis_vector)):
                 rbf_terms_list.append(((basis_vector[k] ** 2) * log(basis_vector[k])))
+        elif self.basis_function == "wendland":
+            for k in range(0, len(basis_vector)):
+                rbf_terms_list.append(
+                    Expr_if(
+                        IF=basis_vector[k] * self.sigma < 1,
+                        THEN=((1 - basis_vector[k] * self.sigma) ** 4)
+                        * (4 * basis_vector[k] * self.sigma + 1),
+                        ELSE=0,
+                    )
+                )
 
         rbf_terms_array = np.asarray(rbf_terms_list)
         rbf_expr = self.y_data_min[0]
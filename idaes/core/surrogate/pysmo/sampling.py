@@ -17,12 +17,17 @@
 
 import warnings
 import itertools
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
+from scipy.spatial import cKDTree
 
 __author__ = "Oluwamayowa Amusat"
 
+# Default memory (in MB) available to the temporary arrays of each CVT assignment chunk
+_CVT_DEFAULT_MEMORY_BUDGET = 64
+
 
 class FeatureScaling:
     """
@@ -119,6 +124,9 @@ class FeatureScaling:
 
 
 class SamplingMethods:
+    # Whether rows of the input data can only be selected once in "selection" mode
+    without_replacement = False
+
     def nearest_neighbour(self, full_data, a):
         """
         Function determines the closest point to a in data_input (user provided data).
@@ -146,34 +154,67 @@ class SamplingMethods:
         closest_point = sorted_distances[0, :-1]
         return closest_point
 
-    def points_selection(self, full_data, generated_sample_points):
+    def points_selection(
+        self, full_data, generated_sample_points, without_replacement=False
+    ):
         """
-        Uses L2-distance evaluation (implemented in nearest_neighbour) to find closest available points in original data to those generated by the sampling technique.
-        Calls the nearest_neighbour function for each row in the input data.
+        Uses L2-distance evaluation to find closest available points in original data to those generated by the sampling technique.
+        A KD-tree is built once on the input variables of the data, and all the generated sample points are queried in a single batch.
 
         Args:
             full_data: refers to the input dataset supplied by the user.
             generated_sample_points(NumPy Array): The vector of points (number_of_sample rows) for which the closest points in the original data are to be found. Each row represents a sample point.
+            without_replacement(bool): Whether each row of full_data can be selected at most once. The sample points are then assigned in order to their closest row not already selected. Default is False.
 
         Returns:
             equivalent_points: Array containing the points (in rows) most similar to those in generated_sample_points
         """
-
-        equivalent_points = np.zeros(
-            (generated_sample_points.shape[0], len(self.data_headers))
+        no_y_vars = self.x_data.shape[1] - full_data.shape[1]
+        x_data = full_data[:, :no_y_vars]
+        no_samples = generated_sample_points.shape[0]
+        if without_replacement and no_samples > full_data.shape[0]:
+            raise Exception(
+                "Cannot select more samples than the number of rows in the input data set without replacement."
+            )
+        if x_data.shape[1] == 0:
+            # Without input variables all the rows are equally close to every sample point
+            if without_replacement:
+                return full_data[:no_samples, :]
+            return full_data[np.zeros(no_samples, dtype=int), :]
+
+        tree = cKDTree(x_data)
+        if not without_replacement:
+            _, closest_rows = tree.query(generated_sample_points)
+            return full_data[closest_rows, :]
+
+        no_neighbours = min(full_data.shape[0], 8)
+        _, candidates = tree.query(
+            generated_sample_points, k=[*range(1, no_neighbours + 1)]
         )
+        selected = np.zeros(full_data.shape[0], dtype=bool)
+        closest_rows = np.zeros(generated_sample_points.shape[0], dtype=int)
         for i in range(0, generated_sample_points.shape[0]):
-            closest_point = self.nearest_neighbour(
-                full_data, generated_sample_points[i, :]
-            )
-            equivalent_points[i, :] = closest_point
-        return equivalent_points
+            row_candidates = candidates[i, :]
+            k = no_neighbours
+            free = row_candidates[~selected[row_candidates]]
+            while free.size == 0:
+                # All the nearest candidates have been taken: widen the search
+                k = min(2 * k, full_data.shape[0])
+                _, row_candidates = tree.query(
+                    generated_sample_points[i, :], k=[*range(1, k + 1)]
+                )
+                free = row_candidates[~selected[row_candidates]]
+            closest_rows[i] = free[0]
+            selected[free[0]] = True
+        return full_data[closest_rows, :]
 
     def sample_point_selection(self, full_data, sample_points, sampling_type):
         if sampling_type == "selection":
             sd = FeatureScaling()
             scaled_data, data_min, data_max = sd.data_scaling_minmax(full_data)
-            points_closest_scaled = self.points_selection(scaled_data, sample_points)
+            points_closest_scaled = self.points_selection(
+                scaled_data, sample_points, without_replacement=self.without_replacement
+            )
             points_closest_unscaled = sd.data_unscaling_minmax(
                 points_closest_scaled, data_min, data_max
             )
@@ -480,6 +521,7 @@ class LatinHypercubeSampling(SamplingMethods):
         sampling_type=None,
         xlabels=None,
         ylabels=None,
+        without_replacement=False,
     ):
         """
         Initialization of **LatinHypercubeSampling** class. Two inputs are required.
@@ -496,6 +538,7 @@ class LatinHypercubeSampling(SamplingMethods):
         Keyword Args:
             xlabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the independent/input  variables.  Only used in "selection" mode. Default is None.
             ylabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the dependent/output variables. Only used in "selection" mode. Default is None.
+            without_replacement (bool): Whether each row of **data_input** can be selected at most once, so that the requested number of unique samples is returned. Only used in "selection" mode. Default is False.
 
         Returns:
             **self** function containing the input information
@@ -509,6 +552,10 @@ class LatinHypercubeSampling(SamplingMethods):
 
         """
 
+        if not isinstance(without_replacement, bool):
+            raise Exception("without_replacement must be boolean.")
+        self.without_replacement = without_replacement
+
         if sampling_type is None:
             sampling_type = "creation"
             self.sampling_type = sampling_type
@@ -718,6 +765,7 @@ class UniformSampling(SamplingMethods):
         xlabels=None,
         ylabels=None,
         edges=None,
+        without_replacement=False,
     ):
         """
         Initialization of UniformSampling class. Three inputs are required.
@@ -734,6 +782,7 @@ class UniformSampling(SamplingMethods):
         Keyword Args:
             xlabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the independent/input  variables.  Only used in "selection" mode. Default is None.
             ylabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the dependent/output variables. Only used in "selection" mode. Default is None.
+            without_replacement (bool): Whether each row of **data_input** can be selected at most once, so that the requested number of unique samples is returned. Only used in "selection" mode. Default is False.
             edges (bool): Boolean variable representing how the points should be selected. A value of True (default) indicates the points should be equally spaced edge to edge, otherwise they will be in the centres of the bins filling the unit cube
 
         Returns:
@@ -749,6 +798,10 @@ class UniformSampling(SamplingMethods):
             Exception: When **edges** entry is not Boolean
 
         """
+        if not isinstance(without_replacement, bool):
+            raise Exception("without_replacement must be boolean.")
+        self.without_replacement = without_replacement
+
         if sampling_type is None:
             sampling_type = "creation"
             self.sampling_type = sampling_type
@@ -900,6 +953,7 @@ class HaltonSampling(SamplingMethods):
         sampling_type=None,
         xlabels=None,
         ylabels=None,
+        without_replacement=False,
     ):
         """
 
@@ -917,6 +971,7 @@ class HaltonSampling(SamplingMethods):
         Keyword Args:
             xlabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the independent/input  variables.  Only used in "selection" mode. Default is None.
             ylabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the dependent/output variables. Only used in "selection" mode. Default is None.
+            without_replacement (bool): Whether each row of **data_input** can be selected at most once, so that the requested number of unique samples is returned. Only used in "selection" mode. Default is False.
 
         Returns:
             **self** function containing the input information.
@@ -929,6 +984,10 @@ class HaltonSampling(SamplingMethods):
             Exception: When the **number_of_samples** is invalid (not an integer, too large, zero or negative.)
 
         """
+        if not isinstance(without_replacement, bool):
+            raise Exception("without_replacement must be boolean.")
+        self.without_replacement = without_replacement
+
         if sampling_type is None:
             sampling_type = "creation"
             self.sampling_type = sampling_type
@@ -1079,6 +1138,7 @@ class HammersleySampling(SamplingMethods):
         sampling_type=None,
         xlabels=None,
         ylabels=None,
+        without_replacement=False,
     ):
         """
         Initialization of **HammersleySampling** class. Two inputs are required.
@@ -1095,6 +1155,7 @@ class HammersleySampling(SamplingMethods):
         Keyword Args:
             xlabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the independent/input  variables.  Only used in "selection" mode. Default is None.
             ylabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the dependent/output variables. Only used in "selection" mode. Default is None.
+            without_replacement (bool): Whether each row of **data_input** can be selected at most once, so that the requested number of unique samples is returned. Only used in "selection" mode. Default is False.
 
             Returns:
                 **self** function containing the input information.
@@ -1107,6 +1168,10 @@ class HammersleySampling(SamplingMethods):
                 Exception: When the **number_of_samples** is invalid (not an integer, too large, zero, negative)
 
         """
+        if not isinstance(without_replacement, bool):
+            raise Exception("without_replacement must be boolean.")
+        self.without_replacement = without_replacement
+
         if sampling_type is None:
             sampling_type = "creation"
             self.sampling_type = sampling_type
@@ -1260,6 +1325,10 @@ class CVTSampling(SamplingMethods):
         sampling_type=None,
         xlabels=None,
         ylabels=None,
+        without_replacement=False,
+        random_seed=None,
+        memory_budget=None,
+        n_workers=None,
     ):
         """
         Initialization of CVTSampling class. Two inputs are required, while an optional option to control the solution accuracy may be specified.
@@ -1276,10 +1345,15 @@ class CVTSampling(SamplingMethods):
         Keyword Args:
             xlabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the independent/input  variables.  Only used in "selection" mode. Default is None.
             ylabels (list): List of column names (if **data_input** is a dataframe) or column numbers (if **data_input** is an array) for the dependent/output variables. Only used in "selection" mode. Default is None.
+            without_replacement (bool): Whether each row of **data_input** can be selected at most once, so that the requested number of unique samples is returned. Only used in "selection" mode. Default is False.
             tolerance(float): Maximum allowable Euclidean distance between centres from consecutive iterations of the algorithm. Termination condition for algorithm.
 
                 - The smaller the value of tolerance, the better the solution but the longer the algorithm requires to converge. Default value is :math:`10^{-7}`.
 
+            random_seed(int): Seed for the random points used by the CVT algorithm. When supplied, the same samples are returned on every call for a given **memory_budget**, independently of **n_workers**. Default is None (seeded from NumPy's global random state).
+            memory_budget(float): Approximate memory (in MB) used by the temporary arrays of each chunk of random points assigned to the centres. Default is 64 MB.
+            n_workers(int): Number of threads used to assign the chunks of random points to their nearest centres. Default is None (serial assignment).
+
         Returns:
                 **self** function containing the input information.
 
@@ -1293,9 +1367,15 @@ class CVTSampling(SamplingMethods):
 
                 Exception: When the tolerance specified is too loose (tolerance > 0.1) or invalid
 
+                Exception: When **random_seed**, **memory_budget** or **n_workers** is invalid
+
                 warnings.warn: when the tolerance specified by the user is too tight (tolerance < :math:`10^{-9}`)
 
         """
+        if not isinstance(without_replacement, bool):
+            raise Exception("without_replacement must be boolean.")
+        self.without_replacement = without_replacement
+
         if sampling_type is None:
             sampling_type = "creation"
             self.sampling_type = sampling_type
@@ -1398,6 +1478,32 @@ class CVTSampling(SamplingMethods):
             raise Exception("Invalid tolerance input")
         self.eps = tolerance
 
+        if random_seed is not None and (
+            not isinstance(random_seed, int)
+            or isinstance(random_seed, bool)
+            or random_seed < 0
+        ):
+            raise Exception("random_seed must be a non-negative integer.")
+        self.random_seed = random_seed
+
+        if memory_budget is None:
+            memory_budget = _CVT_DEFAULT_MEMORY_BUDGET
+        elif (
+            not isinstance(memory_budget, (int, float))
+            or isinstance(memory_budget, bool)
+            or memory_budget <= 0
+        ):
+            raise Exception("memory_budget must be a positive number.")
+        self.memory_budget = memory_budget
+
+        if n_workers is not None and (
+            not isinstance(n_workers, int)
+            or isinstance(n_workers, bool)
+            or n_workers < 1
+        ):
+            raise Exception("n_workers must be a positive integer.")
+        self.n_workers = n_workers
+
     @staticmethod
     def random_sample_selection(no_samples, no_features):
         """
@@ -1439,6 +1545,75 @@ class CVTSampling(SamplingMethods):
         euc_d = np.sqrt(np.sum(d_sq, axis=1))
         return euc_d
 
+    @staticmethod
+    def nearest_centres(points, centres):
+        """
+        The function nearest_centres finds the index of the closest centre to each point in points.
+
+        Squared Euclidean distances are obtained from the expansion :math:`\\lVert c \\rVert^{2} - 2 x \\cdot c` (the :math:`\\lVert x \\rVert^{2}` term does not affect the minimum), so that a single matrix product of size points.shape[0] x centres.shape[0] is required.
+
+        Args:
+            points(NumPy Array): A 2-D array of points, size m x no_features.
+            centres(NumPy Array): A 2-D array containing the current centres, size no_centres x no_features.
+
+        Returns:
+            labels(NumPy Array): Array of size m containing the index of the closest centre of each point.
+
+        """
+        distances = points @ centres.T
+        distances *= -2.0
+        distances += np.sum(centres**2, axis=1)
+        return np.argmin(distances, axis=1)
+
+    @staticmethod
+    def centroid_statistics(points, labels, no_centres):
+        """
+        The function centroid_statistics evaluates the sum and number of the points assigned to each centre.
+
+        Args:
+            points(NumPy Array): A 2-D array of points, size m x no_features.
+            labels(NumPy Array): Array containing the index number of the centre of each point.
+            no_centres(int): Number of centres.
+
+        Returns:
+            tuple containing:
+                sums(NumPy Array): A 2-D array containing the sum of the points assigned to each centre, size no_centres x no_features.
+                counts(NumPy Array): Array containing the number of points assigned to each centre.
+
+        """
+        labels = np.asarray(labels).ravel().astype(int)
+        counts = np.bincount(labels, minlength=no_centres)
+        sums = np.zeros((no_centres, points.shape[1]))
+        for j in range(0, points.shape[1]):
+            sums[:, j] = np.bincount(labels, weights=points[:, j], minlength=no_centres)
+        return sums, counts
+
+    @staticmethod
+    def update_centres(initial_centres, sums, counts, counter):
+        """
+        The function update_centres creates the new mass centroids as the weighted average of the current centres and the mean of the points in each class.
+
+        Centres with no points assigned to them are moved towards the mean of the current centres.
+
+        Args:
+            initial_centres(NumPy Array): A 2-D array containing the current mass centroids, size no_samples x no_features.
+            sums(NumPy Array): A 2-D array containing the sum of the points assigned to each centre, size no_samples x no_features.
+            counts(NumPy Array): Array containing the number of points assigned to each centre.
+            counter(int): current iteration number
+
+        Returns:
+            centres(NumPy Array): A 2-D array containing the new mass centroids, size no_samples x no_features.
+
+        """
+        centres = np.zeros((initial_centres.shape[0], initial_centres.shape[1]))
+        occupied = counts > 0
+        centres[occupied, :] = sums[occupied, :] / counts[occupied, None]
+        centres[~occupied, :] = np.mean(initial_centres, axis=0)
+
+        # Weighted average based on previous number of iterations
+        centres = ((counter * initial_centres) + centres) / (counter + 1)
+        return centres
+
     @staticmethod
     def create_centres(
         initial_centres, current_random_points, current_centres, counter
@@ -1462,19 +1637,18 @@ class CVTSampling(SamplingMethods):
         (3) Create the new centres as the weighted average of the current centres (initial_centres) and the mean data calculated in the second step. The weighting is done based on the number of iterations (counter).
 
         """
-        centres = np.zeros((initial_centres.shape[0], initial_centres.shape[1]))
-        current_centres = current_centres.reshape(current_centres.shape[0], 1)
-        for i in range(0, initial_centres.shape[0]):
-            data_matrix = current_random_points[current_centres[:, 0] == i]
-            m_prime, n_prime = data_matrix.shape  # pylint: disable=unused-variable
-            if m_prime == 0:
-                centres[i, :] = np.mean(initial_centres, axis=0)
-            else:
-                centres[i, :] = np.mean(data_matrix, axis=0)
+        sums, counts = CVTSampling.centroid_statistics(
+            current_random_points, current_centres, initial_centres.shape[0]
+        )
+        return CVTSampling.update_centres(initial_centres, sums, counts, counter)
 
-        # Weighted average based on previous number of iterations
-        centres = ((counter * initial_centres) + centres) / (counter + 1)
-        return centres
+    def _chunk_statistics(self, seed, no_points, centres):
+        """
+        Generate no_points random points from seed, assign them to their closest centres and return their centroid_statistics.
+        """
+        points = np.random.default_rng(seed).random((no_points, centres.shape[1]))
+        labels = self.nearest_centres(points, centres)
+        return self.centroid_statistics(points, labels, centres.shape[0])
 
     def sample_points(self):
         """
@@ -1483,48 +1657,75 @@ class CVTSampling(SamplingMethods):
         Procedure based on McQueen's algorithm: iteratively minimize distance, and re-position centroids.
         Centre re-calculation done as the mean of each data cluster around each centre.
 
+        At each iteration, the random points are generated and assigned to the centres in chunks sized to fit within **memory_budget**; the chunks are processed by **n_workers** threads when requested. Each chunk draws its points from its own child seed, so that the result does not depend on the number of workers.
+
         Returns:
             NumPy Array or Pandas Dataframe:     A numpy array or Pandas dataframe containing the final **number_of_samples** centroids obtained by the CVT algorithm.
 
         """
         _, n = self.x_data.shape
         size_multiple = 1000
-        initial_centres = self.random_sample_selection(self.number_of_centres, n)
+        no_points = self.number_of_centres * size_multiple
+
+        # Chunk sizes: each chunk holds the random points and their distances to all centres
+        chunk_rows = int(
+            self.memory_budget * 1024**2 // (8 * (self.number_of_centres + 2 * n))
+        )
+        chunk_rows = min(max(chunk_rows, 1), no_points)
+        chunk_sizes = [chunk_rows] * (no_points // chunk_rows)
+        if no_points % chunk_rows > 0:
+            chunk_sizes.append(no_points % chunk_rows)
+
+        if self.random_seed is None:
+            seed_sequence = np.random.SeedSequence(np.random.randint(0, 2**31 - 1))
+        else:
+            seed_sequence = np.random.SeedSequence(self.random_seed)
+        initial_centres = np.random.default_rng(seed_sequence.spawn(1)[0]).random(
+            (self.number_of_centres, n)
+        )
+
+        executor = None
+        if self.n_workers is not None and self.n_workers > 1 and len(chunk_sizes) > 1:
+            executor = ThreadPoolExecutor(
+                max_workers=min(self.n_workers, len(chunk_sizes))
+            )
+        map_function = map if executor is None else executor.map
+
         # Iterative optimization process
         cost_old = 0
         cost_new = 0
         cost_change = float("Inf")
         counter = 1
-        while (cost_change > self.eps) and (counter <= 1000):
-            cost_old = cost_new
-            current_random_points = self.random_sample_selection(
-                self.number_of_centres * size_multiple, n
-            )
-            distance_matrix = np.zeros(
-                (current_random_points.shape[0], initial_centres.shape[0])
-            )  # Vector to store distances from centroids
-            current_centres = np.zeros(
-                (current_random_points.shape[0], 1)
-            )  # Vector containing the centroid each point belongs to
-
-            # Calculate distance between random points and centres, sort and estimate new centres
-            for i in range(0, self.number_of_centres):
-                distance_matrix[:, i] = self.eucl_distance(
-                    current_random_points, initial_centres[i, :]
+        try:
+            while (cost_change > self.eps) and (counter <= 1000):
+                cost_old = cost_new
+                chunk_seeds = seed_sequence.spawn(len(chunk_sizes))
+
+                # Assign the random points to their closest centres and estimate new centres
+                sums = np.zeros((self.number_of_centres, n))
+                counts = np.zeros(self.number_of_centres, dtype=int)
+                for chunk_sums, chunk_counts in map_function(
+                    self._chunk_statistics,
+                    chunk_seeds,
+                    chunk_sizes,
+                    itertools.repeat(initial_centres),
+                ):
+                    sums += chunk_sums
+                    counts += chunk_counts
+                new_centres = self.update_centres(
+                    initial_centres, sums, counts, counter
                 )
-            current_centres = np.argmin(distance_matrix, axis=1)
-            new_centres = self.create_centres(
-                initial_centres, current_random_points, current_centres, counter
-            )
 
-            # Estimate distance between new and old centres
-            distance_btw_centres = self.eucl_distance(new_centres, initial_centres)
-            cost_new = np.sqrt(np.sum(distance_btw_centres**2))
-            cost_change = np.abs(cost_old - cost_new)
-            counter += 1
-            # print(counter, cost_change)
-            if cost_change >= self.eps:
-                initial_centres = new_centres
+                # Estimate distance between new and old centres
+                distance_btw_centres = self.eucl_distance(new_centres, initial_centres)
+                cost_new = np.sqrt(np.sum(distance_btw_centres**2))
+                cost_change = np.abs(cost_old - cost_new)
+                counter += 1
+                if cost_change >= self.eps:
+                    initial_centres = new_centres
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         sample_points = new_centres
 
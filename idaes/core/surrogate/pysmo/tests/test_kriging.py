@@ -142,6 +142,59 @@ class TestKrigingModel:
             np.round(cov_matrix, 7), np.round(cov_matrix_exp, 7)
         )
 
+    @pytest.mark.unit
+    def test__init__10(self):
+        input_array = np.array(self.training_data)
+        with pytest.raises(Exception):
+            KrigingModel(input_array, analytical_gradients=1)
+        with pytest.raises(Exception):
+            KrigingModel(input_array, chunk_size=0)
+        with pytest.raises(Exception):
+            KrigingModel(input_array, chunk_size=1.5)
+        with pytest.raises(Exception):
+            KrigingModel(input_array, single_precision=1)
+
+        KrigingClass = KrigingModel(
+            input_array,
+            analytical_gradients=True,
+            chunk_size=10,
+            single_precision=True,
+        )
+        assert KrigingClass.analytical_gradients is True
+        assert KrigingClass.chunk_size == 10
+        assert KrigingClass.dtype == np.float32
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunk_size", [None, 1, 7])
+    def test_distance_matrix_generator(self, chunk_size):
+        input_array = np.array(self.training_data)
+        KrigingClass = KrigingModel(input_array)
+        x = KrigingClass.x_data_scaled
+        theta = np.array([0.5, 3])
+        distance_matrix = KrigingClass.distance_matrix_generator(
+            x, x[:4, :], theta, 2, chunk_size=chunk_size
+        )
+
+        distance_matrix_exp = np.zeros((x.shape[0], 4))
+        for i in range(x.shape[0]):
+            for j in range(4):
+                distance_matrix_exp[i, j] = np.sum(theta * np.abs(x[i] - x[j]) ** 2)
+        np.testing.assert_allclose(distance_matrix, distance_matrix_exp, rtol=1e-12)
+
+    @pytest.mark.unit
+    def test_covariance_matrix_generator_single_precision(self):
+        input_array = np.array(self.training_data)
+        KrigingClass = KrigingModel(input_array)
+        theta = np.array([1, 2])
+        cov_matrix = KrigingClass.covariance_matrix_generator(
+            KrigingClass.x_data_scaled, theta, 1e-3, 2
+        )
+        cov_matrix_32 = KrigingClass.covariance_matrix_generator(
+            KrigingClass.x_data_scaled, theta, 1e-3, 2, chunk_size=3, dtype=np.float32
+        )
+        assert cov_matrix_32.dtype == np.float32
+        np.testing.assert_allclose(cov_matrix_32, cov_matrix, rtol=1e-6, atol=1e-7)
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
     def test_covariance_inverse_generator_01(self, array_type):
@@ -272,6 +325,67 @@ class TestKrigingModel:
         grad_vec_exp = np.array([0, 0, 0])
         np.testing.assert_array_equal(np.round(grad_vec, 5), np.round(grad_vec_exp, 5))
 
+    @pytest.mark.unit
+    def test_cholesky_likelihood(self):
+        input_array = np.array(self.training_data)
+        KrigingClass = KrigingModel(input_array[0:3], regularization=True)
+        cov_matrix = KrigingClass.covariance_matrix_generator(
+            KrigingClass.x_data_scaled, np.array([10, 100]), 1.00000000e-06, 2
+        )
+        conc_log_like, _, alpha, sigma_sq = KrigingClass.cholesky_likelihood(
+            cov_matrix, KrigingClass.y_data
+        )
+
+        cov_inv = np.linalg.inv(cov_matrix)
+        mean = KrigingClass.kriging_mean(cov_inv, KrigingClass.y_data)
+        y_mu = KrigingClass.y_mu_calculation(KrigingClass.y_data, mean)
+        np.testing.assert_allclose(alpha, np.matmul(cov_inv, y_mu), rtol=1e-8)
+        assert sigma_sq == pytest.approx(
+            KrigingClass.kriging_sd(cov_inv, y_mu, 3)[0, 0], rel=1e-8
+        )
+        assert conc_log_like == pytest.approx(8.0408619, abs=1e-5)
+
+        with pytest.raises(np.linalg.LinAlgError):
+            KrigingClass.cholesky_likelihood(-cov_matrix, KrigingClass.y_data)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("regularization", [True, False])
+    @pytest.mark.parametrize("chunk_size", [None, 4])
+    def test_analytical_gradient(self, regularization, chunk_size):
+        input_array = np.array(self.training_data)
+        KrigingClass = KrigingModel(
+            input_array, regularization=regularization, chunk_size=chunk_size
+        )
+        p = 2
+        var_vector = np.array([-0.5, 0.2, 1e-3])
+        grad_vec = KrigingClass.analytical_gradient(
+            var_vector, KrigingClass.x_data_scaled, KrigingClass.y_data, p
+        )
+        grad_vec_exp = KrigingClass.numerical_gradient(
+            var_vector, KrigingClass.x_data_scaled, KrigingClass.y_data, p
+        )
+        np.testing.assert_allclose(grad_vec, grad_vec_exp, rtol=1e-4, atol=1e-6)
+        if not regularization:
+            assert grad_vec[-1] == 0
+
+    @pytest.mark.unit
+    def test_analytical_gradient_not_positive_definite(self):
+        input_array = np.array(self.training_data)
+        KrigingClass = KrigingModel(input_array[0:3], regularization=True)
+        grad_vec = KrigingClass.analytical_gradient(
+            np.array([1, 2, -2]), KrigingClass.x_data_scaled, KrigingClass.y_data, 2
+        )
+        np.testing.assert_array_equal(grad_vec, np.zeros(3))
+
+    @pytest.mark.unit
+    def test_parameter_optimization_analytical_gradients(self):
+        input_array = np.array(self.training_data)
+        KrigingClass = KrigingModel(input_array, analytical_gradients=True)
+        p = 2
+        opt_results = KrigingClass.parameter_optimization(p)
+        assert len(opt_results.x) == 3
+        assert opt_results.fun < 1e4
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
     def test_parameter_optimization_01(self, array_type):
@@ -412,6 +526,41 @@ class TestKrigingModel:
         y_pred = KrigingClass.predict_output(KrigingClass.x_data_scaled)
         assert y_pred.shape[0] == KrigingClass.x_data_scaled.shape[0]
 
+    @pytest.mark.unit
+    def test_predict_output_chunks(self):
+        input_array = np.array(self.training_data)
+        np.random.seed(0)
+        KrigingClass = KrigingModel(input_array, overwrite=True)
+        results = KrigingClass.training()
+        x_test = input_array[:, :-1]
+        y_pred = KrigingClass.predict_output(x_test)
+        assert y_pred.shape == (x_test.shape[0], 1)
+        np.testing.assert_allclose(y_pred, results.output_predictions, rtol=1e-6)
+        np.testing.assert_allclose(
+            KrigingClass.predict_output(x_test, chunk_size=2), y_pred, rtol=1e-9
+        )
+
+        # only chunk_size designs are compared with the training data at once
+        shapes = []
+        distance_matrix_generator = KrigingClass.distance_matrix_generator
+
+        def recording_generator(x1, x2, *args, **kwargs):
+            shapes.append((x1.shape[0], x2.shape[0]))
+            return distance_matrix_generator(x1, x2, *args, **kwargs)
+
+        KrigingClass.distance_matrix_generator = recording_generator
+        KrigingClass.predict_output(x_test, chunk_size=3)
+        del KrigingClass.distance_matrix_generator
+        assert max(rows for rows, _ in shapes) == 3
+        assert sum(rows for rows, _ in shapes) == x_test.shape[0]
+
+        # the prediction weights are computed once, until the model changes
+        weights = KrigingClass._prediction_weights()
+        KrigingClass.predict_output(x_test)
+        assert KrigingClass._prediction_weights() is weights
+        KrigingClass.optimal_y_mu = 2 * KrigingClass.optimal_y_mu
+        np.testing.assert_allclose(KrigingClass._prediction_weights(), 2 * weights)
+
     @pytest.mark.unit
     @pytest.fixture(scope="module")
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
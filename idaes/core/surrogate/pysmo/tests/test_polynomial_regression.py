@@ -20,6 +20,7 @@ from idaes.core.surrogate.pysmo.polynomial_regression import (
 import numpy as np
 import pandas as pd
 import pytest
+from pyomo.environ import ConcreteModel, Var, sin, value
 
 
 class TestFeatureScaling:
@@ -1541,6 +1542,69 @@ class TestPolynomialRegression:
         np.testing.assert_array_equal(expected_output, output_2)
         np.testing.assert_array_equal(expected_output, output_3)
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("solution_method", ["mle", "bfgs"])
+    @pytest.mark.parametrize("multinomials", [0, 1])
+    @pytest.mark.parametrize("extras", [False, True])
+    def test_polyregression_all_orders(self, solution_method, multinomials, extras):
+        x = np.random.default_rng(1).random((40, 3))
+        y = np.sin(x[:, 0] + 2 * x[:, 1]) + x[:, 2] ** 3
+        regression_data_input = np.column_stack((x, y))
+        data_feed = PolynomialRegression(
+            regression_data_input,
+            regression_data_input,
+            maximum_polynomial_order=4,
+            multinomials=multinomials,
+            solution_method=solution_method,
+        )
+        training_data = regression_data_input[0:30, :]
+        test_data = regression_data_input[30:, :]
+        additional_data = [None, None]
+        if extras:
+            extra_features = np.column_stack((np.exp(x[:, 0]), x[:, 1] / (1 + x[:, 2])))
+            additional_data = [extra_features[0:30, :], extra_features[30:, :]]
+
+        output = data_feed.polyregression_all_orders(
+            training_data, test_data, *additional_data
+        )
+        assert len(output) == 4
+        for poly_order in range(1, 5):
+            expected_output = data_feed.polyregression(
+                poly_order, training_data, test_data, *additional_data
+            )
+            np.testing.assert_allclose(
+                output[poly_order - 1][0], expected_output[0], rtol=1e-5, atol=1e-6
+            )
+            assert output[poly_order - 1][1] == pytest.approx(
+                expected_output[1], rel=1e-5, abs=1e-9
+            )
+            assert output[poly_order - 1][2] == pytest.approx(
+                expected_output[2], rel=1e-5, abs=1e-9
+            )
+
+    @pytest.mark.unit
+    def test_polyregression_all_orders_underspecified(self):
+        regression_data_input = np.array(self.training_data)
+        data_feed = PolynomialRegression(
+            regression_data_input,
+            regression_data_input,
+            maximum_polynomial_order=5,
+            solution_method="mle",
+        )
+        training_data = regression_data_input[0:8, :]
+        test_data = regression_data_input[8:, :]
+        output = data_feed.polyregression_all_orders(training_data, test_data)
+        for poly_order in range(1, 6):
+            expected_output = data_feed.polyregression(
+                poly_order, training_data, test_data
+            )
+            np.testing.assert_allclose(
+                output[poly_order - 1][0], expected_output[0], rtol=1e-6, atol=1e-8
+            )
+            assert output[poly_order - 1][2] == pytest.approx(
+                expected_output[2], rel=1e-6, abs=1e-9
+            )
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
     def test_surrogate_performance_01(self, array_type):
@@ -2052,6 +2116,41 @@ class TestPolynomialRegression:
         data_feed.set_additional_terms(np.array([1, 2]))
         np.testing.assert_equal(np.array([1, 2]), data_feed.additional_term_expressions)
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("additional_terms", [False, True])
+    def test_predict_output(self, additional_terms):
+        original_data_input = pd.DataFrame(self.full_data)
+        regression_data_input = np.array(self.training_data)
+        data_feed = PolynomialRegression(
+            original_data_input,
+            regression_data_input,
+            maximum_polynomial_order=2,
+            multinomials=1,
+            solution_method="mle",
+        )
+        p = data_feed.get_feature_vector()
+        if additional_terms:
+            data_feed.set_additional_terms([sin(p["x1"]), p["x1"] / (1 + p["x2"])])
+        data_feed.training()
+
+        x_test = np.array([[i + 0.3, 9.1 - 0.7 * i] for i in range(7)])
+        output = data_feed.predict_output(x_test)
+
+        # Reference: evaluate the Pyomo expression of the model one row at a time
+        m = ConcreteModel()
+        m.x = Var([0, 1])
+        expr = data_feed.generate_expression([m.x[0], m.x[1]])
+        expected_output = np.zeros((x_test.shape[0], 1))
+        for i in range(x_test.shape[0]):
+            m.x[0].value, m.x[1].value = x_test[i, :]
+            expected_output[i, 0] = value(expr)
+
+        assert output.shape == (x_test.shape[0], 1)
+        np.testing.assert_allclose(output, expected_output, rtol=1e-10)
+        np.testing.assert_allclose(
+            data_feed.predict_output(x_test, chunk_size=3), output, rtol=1e-12
+        )
+
     @pytest.mark.unit
     @pytest.fixture(scope="module")
     @pytest.mark.parametrize("array_type1", [pd.DataFrame])
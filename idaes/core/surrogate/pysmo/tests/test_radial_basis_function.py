@@ -21,9 +21,12 @@ from idaes.core.surrogate.pysmo.radial_basis_function import (
 )
 import numpy as np
 import pandas as pd
+import scipy.sparse
 from scipy.spatial import distance
 import pytest
 
+from pyomo.environ import value
+
 
 class TestFeatureScaling:
     test_data_1d = [[x] for x in range(10)]
@@ -1883,6 +1886,161 @@ class TestRadialBasisFunction:
         assert (lambda_best in reg_parameter) == True
         assert error_best == expected_errors
 
+    @pytest.mark.unit
+    def test__init__fast_loocv_n_workers(self):
+        input_array = np.array(self.training_data)
+        with pytest.raises(Exception):
+            RadialBasisFunctions(input_array, fast_loocv=1)
+        with pytest.raises(Exception):
+            RadialBasisFunctions(input_array, solution_method="bfgs", fast_loocv=True)
+        with pytest.raises(Exception):
+            RadialBasisFunctions(input_array, n_workers=0)
+        with pytest.raises(Exception):
+            RadialBasisFunctions(input_array, n_workers=2.0)
+
+        RbfClass = RadialBasisFunctions(
+            input_array, basis_function="wendland", fast_loocv=True, n_workers=2
+        )
+        assert RbfClass.basis_function == "wendland"
+        assert RbfClass.fast_loocv is True
+        assert RbfClass.n_workers == 2
+
+    @pytest.mark.unit
+    def test_wendland_basis_transformation(self):
+        output = RadialBasisFunctions.wendland_basis_transformation(
+            np.array([0, 0.25, 0.5, 1]), 2
+        )
+        np.testing.assert_allclose(output, [1, 0.1875, 0, 0])
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("shape_parameter", [0.5, 2, 5])
+    def test_sparse_basis_generation(self, shape_parameter):
+        input_array = np.array(self.training_data)
+        RbfClass = RadialBasisFunctions(input_array, basis_function="wendland")
+        sparse_basis = RbfClass.sparse_basis_generation(shape_parameter)
+        dense_basis = RbfClass.basis_generation(shape_parameter)
+        np.testing.assert_allclose(sparse_basis.toarray(), dense_basis, atol=1e-14)
+
+    @pytest.mark.unit
+    def test_sparse_condition_number(self):
+        x = np.array([[2.0, 1.0, 0.0], [1.0, 3.0, 0.5], [0.0, 0.5, 1.0]])
+        cond_exp = np.linalg.cond(x, 1)
+        assert RadialBasisFunctions.sparse_condition_number(
+            scipy.sparse.csc_matrix(x)
+        ) == pytest.approx(cond_exp)
+        assert RadialBasisFunctions.sparse_condition_number(
+            scipy.sparse.csc_matrix(np.zeros((2, 2)))
+        ) == float("inf")
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("basis_function", ["gaussian", "mq", "imq", "cubic"])
+    def test_eigen_loo_error_estimation(self, basis_function):
+        input_array = np.array(self.training_data)
+        RbfClass = RadialBasisFunctions(input_array, basis_function=basis_function)
+        reg_parameter = [0.0001, 0.01, 0.5]
+        (
+            cond_no_pure,
+            cond_nos_reg,
+            loo_errors,
+        ) = RbfClass.eigen_loo_error_estimation(2.0, reg_parameter)
+        for lambda_reg, cond_no_reg, loo_error in zip(
+            reg_parameter, cond_nos_reg, loo_errors
+        ):
+            (
+                cond_no_pure_exp,
+                cond_no_reg_exp,
+                loo_error_exp,
+            ) = RbfClass.loo_error_estimation_with_rippa_method(2.0, lambda_reg)
+            assert cond_no_pure == pytest.approx(cond_no_pure_exp, rel=1e-6)
+            assert cond_no_reg == pytest.approx(cond_no_reg_exp, rel=1e-6)
+            assert loo_error == pytest.approx(loo_error_exp, rel=1e-6)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("lambda_reg", [0.0001, 0.1])
+    def test_sparse_loo_error_estimation(self, lambda_reg):
+        input_array = np.array(self.training_data)
+        RbfClass = RadialBasisFunctions(input_array, basis_function="wendland")
+        _, _, loo_error = RbfClass.loo_error_estimation_with_rippa_method(
+            2.0, lambda_reg
+        )
+
+        x_regularized = RbfClass.basis_generation(2.0) + lambda_reg * np.eye(
+            RbfClass.x_data.shape[0]
+        )
+        radial_weights = np.linalg.solve(x_regularized, RbfClass.y_data)
+        inverse_diagonal = np.diag(np.linalg.inv(x_regularized)).reshape(-1, 1)
+        assert loo_error == pytest.approx(
+            np.linalg.norm(radial_weights / inverse_diagonal), rel=1e-8
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("n_workers", [None, 2])
+    def test_leave_one_out_crossvalidation_fast_loocv(self, n_workers):
+        input_array = np.array(self.training_data)
+        RbfClass = RadialBasisFunctions(input_array, basis_function="gaussian")
+        r_best, lambda_best, error_best = RbfClass.leave_one_out_crossvalidation()
+
+        RbfClass_fast = RadialBasisFunctions(
+            input_array, basis_function="gaussian", fast_loocv=True, n_workers=n_workers
+        )
+        (
+            r_best_fast,
+            lambda_best_fast,
+            error_best_fast,
+        ) = RbfClass_fast.leave_one_out_crossvalidation()
+        assert r_best_fast == r_best
+        assert lambda_best_fast == lambda_best
+        assert error_best_fast == pytest.approx(error_best, rel=1e-6)
+
+    @pytest.mark.unit
+    def test_leave_one_out_crossvalidation_n_workers(self):
+        input_array = np.array(self.training_data)
+        RbfClass = RadialBasisFunctions(input_array, basis_function="wendland")
+        expected = RbfClass.leave_one_out_crossvalidation()
+
+        RbfClass.n_workers = 3
+        assert RbfClass.leave_one_out_crossvalidation() == expected
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("basis_function", ["gaussian", "cubic", "spline"])
+    def test_rbf_predict_output_chunks(self, basis_function):
+        input_array = np.array(self.training_data)
+        data_feed = RadialBasisFunctions(
+            input_array, basis_function=basis_function, overwrite=True
+        )
+        results = data_feed.training()
+        x_test = input_array[:, :-1]
+        output = data_feed.predict_output(x_test)
+        assert output.shape == (x_test.shape[0], 1)
+        np.testing.assert_allclose(output, results.output_predictions, rtol=1e-8)
+        np.testing.assert_allclose(
+            data_feed.predict_output(x_test, chunk_size=4), output, rtol=1e-12
+        )
+
+    @pytest.mark.unit
+    def test_rbf_training_wendland(self):
+        input_array = np.array(self.training_data)
+        data_feed = RadialBasisFunctions(
+            input_array, basis_function="wendland", overwrite=True
+        )
+        p = data_feed.get_feature_vector()
+        results = data_feed.training()
+        assert results.solution_status == "ok"
+        assert results.R2 > 0.99
+
+        x_test = input_array[:, :-1]
+        np.testing.assert_allclose(
+            data_feed.predict_output(x_test), results.output_predictions, rtol=1e-8
+        )
+
+        rbf_expr = data_feed.generate_expression([p[i] for i in p.keys()])
+        for i, j in [(0, 7.5), (2.5, 2.5), (10, 0)]:
+            p[0] = i
+            p[1] = j
+            assert value(rbf_expr) == pytest.approx(
+                data_feed.predict_output(np.array([[i, j]]))[0, 0], rel=1e-8
+            )
+
     @pytest.mark.unit
     @pytest.fixture(scope="module")
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
@@ -260,6 +260,79 @@ class TestSamplingMethods:
                 input_array, generated_sample_points
             )
 
+    @pytest.mark.unit
+    def test_points_selection_06(self):
+        # KD-tree selection matches nearest_neighbour for each point
+        rng = np.random.default_rng(42)
+        input_array = rng.random((200, 4))
+        generated_sample_points = rng.random((50, 3))
+        sampling_methods = self._create_sampling(input_array, generated_sample_points)
+        equivalent_points = sampling_methods.points_selection(
+            input_array, generated_sample_points
+        )
+        for i in range(generated_sample_points.shape[0]):
+            np.testing.assert_array_equal(
+                equivalent_points[i],
+                sampling_methods.nearest_neighbour(
+                    input_array, generated_sample_points[i, :]
+                ),
+            )
+
+    @pytest.mark.unit
+    def test_points_selection_without_replacement_01(self):
+        input_array = np.array(self.test_data_3d)
+        # All points are closest to the first row
+        generated_sample_points = np.array([[-3, 8], [-2, 9], [-1, 10]])
+        sampling_methods = self._create_sampling(input_array, generated_sample_points)
+        equivalent_points = sampling_methods.points_selection(
+            input_array, generated_sample_points, without_replacement=True
+        )
+        np.testing.assert_array_equal(equivalent_points, input_array[:3, :])
+
+        equivalent_points = sampling_methods.points_selection(
+            input_array, generated_sample_points
+        )
+        np.testing.assert_array_equal(equivalent_points, input_array[[0, 0, 0], :])
+
+    @pytest.mark.unit
+    def test_points_selection_without_replacement_02(self):
+        # Enough repeated points to exhaust the initial neighbour search
+        rng = np.random.default_rng(1)
+        input_array = rng.random((30, 3))
+        generated_sample_points = np.zeros((30, 2))
+        sampling_methods = self._create_sampling(input_array, generated_sample_points)
+        equivalent_points = sampling_methods.points_selection(
+            input_array, generated_sample_points, without_replacement=True
+        )
+        np.testing.assert_array_equal(
+            np.unique(equivalent_points, axis=0), np.unique(input_array, axis=0)
+        )
+        distances = np.sqrt(np.sum(equivalent_points[:, :2] ** 2, axis=1))
+        assert (np.diff(distances) >= 0).all()
+
+        with pytest.raises(Exception):
+            sampling_methods.points_selection(
+                input_array, np.zeros((31, 2)), without_replacement=True
+            )
+
+    @pytest.mark.unit
+    def test_points_selection_without_replacement_03(self):
+        # No input variables, so all the rows are equally close
+        input_array = np.array(self.test_data_1d)
+        generated_sample_points = np.array([[], [], []])
+        sampling_methods = self._create_sampling(input_array, generated_sample_points)
+        equivalent_points = sampling_methods.points_selection(
+            input_array, generated_sample_points, without_replacement=True
+        )
+        np.testing.assert_array_equal(equivalent_points, input_array[:3, :])
+
+        with pytest.raises(Exception):
+            sampling_methods.points_selection(
+                input_array,
+                np.zeros((input_array.shape[0] + 1, 0)),
+                without_replacement=True,
+            )
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array])
     def test_sample_point_selection_01(self, array_type):
@@ -795,6 +868,28 @@ class TestLatinHypercubeSampling:
             )
             np.testing.assert_array_equal(expected_testing, out_testing)
 
+    @pytest.mark.unit
+    def test_sample_points_without_replacement(self):
+        input_array = pd.DataFrame(self.full_data)
+        with pytest.raises(Exception, match="without_replacement must be boolean"):
+            LatinHypercubeSampling(
+                input_array,
+                number_of_samples=10,
+                sampling_type="selection",
+                without_replacement=1,
+            )
+        for num_samples in [10, 100, 441]:
+            LHSClass = LatinHypercubeSampling(
+                input_array,
+                number_of_samples=num_samples,
+                sampling_type="selection",
+                without_replacement=True,
+            )
+            assert LHSClass.without_replacement is True
+            unique_sample_points = np.array(LHSClass.sample_points())
+            assert unique_sample_points.shape == (num_samples, 3)
+            assert np.unique(unique_sample_points, axis=0).shape == (num_samples, 3)
+
 
 class TestUniformSampling:
     input_array = [[x, x + 10, (x + 1) ** 2 + x + 10] for x in range(10)]
@@ -2194,6 +2289,77 @@ class TestCVTSampling:
         )
         np.testing.assert_array_equal(expected_output, output)
 
+    @pytest.mark.unit
+    def test_create_centres_05(self):
+        # Empty classes are moved towards the mean of the current centres
+        initial_centres = np.array([[0, 0], [1, 1], [0.5, 0.2]])
+        current_random_points = np.array([[0.6, 0.6], [0.8, 0.8]])
+        current_centres = np.array([1, 1])
+        counter = 1
+        expected_output = np.array([[0.25, 0.2], [0.85, 0.85], [0.5, 0.3]])
+        output = CVTSampling.create_centres(
+            initial_centres, current_random_points, current_centres, counter
+        )
+        np.testing.assert_array_almost_equal(expected_output, output, decimal=12)
+
+    @pytest.mark.unit
+    def test_nearest_centres(self):
+        points = np.random.rand(200, 3)
+        centres = np.random.rand(7, 3)
+        expected_output = np.argmin(
+            np.sqrt(((points[:, None, :] - centres[None, :, :]) ** 2).sum(axis=2)),
+            axis=1,
+        )
+        output = CVTSampling.nearest_centres(points, centres)
+        np.testing.assert_array_equal(expected_output, output)
+
+    @pytest.mark.unit
+    def test_centroid_statistics(self):
+        points = np.array([[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]])
+        labels = np.array([2, 0, 2])
+        sums, counts = CVTSampling.centroid_statistics(points, labels, 4)
+        np.testing.assert_array_equal(counts, np.array([1, 0, 2, 0]))
+        np.testing.assert_array_almost_equal(
+            sums, np.array([[0.3, 0.4], [0, 0], [0.6, 0.8], [0, 0]]), decimal=12
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"random_seed": -1},
+            {"random_seed": 1.5},
+            {"memory_budget": 0},
+            {"memory_budget": "64"},
+            {"n_workers": 0},
+            {"n_workers": True},
+        ],
+    )
+    def test__init__invalid_chunking_options(self, kwargs):
+        with pytest.raises(Exception):
+            CVTSampling(
+                self.input_array_list,
+                number_of_samples=5,
+                sampling_type="creation",
+                **kwargs,
+            )
+
+    @pytest.mark.unit
+    def test_sample_points_reproducible_chunks(self):
+        results = []
+        for n_workers in [None, 3]:
+            CVTClass = CVTSampling(
+                self.input_array_list,
+                number_of_samples=6,
+                tolerance=1e-4,
+                sampling_type="creation",
+                random_seed=42,
+                memory_budget=0.05,
+                n_workers=n_workers,
+            )
+            results.append(CVTClass.sample_points())
+        np.testing.assert_array_equal(results[0], results[1])
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array])
     def test_sample_points_01(self, array_type):
@@ -19,10 +19,12 @@
 # pylint: disable=protected-access
 
 # stdlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import io
 import json
 from json import JSONEncoder, JSONDecodeError
 import logging
+import multiprocessing
 from typing import Dict, Union
 
 # third-party
@@ -32,7 +34,14 @@ import pandas as pd
 # package
 import pyomo.core as pc
 from pyomo.environ import Constraint, sin, cos, log, exp, Set, Param
-from pyomo.common.config import ConfigValue, In, Bool, PositiveInt, PositiveFloat
+from pyomo.common.config import (
+    ConfigValue,
+    In,
+    Bool,
+    PositiveInt,
+    PositiveFloat,
+    NonNegativeInt,
+)
 from idaes.core.surrogate.base.surrogate_base import SurrogateTrainer, SurrogateBase
 from idaes.core.surrogate.pysmo import (
     polynomial_regression as pr,
@@ -52,6 +61,23 @@ _log = idaeslog.getLogger(__name__)
 # ----------------
 GLOBAL_FUNCS = {"sin": sin, "cos": cos, "log": log, "exp": exp}
 
+# Trainer and per-output seeds used by the worker processes of
+# PysmoTrainer._training_main_loop. Worker processes are forked, so they
+# inherit these instead of having them pickled.
+_training_data = None
+
+
+def _train_output_worker(i):
+    trainer, seeds = _training_data
+    return i, trainer._train_output(
+        i, None if seeds is None else seeds[i], save_file=False
+    )
+
+
+def _skip_pickle_save(solutions):
+    # Replaces the pickle_save method of models trained in worker processes
+    pass
+
 
 class PysmoSurrogateTrainingResult:
     """
@@ -166,6 +192,27 @@ class PysmoTrainer(SurrogateTrainer):
     # Initialize with configuration for base SurrogateTrainer
     CONFIG = SurrogateTrainer.CONFIG()
 
+    CONFIG.declare(
+        "n_workers",
+        ConfigValue(
+            default=None,
+            domain=PositiveInt,
+            description="Number of worker processes used to train the models of the "
+            "different outputs concurrently. Default is None (outputs trained in sequence).",
+        ),
+    )
+
+    CONFIG.declare(
+        "random_seed",
+        ConfigValue(
+            default=None,
+            domain=NonNegativeInt,
+            description="Seed for the random numbers used in training. When set, the "
+            "model of each output is trained from its own seed derived from this value, "
+            "so that results do not depend on n_workers.",
+        ),
+    )
+
     # Subclasses must override this with a specific surrogate model type name
     model_type = "base"
 
@@ -208,26 +255,95 @@ class PysmoTrainer(SurrogateTrainer):
         """Subclasses should override this to return a dict of metrics for the model."""
         return {}
 
+    def _train_output(self, i, seed=None, save_file=True):
+        """
+        Create and train the model for the i-th output label. If save_file is
+        False, the model is not saved to its pickle file by training.
+        """
+        if seed is not None:
+            np.random.seed(seed)
+        # Create input dataframe
+        pysmo_input = pd.concat(
+            [
+                self._training_dataframe[self._input_labels],
+                self._training_dataframe[[self._output_labels[i]]],
+            ],
+            axis=1,
+        )
+        # Create and train model
+        model = self._create_model(pysmo_input, self._output_labels[i])
+        if save_file:
+            model.training()
+            return model
+        # Models trained concurrently would all write to the same file
+        model.pickle_save = _skip_pickle_save
+        try:
+            model.training()
+        finally:
+            del model.pickle_save
+        return model
+
     def _training_main_loop(self):
+        global _training_data  # pylint: disable=global-statement
+        n_outputs = len(self._output_labels)
+        seeds = None
+        if self.config.random_seed is not None:
+            seeds = [
+                int(ss.generate_state(1)[0])
+                for ss in np.random.SeedSequence(self.config.random_seed).spawn(
+                    n_outputs
+                )
+            ]
+
+        try:
+            mp_context = multiprocessing.get_context("fork")
+        except ValueError:
+            mp_context = None
+        models = {}
+        if (
+            self.config.n_workers is None
+            or self.config.n_workers == 1
+            or n_outputs == 1
+            or mp_context is None
+        ):
+            for i in range(n_outputs):
+                models[i] = self._train_output(i, None if seeds is None else seeds[i])
+                _log.info(
+                    f"Model for output {self._output_labels[i]} trained successfully"
+                )
+        else:
+            if seeds is None:
+                # Forked workers share the random state of this process
+                seeds = [int(j) for j in np.random.randint(0, 2**31 - 1, n_outputs)]
+            _training_data = (self, seeds)
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(self.config.n_workers, n_outputs),
+                    mp_context=mp_context,
+                ) as executor:
+                    futures = [
+                        executor.submit(_train_output_worker, i)
+                        for i in range(n_outputs)
+                    ]
+                    for future in as_completed(futures):
+                        i, models[i] = future.result()
+                        _log.info(
+                            f"Model for output {self._output_labels[i]} trained "
+                            f"successfully ({len(models)} of {n_outputs})"
+                        )
+            finally:
+                _training_data = None
+            # The worker processes do not write the pickle file, so write it
+            # once with the last model, as training in sequence leaves it
+            last_model = models[n_outputs - 1]
+            last_model.pickle_save({"model": last_model})
+
+        # Store results in the order of the output labels
         for i, output_label in enumerate(self._output_labels):
-            # Create input dataframe
-            pysmo_input = pd.concat(
-                [
-                    self._training_dataframe[self._input_labels],
-                    self._training_dataframe[[self._output_labels[i]]],
-                ],
-                axis=1,
-            )
-            # Create and train model
-            model = self._create_model(pysmo_input, output_label)
-            model.training()
-            # Store results
             result = PysmoSurrogateTrainingResult()
-            result.model = model
-            result.metrics = self._get_metrics(model)
+            result.model = models[i]
+            result.metrics = self._get_metrics(models[i])
             self._trained.add_result(output_label, result)
-            # Log the status
-            _log.info(f"Model for output {output_label} trained successfully")
 
 
 class PysmoPolyTrainer(PysmoTrainer):
@@ -371,13 +487,15 @@ class PysmoRBFTrainer(PysmoTrainer):
     base_model_type = "rbf"
     model_type = "rbf"
 
-    CONFIG = SurrogateTrainer.CONFIG()
+    CONFIG = PysmoTrainer.CONFIG()
 
     CONFIG.declare(
         "basis_function",
         ConfigValue(
             default=None,
-            domain=In(["linear", "cubic", "gaussian", "mq", "imq", "spline"]),
+            domain=In(
+                ["linear", "cubic", "gaussian", "mq", "imq", "spline", "wendland"]
+            ),
             description="Basis function for RBF.",
         ),
     )
@@ -401,6 +519,17 @@ class PysmoRBFTrainer(PysmoTrainer):
         ),
     )
 
+    CONFIG.declare(
+        "fast_loocv",
+        ConfigValue(
+            default=False,
+            domain=Bool,
+            description="Option to evaluate the leave-one-out cross-validation errors of all "
+            "regularization parameters from one eigendecomposition per shape parameter. "
+            "Requires the 'algebraic' solution method.",
+        ),
+    )
+
     def __init__(self, **settings):
         super().__init__(**settings)
         self.model_type = f"{self.config.basis_function} {self.base_model_type}"
@@ -411,6 +540,7 @@ class PysmoRBFTrainer(PysmoTrainer):
             basis_function=self.config.basis_function,
             solution_method=self.config.solution_method,
             regularization=self.config.regularization,
+            fast_loocv=self.config.fast_loocv,
             overwrite=True,
         )
         model.get_feature_vector()
@@ -456,11 +586,23 @@ class PysmoKrigingTrainer(PysmoTrainer):
         ),
     )
 
+    CONFIG.declare(
+        "analytical_gradients",
+        ConfigValue(
+            default=False,
+            domain=Bool,
+            description="Option to use the analytical gradients of the likelihood function "
+            "instead of central differencing when numerical_gradients is True. Needs one "
+            "factorization of the covariance matrix per gradient evaluation.",
+        ),
+    )
+
     def _create_model(self, pysmo_input, output_label):
         model = krg.KrigingModel(
             pysmo_input,
             numerical_gradients=self.config.numerical_gradients,
             regularization=self.config.regularization,
+            analytical_gradients=self.config.analytical_gradients,
             overwrite=True,
         )
         model.get_feature_vector()
@@ -494,26 +636,33 @@ class PysmoSurrogate(SurrogateBase):
             input_bounds,
         )
 
-    def evaluate_surrogate(self, inputs: pd.DataFrame) -> pd.DataFrame:
+    def evaluate_surrogate(
+        self, inputs: pd.DataFrame, chunk_size: int = None
+    ) -> pd.DataFrame:
         """Evaluate the surrogate model at a set of user-provided values.
 
+        All the rows of the inputs are evaluated together with the vectorized
+        ``predict_output`` method of the trained model for each output.
+
         Args:
             inputs: The dataframe of input values to be used in the evaluation.
                 The dataframe needs to contain a column corresponding to each of the input labels.
                 Additional columns are fine, but are not used.
+            chunk_size: Maximum number of rows evaluated at once, to bound memory use.
+                If None, each model chooses its own chunk size.
 
         Returns:
             output: A dataframe of the the output values evaluated at the provided inputs.
                 The index of the output dataframe should match the index of the provided inputs.
         """
-        inputdata = inputs[self._input_labels].to_numpy()
+        inputdata = inputs[self._input_labels].to_numpy(dtype=float)
         outputs = np.zeros(shape=(inputs.shape[0], len(self._output_labels)))
 
-        for i in range(inputdata.shape[0]):
-            row_data = inputdata[i, :].reshape(1, len(self._input_labels))
-            for j, output_label in enumerate(self._output_labels):
-                result = self._trained.get_result(output_label)
-                outputs[i, j] = result.model.predict_output(row_data)
+        for j, output_label in enumerate(self._output_labels):
+            result = self._trained.get_result(output_label)
+            outputs[:, j] = np.ravel(
+                result.model.predict_output(inputdata, chunk_size=chunk_size)
+            )
 
         return pd.DataFrame(
             data=outputs, index=inputs.index, columns=self._output_labels
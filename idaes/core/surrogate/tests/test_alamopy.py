@@ -1335,6 +1335,28 @@ class TestAlamoSurrogate:
                 + 5 * exp(inputs["x2"][i] ** 5)
             )
 
+    @pytest.mark.unit
+    def test_evaluate_surrogate_chunks(self, alm_surr3):
+        x = [0.2, 0.4, 0.6, 0.8, 1.0, 1.2, 1.4, 1.6, 1.8, 2.0]
+
+        inputs = np.array([np.tile(x, len(x)), np.repeat(x, len(x))])
+        inputs = pd.DataFrame(
+            inputs.transpose(), columns=["x1", "x2"], index=range(10, 110)
+        )
+
+        out = alm_surr3.evaluate_surrogate(inputs)
+        out_chunks = alm_surr3.evaluate_surrogate(inputs, chunk_size=7)
+        assert list(out_chunks.index) == list(inputs.index)
+        np.testing.assert_array_equal(out.to_numpy(), out_chunks.to_numpy())
+
+    @pytest.mark.unit
+    def test_evaluate_surrogate_constant(self):
+        alm_surr = AlamoSurrogate({"z1": " z1 == 3.5"}, ["x1"], ["z1"])
+        inputs = pd.DataFrame({"x1": [0, 1, 2]})
+
+        out = alm_surr.evaluate_surrogate(inputs)
+        np.testing.assert_array_equal(out["z1"].to_numpy(), [3.5, 3.5, 3.5])
+
     @pytest.mark.unit
     def test_populate_block_funcs(self, alm_surr3):
         blk = SurrogateBlock(concrete=True)
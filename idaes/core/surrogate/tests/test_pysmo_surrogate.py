@@ -17,6 +17,7 @@ import pytest
 import numpy as np
 import pandas as pd
 import os
+import pickle
 from math import sin, cos, log, exp
 
 from pathlib import Path
@@ -693,6 +694,7 @@ class TestPysmoRBFTrainer:
         assert pysmo_rbf_trainer.config.basis_function == None
         assert pysmo_rbf_trainer.config.regularization == None
         assert pysmo_rbf_trainer.config.solution_method == None
+        assert pysmo_rbf_trainer.config.fast_loocv == False
 
     @pytest.mark.unit
     def test_set_basis_function_righttype_1(self, pysmo_rbf_trainer):
@@ -724,6 +726,11 @@ class TestPysmoRBFTrainer:
         pysmo_rbf_trainer.config.basis_function = "spline"
         assert pysmo_rbf_trainer.config.basis_function == "spline"
 
+    @pytest.mark.unit
+    def test_set_basis_function_righttype_7(self, pysmo_rbf_trainer):
+        pysmo_rbf_trainer.config.basis_function = "wendland"
+        assert pysmo_rbf_trainer.config.basis_function == "wendland"
+
     @pytest.mark.unit
     def test_set_basis_function_outdomain(self, pysmo_rbf_trainer):
         with pytest.raises(
@@ -788,6 +795,17 @@ class TestPysmoRBFTrainer:
         with pytest.raises(ValueError):
             pysmo_rbf_trainer.config.regularization = 2
 
+    @pytest.mark.unit
+    def test_set_fast_loocv(self, pysmo_rbf_trainer):
+        pysmo_rbf_trainer.config.fast_loocv = True
+        pysmo_rbf_trainer.config.solution_method = "algebraic"
+        assert pysmo_rbf_trainer.config.fast_loocv == True
+
+        output_label = "z5"
+        data = {"x1": [1, 2, 3, 4], "x2": [5, 6, 7, 8], "z1": [10, 20, 30, 40]}
+        model = pysmo_rbf_trainer._create_model(pd.DataFrame(data), output_label)
+        assert model.fast_loocv == True
+
     @pytest.mark.unit
     def test_create_model_defaults(self, pysmo_rbf_trainer):
         pysmo_rbf_trainer.config.basis_function = None
@@ -875,6 +893,7 @@ class TestPysmoKrigingTrainer:
         assert pysmo_krg_trainer.model_type == "kriging"
         assert pysmo_krg_trainer.config.numerical_gradients == True
         assert pysmo_krg_trainer.config.regularization == True
+        assert pysmo_krg_trainer.config.analytical_gradients == False
 
     @pytest.mark.unit
     def test_set_regularization_righttype_1(self, pysmo_krg_trainer):
@@ -946,6 +965,21 @@ class TestPysmoKrigingTrainer:
         with pytest.raises(ValueError):
             pysmo_krg_trainer.config.numerical_gradients = 2
 
+    @pytest.mark.unit
+    def test_set_analytical_gradients(self, pysmo_krg_trainer):
+        pysmo_krg_trainer.config.analytical_gradients = True
+        assert pysmo_krg_trainer.config.analytical_gradients == True
+
+        output_label = "z5"
+        data = {"x1": [1, 2, 3, 4], "x2": [5, 6, 7, 8], "z1": [10, 20, 30, 40]}
+        model = pysmo_krg_trainer._create_model(pd.DataFrame(data), output_label)
+        assert model.analytical_gradients == True
+
+    @pytest.mark.unit
+    def test_set_analytical_gradients_wrongtype(self, pysmo_krg_trainer):
+        with pytest.raises(ValueError):
+            pysmo_krg_trainer.config.analytical_gradients = 2
+
     @pytest.mark.unit
     def test_create_model_defaults(self, pysmo_krg_trainer):
         output_label = "z5"
@@ -1003,6 +1037,80 @@ class TestPysmoKrigingTrainer:
         assert list(model.feature_list._data.keys()) == data.columns.tolist()[:-1]
 
 
+class TestPysmoTrainerParallel:
+    @pytest.fixture
+    def training_data(self):
+        x1, x2 = np.meshgrid(np.linspace(0, 1, 5), np.linspace(1, 3, 5))
+        data = pd.DataFrame({"x1": x1.ravel(), "x2": x2.ravel()})
+        for k in range(3):
+            data[f"z{k}"] = np.sin((k + 1) * data["x1"]) + data["x2"] ** 2
+        return data
+
+    @pytest.mark.unit
+    def test_defaults(self, training_data):
+        for trainer_class in [PysmoPolyTrainer, PysmoRBFTrainer, PysmoKrigingTrainer]:
+            trainer = trainer_class(
+                input_labels=["x1", "x2"],
+                output_labels=["z0", "z1", "z2"],
+                training_dataframe=training_data,
+            )
+            assert trainer.config.n_workers is None
+            assert trainer.config.random_seed is None
+
+    @pytest.mark.unit
+    def test_set_n_workers_wrongtype(self, training_data):
+        trainer = PysmoRBFTrainer(
+            input_labels=["x1", "x2"],
+            output_labels=["z0", "z1", "z2"],
+            training_dataframe=training_data,
+        )
+        with pytest.raises(ValueError):
+            trainer.config.n_workers = 0
+        with pytest.raises(ValueError):
+            trainer.config.random_seed = -1
+
+    @pytest.mark.component
+    @pytest.mark.parametrize(
+        "trainer_class, options",
+        [
+            (
+                PysmoPolyTrainer,
+                {"maximum_polynomial_order": 2, "solution_method": "mle"},
+            ),
+            (PysmoRBFTrainer, {"basis_function": "gaussian"}),
+            (PysmoKrigingTrainer, {}),
+        ],
+    )
+    def test_parallel_training_matches_serial(
+        self, training_data, trainer_class, options, tmp_path, monkeypatch
+    ):
+        monkeypatch.chdir(tmp_path)
+        output_labels = ["z0", "z1", "z2"]
+        results = []
+        for n_workers in [None, 2]:
+            trainer = trainer_class(
+                input_labels=["x1", "x2"],
+                output_labels=output_labels,
+                training_dataframe=training_data,
+                n_workers=n_workers,
+                random_seed=7,
+                **options,
+            )
+            trained = trainer.train_surrogate()
+            assert trained.output_labels == output_labels
+            surr = PysmoSurrogate(trained, ["x1", "x2"], output_labels)
+            results.append(surr.evaluate_surrogate(training_data))
+            for label in output_labels:
+                assert "pickle_save" not in vars(trained.get_result(label).model)
+            # Only one pickle file is written, with a trained model
+            assert os.listdir(tmp_path) == ["solution.pickle"]
+            with open(tmp_path / "solution.pickle", "rb") as f:
+                model = pickle.load(f)["model"]
+            assert type(model) is type(trained.get_result("z2").model)
+            os.remove(tmp_path / "solution.pickle")
+        pd.testing.assert_frame_equal(results[0], results[1])
+
+
 class TestPysmoSurrogate:
     @pytest.fixture
     def pysmo_surr1(self):
@@ -1956,6 +2064,22 @@ class TestPysmoSurrogate:
                 )
             )
 
+    @pytest.mark.unit
+    def test_evaluate_multisurrogate_rbf_chunks(self, pysmo_surr2_rbf):
+        # Test ``evaluate_surrogate`` gives the same results when evaluated in chunks
+        x = np.linspace(-2, 2, 21)
+        inputs = np.array([np.tile(x, len(x)), np.repeat(x, len(x))])
+        inputs = pd.DataFrame(
+            inputs.transpose(), columns=["x1", "x2"], index=range(5, 5 + x.size**2)
+        )
+
+        _, rbf_trained = pysmo_surr2_rbf
+        out = rbf_trained.evaluate_surrogate(inputs)
+        out_chunks = rbf_trained.evaluate_surrogate(inputs, chunk_size=16)
+        assert list(out.columns) == ["z1", "z2"]
+        assert (out.index == inputs.index).all()
+        np.testing.assert_allclose(out.to_numpy(), out_chunks.to_numpy(), rtol=1e-12)
+
     @pytest.mark.unit
     def test_populate_block_multisurrogate_rbf(self, pysmo_surr2_rbf):
         # Test ``populate_block`` for RBF with one input/output
@@ -29,7 +29,7 @@ from typing import Dict, List, Tuple
 import pandas as pd
 import numpy as np
 import pint
-from pyomo.environ import Block, value
+from pyomo.environ import Block, Param, Var, value
 from pyomo.network import Arc
 from pyomo.network.port import Port
 
@@ -132,6 +132,11 @@ class FlowsheetSerializer:
     unit models and arcs. This will be used to compare the model and convert
     to jointjs. The "cells" section is the jointjs readable code.
     See :py:func:`validate_flowsheet` for details on the format.
+
+    Once constructed, the serialized values can be refreshed with :meth:`update`,
+    which reuses the structure of the flowsheet (unit models, arcs and layout)
+    and only recomputes the contents of unit models and streams whose variables
+    changed.
     """
 
     # Key that represents feeds
@@ -205,13 +210,115 @@ class FlowsheetSerializer:
         self.name = name
         self.flowsheet = flowsheet
         self._positioning_model = None
+        self._content_units = {}  # {unit name: unit} for units with contents
+        self._stream_states = {}  # {stream name: state block}
         # serialize
+        self._structure = self._structure_key()
         self._ingest_flowsheet()
         self._construct_output_json()
+        # record the values that were serialized, see update()
+        self._unit_fingerprints = {
+            name: self._fingerprint(unit) for name, unit in self._content_units.items()
+        }
+        self._stream_fingerprints = {
+            name: self._fingerprint(sb) for name, sb in self._stream_states.items()
+        }
+        self._param_fingerprint = self._mutable_param_values()
 
     def as_dict(self):
         return self._out_json
 
+    def structure_changed(self) -> bool:
+        """Check whether components were added to or removed from the flowsheet
+        since it was serialized, in which case it must be serialized again
+        instead of being updated.
+
+        Returns:
+            True if the structure of the flowsheet changed, False otherwise
+        """
+        return self._structure_key() != self._structure
+
+    def update(self) -> bool:
+        """Update the serialized values with the current values of the flowsheet.
+
+        The contents of a unit model, or the label and stream table column of a
+        stream, are only recomputed if the values or fixed status of the variables
+        of the unit model (or stream state) changed since they were last serialized.
+        Mutable parameters can appear in the expressions of any unit model, e.g.
+        from a property package, so if the value of any mutable parameter of the
+        model changed, all unit models and streams are recomputed.
+
+        Returns:
+            True if any serialized value changed, False otherwise
+        """
+        param_fingerprint = self._mutable_param_values()
+        params_changed = param_fingerprint != self._param_fingerprint
+        self._param_fingerprint = param_fingerprint
+
+        changed_units = []
+        for unit_name, unit in self._content_units.items():
+            fingerprint = self._fingerprint(unit)
+            if params_changed or fingerprint != self._unit_fingerprints[unit_name]:
+                self._unit_fingerprints[unit_name] = fingerprint
+                changed_units.append(unit)
+
+        changed_streams = {}
+        for stream_name, sb in self._stream_states.items():
+            fingerprint = self._fingerprint(sb)
+            if params_changed or fingerprint != self._stream_fingerprints[stream_name]:
+                self._stream_fingerprints[stream_name] = fingerprint
+                changed_streams[stream_name] = sb
+
+        model_json = self._out_json["model"]
+        for unit in changed_units:
+            self._serialize_unit_contents(unit)
+            unit_model = self.unit_models[unit]
+            model_json["unit_models"][unit_model["name"]] = self._unit_model_json(
+                unit_model
+            )
+
+        if changed_streams:
+            self._construct_stream_labels(changed_streams)
+            self._construct_stream_table_json()
+            for stream_name in changed_streams:
+                if stream_name not in self.edges:
+                    continue
+                label = self.labels[stream_name]
+                model_json["arcs"][stream_name]["label"] = label
+                # the first label of a link holds the stream values
+                cell_index = self._out_json["routing_config"][stream_name]["cell_index"]
+                link_labels = self._out_json["cells"][cell_index]["labels"]
+                link_labels[0]["attrs"]["text"]["text"] = label
+
+        return bool(changed_units or changed_streams)
+
+    def _structure_key(self):
+        return tuple(
+            id(component)
+            for component in self.flowsheet.component_objects(
+                (Arc, Block), descend_into=False
+            )
+        )
+
+    @staticmethod
+    def _fingerprint(block):
+        # Values and fixed status of all variables in a block, to detect changes
+        return tuple(
+            (v.value, v.fixed)
+            for v in block.component_data_objects(Var, descend_into=True)
+        )
+
+    def _mutable_param_values(self):
+        # Values of all mutable parameters of the model, to detect changes
+        return tuple(
+            p.value
+            for param in self.flowsheet.model().component_objects(
+                Param, descend_into=True
+            )
+            if param.mutable
+            for p in param.values()
+        )
+
     def _ingest_flowsheet(self):
         # Stores information on the connectivity and components of the input flowsheet
         self._identify_arcs()
@@ -273,8 +380,8 @@ class FlowsheetSerializer:
 
         return components
 
-    def _construct_stream_labels(self):
-        # Construct the stream labels
+    def _construct_stream_labels(self, stream_states=None):
+        # Construct the stream labels, for all streams unless given their states
         # pylint: disable-next=import-outside-toplevel
         from idaes.core.util.tables import (
             stream_states_dict,
@@ -283,7 +390,10 @@ class FlowsheetSerializer:
         # We might have this information from generating self.serialized_components
         # but I (Makayla) don't know how that connects to the stream names so this
         # will be left alone for now
-        for stream_name, stream_value in stream_states_dict(self.streams).items():
+        if stream_states is None:
+            self._stream_states = stream_states_dict(self.streams)
+            stream_states = self._stream_states
+        for stream_name, stream_value in stream_states.items():
             label = ""
             for var, var_value in stream_value.define_display_vars().items():
                 var = var.capitalize()
@@ -383,28 +493,8 @@ class FlowsheetSerializer:
             for port in unit.component_objects(Port, descend_into=False):
                 self.ports[port] = unit
 
-            performance_contents, stream_df = unit.serialize_contents()
-            if stream_df is not None and not stream_df.empty:
-                # If there is a stream dataframe then we need to reset the index so we can get the variable names
-                # and then rename the "index"
-                stream_df = stream_df.reset_index().rename(
-                    columns={"index": "Variable"}
-                )
-                stream_df = self._make_valid_json(stream_df)
-            self._serialized_contents[unit_name]["stream_contents"] = stream_df
-
-            performance_df = pd.DataFrame()
-            if performance_contents:
-                # If performance contents is not empty or None then stick it into a dataframe and convert the
-                # GeneralVars to actual values
-                performance_df = pd.DataFrame(
-                    performance_contents["vars"].items(), columns=["Variable", "Value"]
-                )
-                performance_df["Value"] = performance_df["Value"].map(value)
-                performance_df = self._make_valid_json(performance_df)
-            self._serialized_contents[unit_name][
-                "performance_contents"
-            ] = performance_df
+            self._content_units[unit_name] = unit
+            self._serialize_unit_contents(unit)
         elif unit in self._known_endpoints:
             # Unit is a subcomponent AND it is connected to an Arc. Or maybe it's in
             # an indexed block. Find the top-level parent unit and assign the
@@ -427,6 +517,28 @@ class FlowsheetSerializer:
             # The unit is neither top-level nor connected; do not display this unit, since it is a subcomponent.
             pass
 
+    def _serialize_unit_contents(self, unit):
+        # Store the performance and stream contents of a top-level unit model
+        unit_name = unit.getname()
+        performance_contents, stream_df = unit.serialize_contents()
+        if stream_df is not None and not stream_df.empty:
+            # If there is a stream dataframe then we need to reset the index so we can get the variable names
+            # and then rename the "index"
+            stream_df = stream_df.reset_index().rename(columns={"index": "Variable"})
+            stream_df = self._make_valid_json(stream_df)
+        self._serialized_contents[unit_name]["stream_contents"] = stream_df
+
+        performance_df = pd.DataFrame()
+        if performance_contents:
+            # If performance contents is not empty or None then stick it into a dataframe and convert the
+            # GeneralVars to actual values
+            performance_df = pd.DataFrame(
+                performance_contents["vars"].items(), columns=["Variable", "Value"]
+            )
+            performance_df["Value"] = performance_df["Value"].map(value)
+            performance_df = self._make_valid_json(performance_df)
+        self._serialized_contents[unit_name]["performance_contents"] = performance_df
+
     @staticmethod
     def get_unit_model_type(unit) -> str:
         """Get the 'type' of the unit model."""
@@ -522,6 +634,27 @@ class FlowsheetSerializer:
         self._construct_jointjs_json()
 
     def _construct_model_json(self):
+        self._ordered_stream_names.appendleft("Units")
+        self._ordered_stream_names.appendleft("Variable")
+        self._construct_stream_table_json()
+
+        self._out_json["model"]["id"] = self.name
+        self._out_json["model"]["unit_models"] = {}
+        self._out_json["model"]["arcs"] = {}
+
+        for unit_model in self.unit_models.values():
+            self._out_json["model"]["unit_models"][
+                unit_model["name"]
+            ] = self._unit_model_json(unit_model)
+
+        for edge, edge_info in self.edges.items():
+            self._out_json["model"]["arcs"][edge] = {
+                "source": edge_info["source"].getname(),
+                "dest": edge_info["dest"].getname(),
+                "label": self.labels[edge],
+            }
+
+    def _construct_stream_table_json(self):
         # pylint: disable-next=import-outside-toplevel
         from idaes.core.util.tables import (
             create_stream_table_ui,
@@ -550,8 +683,6 @@ class FlowsheetSerializer:
 
         # Order the stream table based on the right order:
         # feed streams -> middle streams -> product streams
-        self._ordered_stream_names.appendleft("Units")
-        self._ordered_stream_names.appendleft("Variable")
         self._stream_table_df = self._stream_table_df[self._ordered_stream_names]
 
         # Puts df in this format for easier parsing in the javascript table:
@@ -560,42 +691,31 @@ class FlowsheetSerializer:
         # 'data': [[0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [298.15, 298.15, 298.15, 298.15, 298.15, 298.15, 298.15], [101325.0, 101325.0, 101325.0, 101325.0, 101325.0, 101325.0, 101325.0]]}
         self._out_json["model"]["stream_table"] = self._stream_table_df.to_dict("split")
 
-        self._out_json["model"]["id"] = self.name
-        self._out_json["model"]["unit_models"] = {}
-        self._out_json["model"]["arcs"] = {}
-
-        for unit_model in self.unit_models.values():
-            unit_name = unit_model["name"]
-            unit_type = unit_model["type"]
-            unit_icon = UnitModelIcon(unit_type)
+    def _unit_model_json(self, unit_model):
+        unit_name = unit_model["name"]
+        unit_type = unit_model["type"]
+        unit_icon = UnitModelIcon(unit_type)
 
-            unit_contents = {
-                "type": unit_type,
-                "image": "/images/icons/" + unit_icon.icon,
-            }
-            if unit_name in self._serialized_contents:
-                for pfx in "performance", "stream":
-                    content_type = pfx + "_contents"
-                    c = (
-                        self._serialized_contents[unit_name][content_type]
-                        .applymap(
-                            lambda x: round(x, self._sig_figs)
-                            if isinstance(x, (int, float))
-                            else x
-                        )
-                        .to_dict("index")
+        unit_contents = {
+            "type": unit_type,
+            "image": "/images/icons/" + unit_icon.icon,
+        }
+        if unit_name in self._serialized_contents:
+            for pfx in "performance", "stream":
+                content_type = pfx + "_contents"
+                c = (
+                    self._serialized_contents[unit_name][content_type]
+                    .applymap(
+                        lambda x: round(x, self._sig_figs)
+                        if isinstance(x, (int, float))
+                        else x
                     )
-                    # ensure that keys are strings (so it's valid JSON)
-                    unit_contents[content_type] = {str(k): v for k, v in c.items()}
-
-            self._out_json["model"]["unit_models"][unit_name] = unit_contents
+                    .to_dict("index")
+                )
+                # ensure that keys are strings (so it's valid JSON)
+                unit_contents[content_type] = {str(k): v for k, v in c.items()}
 
-        for edge, edge_info in self.edges.items():
-            self._out_json["model"]["arcs"][edge] = {
-                "source": edge_info["source"].getname(),
-                "dest": edge_info["dest"].getname(),
-                "label": self.labels[edge],
-            }
+        return unit_contents
 
     def _add_port_item(self, cell_index, group, _id):
         """Add port item to jointjs element"""
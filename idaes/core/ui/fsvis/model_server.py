@@ -19,15 +19,18 @@ The main class is `FlowsheetServer`, which is instantiated from the `visualize()
 # pylint: disable=missing-function-docstring
 
 # stdlib
+from collections import defaultdict
+import copy
 import http.server
 import json
 from pathlib import Path
 import re
 import socket
 import threading
-from typing import Dict, Union
+from typing import Dict, Tuple, Union
 from urllib.parse import urlparse
 import time
+import uuid
 
 # package
 from idaes import logger
@@ -50,6 +53,10 @@ class FlowsheetServer(http.server.HTTPServer):
 
     The only methods that the visualization function needs to call are the constructor, `start()` to
      start running the server, and `add_flowsheet()`, to a add a new flowsheet.
+
+    The serialization of each flowsheet is cached and updated incrementally on each request, and
+    each change to a flowsheet (in memory or in its datastore) increments its version, which is
+    sent as the ETag of the flowsheet so unchanged flowsheets are not sent again to the UI.
     """
 
     def __init__(self, port=None):
@@ -61,6 +68,13 @@ class FlowsheetServer(http.server.HTTPServer):
         self._flowsheets = {}
         self._thr = None
         self._settings_block = {}
+        # cached serializers, merged flowsheets and JSON responses for each flowsheet
+        self._serializers = {}
+        self._merged = {}
+        self._responses = {}
+        self._versions = defaultdict(int)
+        # distinguish the ETags of this server from those of earlier runs
+        self._etag_prefix = uuid.uuid4().hex[:8]
 
     @property
     def port(self):
@@ -119,6 +133,8 @@ class FlowsheetServer(http.server.HTTPServer):
         # replace all but 'unreserved' (RFC 3896) chars with a dash; remove duplicate dashes
         id_ = self.canonical_flowsheet_name(id_)
         self._flowsheets[id_] = flowsheet
+        self._serializers.pop(id_, None)
+        self._merged.pop(id_, None)
         _log.debug(f"Flowsheet '{id_}' storage is {store}")
         self._dsm.add(id_, store)
         # First try to update, so as not to overwrite saved value
@@ -127,8 +143,9 @@ class FlowsheetServer(http.server.HTTPServer):
         except errors.FlowsheetNotFoundInDatastore:
             _log.debug(f"No existing flowsheet found in {store}: saving new value")
             # If not found in datastore, save new value
-            fs_dict = FlowsheetSerializer(flowsheet, id_).as_dict()
-            store.save(fs_dict)
+            serializer = FlowsheetSerializer(flowsheet, id_)
+            self._serializers[id_] = serializer
+            store.save(copy.deepcopy(serializer.as_dict()))
         else:
             _log.debug(f"Existing flowsheet found in {store}: saving merged value")
         return id_
@@ -156,6 +173,8 @@ class FlowsheetServer(http.server.HTTPServer):
         Raises:
             ProcessingError, if parsing of JSON failed (see :meth:`DataStoreManager.save()`)
         """
+        # The merged flowsheet must be recomputed from the saved one
+        self._merged.pop(id_, None)
         try:
             self._dsm.save(id_, flowsheet)
         except errors.DatastoreError as err:
@@ -179,24 +198,60 @@ class FlowsheetServer(http.server.HTTPServer):
             FlowsheetNotFound (subclass) if the flowsheet id is known, but it can't be retrieved
             ProcessingError for internal errors
         """
-        # Get saved flowsheet from datastore
-        try:
-            saved = self._load_flowsheet(id_)
-        except KeyError:
-            raise errors.FlowsheetUnknown(id_)
-        except ValueError:
-            raise errors.FlowsheetNotFoundInDatastore(id_)
+        # Return [a copy of the] merged value
+        return copy.deepcopy(self._update_flowsheet(id_))
+
+    def flowsheet_response(self, id_: str) -> Tuple[bytes, str]:
+        """Update flowsheet and get it encoded as JSON, with its ETag.
+
+        The encoded flowsheet is cached until the next change of the flowsheet.
+
+        Args:
+            id_: Identifier of flowsheet to update.
+
+        Returns:
+            Tuple of the merged flowsheet encoded as JSON and its ETag (quoted)
+
+        Raises:
+            Same as :meth:`update_flowsheet`
+        """
+        merged = self._update_flowsheet(id_)
+        version = self._versions[id_]
+        if id_ not in self._responses or self._responses[id_][0] != version:
+            etag = f'"{self._etag_prefix}-{id_}-{version}"'
+            self._responses[id_] = (version, utf8_encode(json.dumps(merged)), etag)
+        _, value, etag = self._responses[id_]
+        return value, etag
+
+    # === Internal methods ===
+
+    def _update_flowsheet(self, id_: str) -> Dict:
+        """Update flowsheet, returning the cached merged value (which must not be modified)."""
+        merged = self._merged.get(id_, None)
+        # Get saved flowsheet from datastore, unless it is the merged value
+        if merged is None:
+            try:
+                saved = self._load_flowsheet(id_)
+            except KeyError:
+                raise errors.FlowsheetUnknown(id_)
+            except ValueError:
+                raise errors.FlowsheetNotFoundInDatastore(id_)
+        else:
+            saved = merged
         # Get current value from memory
         try:
             obj = self._get_flowsheet_obj(id_)
         except KeyError:
             raise errors.FlowsheetNotFoundInMemory(id_)
         try:
-            obj_dict = self._serialize_flowsheet(id_, obj)
+            obj_dict, changed = self._serialize_flowsheet(id_, obj)
         except ValueError as err:
             raise errors.ProcessingError(f"Cannot serialize flowsheet: {err}")
-        # Compare saved and current value
-        diff = FlowsheetDiff(saved, obj_dict)
+        if merged is not None and not changed:
+            _log.debug("Flowsheet in memory is unchanged since the last update")
+            return merged
+        # Compare saved and current value, on a copy as the diff modifies its layout
+        diff = FlowsheetDiff(saved, copy.deepcopy(obj_dict))
         _log.debug(f"diff: {diff}")
         if not diff:
             # If no difference do nothing
@@ -206,10 +261,10 @@ class FlowsheetServer(http.server.HTTPServer):
             num, pl = len(diff), "s" if len(diff) > 1 else ""
             _log.debug(f"Stored flowsheet and model in memory differ by {num} item{pl}")
             self.save_flowsheet(id_, diff.merged())
-        # Return [a copy of the] merged value
-        return diff.merged(do_copy=True)
-
-    # === Internal methods ===
+        merged = diff.merged(do_copy=True)
+        self._merged[id_] = merged
+        self._versions[id_] += 1
+        return merged
 
     def _load_flowsheet(self, id_) -> Union[Dict, str]:
         return self._dsm.load(id_)
@@ -218,13 +273,28 @@ class FlowsheetServer(http.server.HTTPServer):
         """Get a flowsheet with the given ID."""
         return self._flowsheets[id_]
 
-    @staticmethod
-    def _serialize_flowsheet(id_, flowsheet):
+    def _serialize_flowsheet(self, id_, flowsheet) -> Tuple[Dict, bool]:
+        """Serialize flowsheet, only updating the values of the previous serialization
+        if the structure of the flowsheet has not changed.
+
+        Returns:
+            Tuple of the serialized flowsheet and whether it changed since the previous call
+        """
+        serializer = self._serializers.pop(id_, None)
         try:
-            result = FlowsheetSerializer(flowsheet, id_).as_dict()
+            if (
+                serializer is not None
+                and serializer.flowsheet is flowsheet
+                and not serializer.structure_changed()
+            ):
+                changed = serializer.update()
+            else:
+                serializer = FlowsheetSerializer(flowsheet, id_)
+                changed = True
         except (AttributeError, KeyError) as err:
             raise ValueError(f"Error serializing flowsheet: {err}")
-        return result
+        self._serializers[id_] = serializer
+        return serializer.as_dict(), changed
 
     def _run(self):
         """Run in a separate thread."""
@@ -304,7 +374,7 @@ class FlowsheetServerHandler(http.server.SimpleHTTPRequestHandler):
             None
         """
         try:
-            merged = self.server.update_flowsheet(id_)
+            value, etag = self.server.flowsheet_response(id_)
         except errors.FlowsheetUnknown as err:
             # User error: user asked for a flowsheet by an unknown ID
             self.send_error(404, message=str(err))
@@ -313,8 +383,20 @@ class FlowsheetServerHandler(http.server.SimpleHTTPRequestHandler):
             # Internal error: flowsheet ID is found, but other things are missing
             self.send_error(500, message=str(err))
             return
-        # Return merged flowsheet
-        self._write_json(200, merged)
+        # Return merged flowsheet, unless the client has its current version
+        if self._etag_matches(etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-type", "application/json")
+        self.send_header("Content-length", str(len(value)))
+        self.send_header("ETag", etag)
+        # clients must revalidate the flowsheet, with the ETag, before using it
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(value)
 
     def _get_setting(self, setting_key_: str):
         """Get setting value.
@@ -385,6 +467,14 @@ class FlowsheetServerHandler(http.server.SimpleHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(value)
 
+    def _etag_matches(self, etag: str) -> bool:
+        """Check the ETag against the 'If-None-Match' header of the request."""
+        header = self.headers.get("If-None-Match", None)
+        if header is None:
+            return False
+        tags = [tag.strip() for tag in header.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
     def _parse_flowsheet_url(self, path):
         u, queries = urlparse(path), None
         if u.query:
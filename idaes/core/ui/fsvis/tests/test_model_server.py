@@ -14,6 +14,8 @@
 Tests for model_server module
 """
 # stdlib
+import json
+
 # ext
 import pytest
 from pyomo.environ import ConcreteModel
@@ -63,6 +65,31 @@ def test_update_flowsheet(flash_model):
         srv.update_flowsheet("oscar")
 
 
+@pytest.mark.unit
+def test_flowsheet_response(flash_model):
+    srv = model_server.FlowsheetServer()
+    fs = flash_model.fs
+    srv.add_flowsheet("oscar", fs, persist.MemoryDataStore())
+    value, etag = srv.flowsheet_response("oscar")
+    assert value == json.dumps(srv.update_flowsheet("oscar")).encode()
+    # unchanged flowsheet is not serialized again
+    value2, etag2 = srv.flowsheet_response("oscar")
+    assert value2 is value
+    assert etag2 == etag
+    # changed values give a new version
+    fs.flash.heat_duty.fix(10)
+    try:
+        value3, etag3 = srv.flowsheet_response("oscar")
+    finally:
+        fs.flash.heat_duty.fix(0)
+    assert etag3 != etag
+    assert json.loads(value3) != json.loads(value)
+    # saving the flowsheet from the UI gives a new version
+    srv.save_flowsheet("oscar", json.loads(value))
+    _, etag4 = srv.flowsheet_response("oscar")
+    assert etag4 not in (etag, etag3)
+
+
 @pytest.fixture(scope="module")
 def flash_model():
     """Flash unit model. Use '.fs' attribute to get the flowsheet."""
@@ -105,6 +132,12 @@ def test_flowsheet_server_run(flash_model):
     # now /fs should work
     resp = requests.get(f"http://localhost:{srv.port}/fs?id=oscar")
     assert resp.ok
+    # unchanged flowsheet is not sent again
+    etag = resp.headers["ETag"]
+    resp = requests.get(
+        f"http://localhost:{srv.port}/fs?id=oscar", headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 304
     print("Bogus PUT")
     resp = requests.put(f"http://localhost:{srv.port}/fs")
     assert not resp.ok
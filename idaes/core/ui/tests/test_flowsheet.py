@@ -152,6 +152,10 @@ def demo_flowsheet():
 
 @pytest.fixture(scope="module")
 def flash_flowsheet():
+    return _build_flash_flowsheet()
+
+
+def _build_flash_flowsheet():
     # Model and flowsheet
     m = ConcreteModel()
     m.fs = FlowsheetBlock(dynamic=False)
@@ -335,6 +339,49 @@ def test_flowsheet_serializer_flash(flash_flowsheet, flash_flowsheet_json):
         pytest.fail("Serialized flowsheet does not match expected")
 
 
+@pytest.mark.unit
+def test_flowsheet_serializer_update():
+    # build a new flowsheet, as it is modified
+    flash_flowsheet = _build_flash_flowsheet()
+    serializer = FlowsheetSerializer(flash_flowsheet, "demo")
+    assert not serializer.structure_changed()
+    assert not serializer.update()
+
+    flash_flowsheet.flash.inlet.temperature.fix(368)
+    flash_flowsheet.flash.heat_duty.fix(10)
+    assert serializer.update()
+    assert not serializer.update()
+
+    # updated values are the same as those of a new serialization
+    test_dict = copy.deepcopy(serializer.as_dict())
+    new_dict = FlowsheetSerializer(flash_flowsheet, "demo").as_dict()
+    _canonicalize(test_dict)
+    _canonicalize(new_dict)
+    assert json.dumps(test_dict, sort_keys=True) == json.dumps(new_dict, sort_keys=True)
+    assert "368" in test_dict["model"]["arcs"]["s_inlet_1"]["label"]
+
+    flash_flowsheet.heater = Heater(property_package=flash_flowsheet.properties)
+    assert serializer.structure_changed()
+
+
+@pytest.mark.unit
+def test_flowsheet_serializer_update_param():
+    flash_flowsheet = _build_flash_flowsheet()
+    serializer = FlowsheetSerializer(flash_flowsheet, "demo")
+    assert not serializer.update()
+
+    # only a mutable parameter changes, no variable values
+    flash_flowsheet.properties.pressure_reference = 2e5
+    assert serializer.update()
+    assert not serializer.update()
+
+    test_dict = copy.deepcopy(serializer.as_dict())
+    new_dict = FlowsheetSerializer(flash_flowsheet, "demo").as_dict()
+    _canonicalize(test_dict)
+    _canonicalize(new_dict)
+    assert json.dumps(test_dict, sort_keys=True) == json.dumps(new_dict, sort_keys=True)
+
+
 def report_failure(test_dict, stored_dict):
     test_json, stored_json = (json.dumps(d, indent=2) for d in (test_dict, stored_dict))
     diff = dict_diff(test_dict, stored_dict)
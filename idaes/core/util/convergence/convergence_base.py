@@ -56,18 +56,29 @@ ConvergenceEvaluationSpecification), to run a convergence evaluation
 
 However, this package can also be executed using the command-line interface.
 See the documentation in convergence.py for more information.
+
+Samples are evaluated in parallel with MPI (when mpi4py is available), or with
+a pool of local processes, which can also stop samples that take too long and
+save results as they complete so that long evaluations can be resumed (see
+run_convergence_evaluation).
 """
 # TODO: Missing docstrings
 # pylint: disable=missing-class-docstring
 # pylint: disable=missing-function-docstring
 
 # stdlib
-from collections import OrderedDict
+from collections import OrderedDict, deque
 import getpass
 import importlib as il
 import json
 import logging
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+import pickle
+import signal
 import sys
+import time
 from io import StringIO
 from math import isclose
 
@@ -593,12 +604,13 @@ def write_sample_file(
         json.dump(jsondict, fd, indent=3)
 
 
-def run_convergence_evaluation_from_sample_file(sample_file):
+def run_convergence_evaluation_from_sample_file(sample_file, **kwargs):
     """
     Run convergence evaluation using specified sample file.
 
     Args:
         sample_file - name of sample file to use
+        kwargs - passed to run_convergence_evaluation
 
     Returns:
         results of convergence evaluation
@@ -622,7 +634,7 @@ def run_convergence_evaluation_from_sample_file(sample_file):
             f"Invalid value specified for convergence_evaluation_class_str:"
             f"{convergence_evaluation_class_str} in sample file: {sample_file}"
         )
-    return run_convergence_evaluation(jsondict, conv_eval)
+    return run_convergence_evaluation(jsondict, conv_eval, **kwargs)
 
 
 def run_single_sample_from_sample_file(sample_file, name):
@@ -677,11 +689,19 @@ def run_single_sample(sample_file_dict, conv_eval, name):
     return _run_ipopt_with_stats(model, solver)
 
 
-def run_convergence_evaluation(sample_file_dict, conv_eval):
+def run_convergence_evaluation(
+    sample_file_dict, conv_eval, n_workers=None, timeout=None, results_file=None
+):
     """
     Run convergence evaluation and generate the statistics based on information
     in the sample_file.
 
+    By default, samples are split evenly between MPI processes (or run serially
+    when mpi4py is not available). If any of n_workers, timeout or results_file
+    is given, samples are instead evaluated by a pool of local processes, where
+    each process is given a new sample as soon as it is done with the previous
+    one.
+
     Parameters
     ----------
     sample_file_dict : dict
@@ -691,9 +711,32 @@ def run_convergence_evaluation(sample_file_dict, conv_eval):
     conv_eval : ConvergenceEvaluation
         The ConvergenceEvaluation object that should be used
 
+    n_workers : int or None
+        Number of local processes evaluating samples. Defaults to the number of
+        CPUs if timeout or results_file is given.
+
+    timeout : float or None
+        Maximum time (in seconds) to evaluate a sample in a local process, not
+        counting the time to start the process. It is also passed to ipopt as
+        max_cpu_time. A sample that takes longer, or whose process crashes, is
+        recorded as not solved. On POSIX systems each local process runs in its
+        own process group, so that a solver started by a process that is
+        stopped at the timeout is stopped too.
+
+    results_file : str or None
+        Path of a file to which the results of each sample are appended (as a
+        line of JSON) when it completes. Samples that already have results in
+        the file are not evaluated again, so an interrupted evaluation can be
+        resumed.
+
+    Local processes are started with the default multiprocessing start
+    method. Where this is not fork (e.g. on Windows and macOS), conv_eval is
+    pickled to send it to the processes, so its class must be importable and
+    its attributes picklable.
+
     Returns
     -------
-       N/A
+       inputs, samples and list of results for each sample
     """
     inputs = sample_file_dict["inputs"]
     samples = sample_file_dict["samples"]
@@ -708,6 +751,12 @@ def run_convergence_evaluation(sample_file_dict, conv_eval):
         samples_list.append(v)
     n_samples = len(samples_list)
 
+    if n_workers is not None or timeout is not None or results_file is not None:
+        results = _run_local_convergence_evaluation(
+            samples_list, conv_eval, inputs, n_workers, timeout, results_file
+        )
+        return inputs, samples, results
+
     task_mgr = mpiu.ParallelTaskManager(n_samples)
     local_samples_list = task_mgr.global_to_local_data(samples_list)
 
@@ -720,41 +769,299 @@ def run_convergence_evaluation(sample_file_dict, conv_eval):
                 float(si) / float(len(local_samples_list)),
                 "Root Process: {}".format(sample_name),
             )
-
-        # capture the output
-        # ToDo: make this an option and turn off for single sample execution
-        output_buffer = StringIO()
-        with LoggingIntercept(output_buffer, "idaes", logging.ERROR):
-            with capture_output():  # as str_out:
-                model = conv_eval.get_initialized_model()
-                _set_model_parameters_from_sample(model, inputs, ss)
-                solver = conv_eval.get_solver()
-                (
-                    status_obj,  # pylint: disable=unused-variable
-                    solved,
-                    iters,
-                    iters_in_restoration,
-                    iters_w_regularization,
-                    time,
-                ) = _run_ipopt_with_stats(model, solver)
-
-        if not solved:
-            _log.error(f"Sample: {sample_name} failed to converge.")
-
-        results_dict = OrderedDict()
-        results_dict["name"] = sample_name
-        results_dict["sample_point"] = ss
-        results_dict["solved"] = solved
-        results_dict["iters"] = iters
-        results_dict["iters_in_restoration"] = iters_in_restoration
-        results_dict["iters_w_regularization"] = iters_w_regularization
-        results_dict["time"] = time
-        results.append(results_dict)
+        results.append(_evaluate_sample(conv_eval, inputs, ss))
 
     global_results = task_mgr.gather_global_data(results)
     return inputs, samples, global_results
 
 
+def _evaluate_sample(conv_eval, inputs, sample_point, max_cpu_time=None):
+    """
+    Solve the model of the convergence evaluation at a sample point and return
+    the convergence statistics of the sample
+    """
+    sample_name = sample_point["_name"]
+    ipopt_kwargs = {}
+    if max_cpu_time is not None:
+        ipopt_kwargs["max_cpu_time"] = max_cpu_time
+
+    # capture the output
+    # ToDo: make this an option and turn off for single sample execution
+    output_buffer = StringIO()
+    with LoggingIntercept(output_buffer, "idaes", logging.ERROR):
+        with capture_output():  # as str_out:
+            model = conv_eval.get_initialized_model()
+            _set_model_parameters_from_sample(model, inputs, sample_point)
+            solver = conv_eval.get_solver()
+            (
+                status_obj,  # pylint: disable=unused-variable
+                solved,
+                iters,
+                iters_in_restoration,
+                iters_w_regularization,
+                time,
+            ) = _run_ipopt_with_stats(model, solver, **ipopt_kwargs)
+
+    if not solved:
+        _log.error(f"Sample: {sample_name} failed to converge.")
+
+    return _sample_results(
+        sample_point,
+        solved,
+        iters,
+        iters_in_restoration,
+        iters_w_regularization,
+        time,
+    )
+
+
+def _sample_results(
+    sample_point,
+    solved,
+    iters=0,
+    iters_in_restoration=0,
+    iters_w_regularization=0,
+    time=0,
+):
+    results_dict = OrderedDict()
+    results_dict["name"] = sample_point["_name"]
+    results_dict["sample_point"] = sample_point
+    results_dict["solved"] = solved
+    results_dict["iters"] = iters
+    results_dict["iters_in_restoration"] = iters_in_restoration
+    results_dict["iters_w_regularization"] = iters_w_regularization
+    results_dict["time"] = time
+    return results_dict
+
+
+def _run_local_convergence_evaluation(
+    samples_list, conv_eval, inputs, n_workers, timeout, results_file
+):
+    """
+    Evaluate samples with a pool of local processes, skipping the samples with
+    results in the results file and appending the new results to it.
+
+    Returns
+    -------
+       list of results for each sample, in the order of the samples
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if n_workers < 1:
+        raise ValueError(f"n_workers must be a positive integer, got {n_workers}.")
+
+    results = _read_results_file(results_file)
+    pending = [ss for ss in samples_list if ss["_name"] not in results]
+    if results:
+        _log.info(
+            f"Found results of {len(samples_list) - len(pending)} samples in "
+            f"{results_file}, evaluating the {len(pending)} remaining samples."
+        )
+
+    fd = None
+    if results_file is not None:
+        fd = open(results_file, "a")
+        # finish a line left incomplete by an interrupted evaluation
+        if fd.tell() > 0:
+            with open(results_file, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    fd.write("\n")
+
+    def record(results_dict):
+        results[results_dict["name"]] = results_dict
+        _progress_bar(
+            float(len(results)) / float(len(samples_list)),
+            "Process Pool: {}".format(results_dict["name"]),
+        )
+        if fd is not None:
+            fd.write(json.dumps(results_dict) + "\n")
+            fd.flush()
+
+    try:
+        _run_samples_in_process_pool(
+            pending, conv_eval, inputs, n_workers, timeout, record
+        )
+    finally:
+        if fd is not None:
+            fd.close()
+
+    return [results[ss["_name"]] for ss in samples_list]
+
+
+def _read_results_file(results_file):
+    """
+    Read the results of the samples in a results file, ignoring a line left
+    incomplete by an interrupted evaluation
+    """
+    results = OrderedDict()
+    if results_file is None or not os.path.exists(results_file):
+        return results
+    with open(results_file, "r") as fd:
+        for line in fd:
+            if not line.strip():
+                continue
+            try:
+                results_dict = json.loads(line, object_pairs_hook=OrderedDict)
+            except json.JSONDecodeError:
+                _log.warning(f"Ignoring incomplete results in {results_file}")
+                continue
+            results[results_dict["name"]] = results_dict
+    return results
+
+
+def _sample_worker(conn, conv_eval, inputs, max_cpu_time):
+    # Evaluate the samples received from the connection, until None is received.
+    # The process leads a new process group, so it can be stopped along with
+    # any solver processes it starts.
+    if hasattr(os, "setsid"):
+        os.setsid()
+    while True:
+        sample_point = conn.recv()
+        if sample_point is None:
+            break
+        # mark the start of the evaluation, so the time taken to start the
+        # process is not counted towards the timeout
+        conn.send(True)
+        conn.send(_evaluate_sample(conv_eval, inputs, sample_point, max_cpu_time))
+
+
+class _SampleWorker:
+    """
+    A local process evaluating samples, with the sample it was last given.
+    """
+
+    def __init__(self, context, conv_eval, inputs, max_cpu_time):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_sample_worker,
+            args=(child_conn, conv_eval, inputs, max_cpu_time),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.sample_point = None
+        self.start_time = None
+        self.started = False
+
+    def submit(self, sample_point):
+        self.conn.send(sample_point)
+        self.sample_point = sample_point
+        self.start_time = time.monotonic()
+        self.started = False
+
+    def stop(self, kill=False):
+        if kill:
+            self.kill()
+        else:
+            self.conn.send(None)
+        self.process.join()
+        self.conn.close()
+
+    def kill(self):
+        # Kill the process group of the worker, which includes the solver
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                return
+            except OSError:
+                # the process has not made its own process group yet
+                pass
+        self.process.kill()
+
+
+def _run_samples_in_process_pool(
+    samples_list, conv_eval, inputs, n_workers, timeout, record
+):
+    """
+    Evaluate samples with a pool of local processes, calling record with the
+    results of each sample as soon as it completes. Each process is given a new
+    sample when it is done with the previous one, so samples with long solve
+    times do not hold up the others. A process that crashes, or takes longer
+    than the timeout, is replaced and its sample is recorded as not solved.
+    """
+    context = multiprocessing.get_context()
+    if context.get_start_method() != "fork":
+        try:
+            pickle.dumps(conv_eval)
+        except Exception as err:
+            raise ValueError(
+                f"The convergence evaluation object must be picklable to be sent "
+                f"to processes started with the {context.get_start_method()} "
+                f"method."
+            ) from err
+
+    pending = deque(samples_list)
+    workers = []
+
+    def start_worker():
+        worker = _SampleWorker(context, conv_eval, inputs, timeout)
+        worker.submit(pending.popleft())
+        workers.append(worker)
+
+    try:
+        for _ in range(min(n_workers, len(pending))):
+            start_worker()
+
+        while workers:
+            # wait for results, for a process to exit or for the next timeout
+            wait_time = None
+            started = [w for w in workers if w.started]
+            if timeout is not None and started:
+                next_timeout = min(w.start_time for w in started) + timeout
+                wait_time = max(0.0, next_timeout - time.monotonic())
+            wait(
+                [w.conn for w in workers] + [w.process.sentinel for w in workers],
+                wait_time,
+            )
+
+            for worker in list(workers):
+                results_dict, crashed = None, False
+                try:
+                    if worker.conn.poll():
+                        results_dict = worker.conn.recv()
+                except (EOFError, OSError):
+                    crashed = True
+
+                if results_dict is True:
+                    # the worker started evaluating the sample
+                    worker.start_time = time.monotonic()
+                    worker.started = True
+                    continue
+                elapsed = time.monotonic() - worker.start_time
+
+                if results_dict is not None:
+                    record(results_dict)
+                    if pending:
+                        worker.submit(pending.popleft())
+                    else:
+                        worker.stop()
+                        workers.remove(worker)
+                    continue
+
+                crashed = crashed or not worker.process.is_alive()
+                timed_out = (
+                    timeout is not None and worker.started and elapsed >= timeout
+                )
+                if not crashed and not timed_out:
+                    continue
+
+                reason = "crashed" if crashed else f"exceeded timeout of {timeout} s"
+                _log.error(
+                    f"Sample: {worker.sample_point['_name']} failed to converge, "
+                    f"evaluation process {reason}."
+                )
+                worker.stop(kill=True)
+                workers.remove(worker)
+                record(_sample_results(worker.sample_point, False, time=elapsed))
+                if pending:
+                    start_worker()
+    finally:
+        # stop the workers and their solvers if evaluation was interrupted
+        for worker in workers:
+            worker.stop(kill=True)
+
+
 def generate_baseline_statistics(
     conv_eval, n_points: int, seed: int = None, display: bool = True
 ):
@@ -935,18 +1242,15 @@ class Stats(object):
         json.dump(self.to_dict(), fp, indent=4)
 
     def to_dmf(self, dmf):
-        # PYLINT-TODO-FIX fix error due to undefined variable "stats"
         rsrc = resource.Resource(
             value={
                 "name": "convergence_results",
                 "desc": "statistics returned from run_convergence_evaluation",
                 "creator": {"name": getpass.getuser()},
-                # pylint: disable=undefined-variable
-                "data": stats.to_dict(),
+                "data": self.to_dict(),
             },
             type_=resource.ResourceTypes.data,
         )
-        # pylint: enable=undefined-variable
         dmf.add(rsrc)
 
     def report(self, fp=sys.stdout):
@@ -17,7 +17,14 @@ Author: Carl Laird
 """
 # pylint: disable=missing-class-docstring
 
+import os
+import shutil
+import subprocess
+import sys
+
 import pyomo.environ as pe
+from pyomo.common.fileutils import this_file_dir
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
 import idaes.core.util.convergence.convergence_base as cb
 
 
@@ -94,3 +101,39 @@ class ConvEvalUnfixedVarMutableParam(ConvEvalFixedVarMutableParam):
 
         # return the initialized model
         return m
+
+
+class FakeIpopt:
+    """
+    Stand-in for ipopt, which writes a saved ipopt output file. For negative
+    values of param_b, it starts a process that does not finish, as a hanging
+    ipopt would, and writes its process id to pid_file.
+    """
+
+    def __init__(self, pid_file=None):
+        self.pid_file = pid_file
+
+    def solve(self, model, options=None, tee=False):
+        if pe.value(model.param_b) < 0:
+            proc = subprocess.Popen(
+                [sys.executable, "-c", "import time; time.sleep(60)"]
+            )
+            with open(self.pid_file, "a") as f:
+                f.write(f"{proc.pid}\n")
+            proc.wait()
+        shutil.copy(
+            os.path.join(this_file_dir(), "ipopt_output.txt"), options["output_file"]
+        )
+        results = SolverResults()
+        results.solver.status = SolverStatus.ok
+        results.solver.termination_condition = TerminationCondition.optimal
+        return results
+
+
+class ConvEvalFakeIpopt(ConvEvalFixedVarMutableParam):
+    def __init__(self, pid_file=None):
+        super().__init__()
+        self.pid_file = pid_file
+
+    def get_solver(self):
+        return FakeIpopt(self.pid_file)
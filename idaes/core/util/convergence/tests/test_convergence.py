@@ -17,15 +17,18 @@ Author: Carl Laird
 """
 import io
 import json
+import multiprocessing
 import pytest
 import os
 import os.path
+import time
 from collections import OrderedDict
 
 import pyomo.environ as pe
 from pyomo.common.fileutils import this_file_dir
 from pyomo.common.unittest import assertStructuredAlmostEqual
 import idaes.core.util.convergence.convergence_base as cb
+import idaes.core.util.convergence.tests.conv_eval_classes as cev
 import idaes
 
 # See if ipopt is available and set up solver
@@ -265,6 +268,157 @@ def test_convergence_evaluation_fixedvar_mutableparam():
     #     os.remove(results_fname)
 
 
+def _process_pool_sample_dict(param_b_values):
+    samples = OrderedDict()
+    for i, b in enumerate(param_b_values):
+        samples[f"Sample-{i + 1}"] = OrderedDict([("var_a", 1.0), ("param_b", b)])
+    inputs = OrderedDict(
+        [
+            ("var_a", {"pyomo_path": "var_a", "lower": 0.1, "upper": 1.9}),
+            ("param_b", {"pyomo_path": "param_b", "lower": 50, "upper": 150}),
+        ]
+    )
+    return {"inputs": inputs, "samples": samples}
+
+
+@pytest.fixture
+def fake_ipopt(monkeypatch, tmp_path):
+    # Replace the solve with one that records the samples it is called for,
+    # hangs for param_b == -1 and crashes the process for param_b == -2. The
+    # worker processes are forked and so inherit the replacement.
+    log_file = tmp_path / "solved.txt"
+
+    def _run_ipopt_with_stats(model, solver, **kwargs):
+        b = pe.value(model.param_b)
+        with open(log_file, "a") as f:
+            f.write(f"{b}\n")
+        if b == -1:
+            time.sleep(60)
+        elif b == -2:
+            os._exit(1)
+        return None, True, int(b), 0, 1, 0.5
+
+    monkeypatch.setattr(cb, "_run_ipopt_with_stats", _run_ipopt_with_stats)
+
+    def solved():
+        if not log_file.exists():
+            return []
+        return [float(b) for b in log_file.read_text().split()]
+
+    return solved
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="Test replaces the solve in forked worker processes",
+)
+@pytest.mark.unit
+def test_convergence_evaluation_process_pool(fake_ipopt, tmp_path):
+    sample_file_dict = _process_pool_sample_dict([10, -1, 30, -2, 50, 60])
+    results_file = str(tmp_path / "results.jsonl")
+    inputs, samples, results = cb.run_convergence_evaluation(
+        sample_file_dict,
+        cev.ConvEvalFixedVarMutableParam(),
+        n_workers=2,
+        timeout=2,
+        results_file=results_file,
+    )
+    assert list(samples) == [r["name"] for r in results]
+    assert [r["solved"] for r in results] == [True, False, True, False, True, True]
+    assert [r["iters"] for r in results] == [10, 0, 30, 0, 50, 60]
+    assert results[2]["iters_w_regularization"] == 1
+    # the hanging sample is stopped at the timeout
+    assert 2 <= results[1]["time"] < 30
+    assert sorted(fake_ipopt()) == [-2, -1, 10, 30, 50, 60]
+
+    stats = cb.Stats(inputs, results)
+    assert [r["name"] for r in stats.failed_cases] == ["Sample-2", "Sample-4"]
+    assert stats.iters_max == 60
+
+    # the samples with results in the results file are not evaluated again
+    with open(results_file) as f:
+        lines = f.readlines()
+    assert len(lines) == 6
+    with open(results_file, "w") as f:
+        f.writelines(lines[:3])
+        # an incomplete line from an interrupted evaluation
+        f.write(lines[3][:10])
+    _, _, resumed = cb.run_convergence_evaluation(
+        sample_file_dict,
+        cev.ConvEvalFixedVarMutableParam(),
+        n_workers=2,
+        timeout=2,
+        results_file=results_file,
+    )
+    assert len(fake_ipopt()) == 9
+    assert [(r["name"], r["solved"], r["iters"]) for r in resumed] == [
+        (r["name"], r["solved"], r["iters"]) for r in results
+    ]
+    assert len(cb._read_results_file(results_file)) == 6
+
+
+def _process_exists(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg"), reason="Requires process groups")
+@pytest.mark.unit
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_convergence_evaluation_process_pool_stops_solver(
+    monkeypatch, tmp_path, start_method
+):
+    # The solver processes of samples that time out are stopped, with worker
+    # processes started by fork or spawn (which requires pickling conv_eval)
+    context = multiprocessing.get_context(start_method)
+    monkeypatch.setattr(multiprocessing, "get_context", lambda method=None: context)
+    pid_file = tmp_path / "solver_pids.txt"
+    _, _, results = cb.run_convergence_evaluation(
+        _process_pool_sample_dict([10, -1, 30]),
+        cev.ConvEvalFakeIpopt(str(pid_file)),
+        n_workers=2,
+        timeout=3,
+    )
+    assert [r["solved"] for r in results] == [True, False, True]
+    # iterations from the saved ipopt output
+    assert results[0]["iters"] == 43
+    pids = [int(pid) for pid in pid_file.read_text().split()]
+    assert len(pids) == 1
+    for _ in range(50):
+        if not _process_exists(pids[0]):
+            break
+        time.sleep(0.1)
+    assert not _process_exists(pids[0])
+
+
+@pytest.mark.unit
+def test_convergence_evaluation_process_pool_not_picklable(monkeypatch):
+    monkeypatch.setattr(
+        multiprocessing,
+        "get_context",
+        lambda method=None: multiprocessing.context.SpawnContext(),
+    )
+    conv_eval = cev.ConvEvalFakeIpopt()
+    conv_eval.pid_file = lambda: None
+    with pytest.raises(ValueError, match="must be picklable"):
+        cb.run_convergence_evaluation(
+            _process_pool_sample_dict([10]), conv_eval, n_workers=1
+        )
+
+
+@pytest.mark.unit
+def test_convergence_evaluation_process_pool_invalid_workers():
+    with pytest.raises(ValueError, match="n_workers must be a positive integer"):
+        cb.run_convergence_evaluation(
+            _process_pool_sample_dict([10]),
+            cev.ConvEvalFixedVarMutableParam(),
+            n_workers=0,
+        )
+
+
 @pytest.mark.unit
 def test_parse_ipopt_output():
     fname = os.path.join(currdir, "ipopt_output.txt")
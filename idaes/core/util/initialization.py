@@ -14,6 +14,9 @@
 """
 This module contains utility functions for initialization of IDAES models.
 """
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 from pyomo.environ import (
     Block,
@@ -24,6 +27,8 @@ from pyomo.environ import (
 from pyomo.network import Arc
 from pyomo.dae import ContinuousSet
 from pyomo.core.expr.visitor import identify_variables
+from pyomo.common.collections import ComponentSet
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
 
 from idaes.core.util.exceptions import ConfigurationError
 from idaes.core.util.model_statistics import degrees_of_freedom
@@ -41,6 +46,8 @@ from idaes.core.solvers import get_solver
 
 __author__ = "Andrew Lee, John Siirola, Robert Parker"
 
+_log = idaeslog.getLogger(__name__)
+
 
 def fix_state_vars(blk, state_args=None):
     """
@@ -293,6 +300,155 @@ def solve_indexed_blocks(solver, blocks, **kwds):
     return results
 
 
+# Blocks, variables, solver and solver arguments used by the worker processes
+# of solve_indexed_blocks_parallel. Worker processes are forked, so they inherit
+# these (and the model) instead of having them pickled.
+_parallel_solve_data = None
+
+_optimal_conditions = (
+    TerminationCondition.optimal,
+    TerminationCondition.locallyOptimal,
+    TerminationCondition.globallyOptimal,
+)
+
+
+def _block_data_list(blocks):
+    # Expand a Block or a list of Blocks into a list of BlockData objects
+    if isinstance(blocks, Block):
+        blocks = [blocks]
+    block_datas = []
+    for b in blocks:
+        if isinstance(b, Block) and b.is_indexed():
+            block_datas.extend(b.values())
+        elif isinstance(b, Block._ComponentDataClass):
+            block_datas.append(b)
+        else:
+            raise TypeError(
+                "Trying to apply solve_indexed_blocks_parallel to "
+                "object containing non-Block objects"
+            )
+    return block_datas
+
+
+def _block_diagonal_variables(block_datas):
+    """
+    Get the unfixed variables in the active constraints of each block, if no
+    unfixed variable appears in more than one block.
+
+    Returns:
+        list of lists of variables for each block, or None if the blocks are
+        coupled.
+    """
+    owner = {}
+    var_lists = []
+    for i, b in enumerate(block_datas):
+        var_set = ComponentSet()
+        for c in b.component_data_objects(Constraint, active=True, descend_into=True):
+            var_set.update(identify_variables(c.body, include_fixed=False))
+        for v in var_set:
+            if owner.setdefault(id(v), i) != i:
+                return None
+        var_lists.append(list(var_set))
+    return var_lists
+
+
+def _solve_block_data_worker(i):
+    block_datas, var_lists, solver, kwds = _parallel_solve_data
+    try:
+        res = solver.solve(block_datas[i], **kwds)
+        status = res.solver.status
+        tc = res.solver.termination_condition
+        message = None
+    except Exception as err:  # pylint: disable=broad-except
+        # Failures are isolated to the block, and reported with the results
+        status = SolverStatus.error
+        tc = TerminationCondition.error
+        message = str(err)
+    return i, [v.value for v in var_lists[i]], status, tc, message
+
+
+def solve_indexed_blocks_parallel(solver, blocks, n_workers=None, **kwds):
+    """
+    Solve the data objects of Indexed Blocks as independent problems in a pool
+    of worker processes. This is an alternative to solve_indexed_blocks for
+    blocks which are not coupled to each other (e.g. the property blocks of a
+    discretized unit model), which avoids solving one large problem serially.
+
+    The blocks are first checked for block diagonal structure, i.e. that no
+    unfixed variable appears in the active constraints of more than one block.
+    If they are coupled, or worker processes can not be forked on this
+    platform, or only one worker is requested, this falls back to
+    solve_indexed_blocks. Each block is solved starting from its current
+    values, and the solution is copied back into the model.
+
+    Args:
+        solver : a Pyomo solver object to use when solving the blocks
+        blocks : an object which inherits from Block, or a list of Blocks
+        n_workers : number of worker processes (default = number of CPUs)
+        kwds : a dict of arguments to be passed to the solver
+
+    Returns:
+        A Pyomo solver results object, with the worst status and termination
+        condition of all blocks
+    """
+    global _parallel_solve_data  # pylint: disable=global-statement
+    block_datas = _block_data_list(blocks)
+    if n_workers is None:
+        n_workers = os.cpu_count()
+    n_workers = min(n_workers, len(block_datas))
+    try:
+        mp_context = multiprocessing.get_context("fork")
+    except ValueError:
+        mp_context = None
+    var_lists = None
+    if n_workers > 1 and mp_context is not None:
+        var_lists = _block_diagonal_variables(block_datas)
+        if var_lists is None:
+            _log.info(
+                "Blocks are coupled by shared unfixed variables, solving as "
+                "a single problem."
+            )
+    if var_lists is None:
+        return solve_indexed_blocks(solver, blocks, **kwds)
+
+    _parallel_solve_data = (block_datas, var_lists, solver, kwds)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=mp_context
+        ) as executor:
+            chunksize = max(1, len(block_datas) // (4 * n_workers))
+            block_results = list(
+                executor.map(
+                    _solve_block_data_worker,
+                    range(len(block_datas)),
+                    chunksize=chunksize,
+                )
+            )
+    finally:
+        _parallel_solve_data = None
+
+    results = SolverResults()
+    status = SolverStatus.ok
+    tc = None
+    messages = []
+    for i, values, block_status, block_tc, message in block_results:
+        for v, val in zip(var_lists[i], values):
+            v.set_value(val, skip_validation=True)
+        if block_status != SolverStatus.ok and status == SolverStatus.ok:
+            status = block_status
+        if tc is None or (
+            tc in _optimal_conditions and block_tc not in _optimal_conditions
+        ):
+            tc = block_tc
+        if block_tc not in _optimal_conditions:
+            messages.append(f"{block_datas[i].name}: {message or block_tc}")
+    results.solver.status = status
+    results.solver.termination_condition = tc
+    if messages:
+        results.solver.message = "; ".join(messages)
+    return results
+
+
 def initialize_by_time_element(fs, time, **kwargs):
     """
     Function to initialize Flowsheet fs element-by-element along
@@ -21,10 +21,14 @@ Functions for saving and loading Pyomo objects to json
 
 import json
 import datetime
+import hashlib
+import os
 import time
 import gzip
 import logging
 
+import numpy as np
+
 from pyomo.environ import (
     Param,
     Var,
@@ -43,6 +47,8 @@ _log = logging.getLogger(__name__)
 # Some more information about this module
 __author__ = "John Eslick"
 __format_version__ = 4
+# Version of the array layout written by CompiledStoreSpec
+__compiled_format_version__ = 1
 
 
 def _can_serialize(o):
@@ -365,6 +371,20 @@ class StoreSpec(object):
                 break
         return (alist, ff)
 
+    def compile(self, o):
+        """
+        Compile this StoreSpec against a specific Pyomo component. The model
+        is walked once and the result can be used to repeatedly save and load
+        the model state as flat NumPy arrays. See CompiledStoreSpec.
+
+        Args:
+            o: Pyomo component to compile the StoreSpec for
+
+        Returns:
+            A CompiledStoreSpec object
+        """
+        return CompiledStoreSpec(o, wts=self)
+
     @classmethod
     def bound(cls):
         """Returns a StoreSpec object to store variable bounds only."""
@@ -1021,3 +1041,551 @@ def from_json(o, sd=None, fname=None, s=None, wts=None, gz=None, root_name=None)
     pdict["etime_read_dict"] = read_time - dict_time
     pdict["etime_read_suffixes"] = suffix_time - read_time
     return pdict
+
+
+# Attributes stored as boolean arrays by CompiledStoreSpec, everything else is
+# stored as float64 with NaN standing in for None.
+_compiled_flag_attrs = frozenset(("fixed", "stale", "active", "_mutable"))
+
+
+class _CompiledGroup(object):
+    """
+    A group of Pyomo components or component data objects of the same type in
+    a CompiledStoreSpec. All objects in a group share an attribute list and
+    load filter function.
+    """
+
+    def __init__(self, name, alist, ff, is_bool, is_var):
+        self.name = name
+        self.alist = tuple(alist)
+        self.ff = ff
+        self.is_bool = is_bool  # values of BooleanVars need to be cast back
+        self.is_var = is_var
+        self.objects = []
+        self.paths = []
+
+    def array_key(self, a):
+        return f"{self.name}_{a}"
+
+
+class CompiledStoreSpec(object):
+    """
+    A StoreSpec compiled against a specific Pyomo component. On creation the
+    component is walked once, following the same rules as to_json(), and an
+    ordered index of the components and component data to store is cached.
+    After that, the model state can be saved to and loaded from a dictionary
+    of flat NumPy arrays (one array per object group and attribute) without
+    walking the model tree again, which makes repeatedly saving and loading the
+    state of a model with a fixed structure much faster than to_json() and
+    from_json().
+
+    Flag attributes (fixed, stale, active) are stored as boolean arrays and
+    other attributes (value, lb, ub) are stored as float64 arrays where None is
+    represented by NaN. If the StoreSpec includes Suffix, the entries of each
+    suffix (e.g. scaling factors) are stored as an array of the positions of
+    their keys in the index and an array of their values. As with from_json(),
+    reading a state sets the stored suffix entries but does not remove other
+    entries. Suffix values that are not numbers are stored in object arrays,
+    which can't be loaded from a file by load(). Components of the model must
+    not be added or removed after compiling, the structure fingerprint stored
+    with the arrays is used to detect saved states that do not match the
+    compiled model.
+
+    For workflows that save the state many times with only small changes in
+    between (e.g. checkpoints in a parameter sweep), delta_arrays() stores
+    only the objects that changed relative to a base state, and a chain of
+    deltas can be replayed with apply_deltas() or read directly into the model
+    with from_arrays().
+
+    Args:
+        o: Pyomo component to compile the StoreSpec for
+        wts: StoreSpec object specifying what to save and load, if None the
+            default StoreSpec is used
+    """
+
+    def __init__(self, o, wts=None):
+        if wts is None:
+            wts = StoreSpec()
+        self.wts = wts
+        self.component = o
+        # Groups are kept separately for components and component data, so
+        # component level attributes (e.g. active for an indexed constraint)
+        # can be loaded before the data level attributes, as from_json does.
+        self._groups = {}
+        self._component_groups = []
+        self._data_groups = []
+        # Suffixes to store with their paths, and the components and component
+        # data that can be suffix keys, with a lookup table from their id() to
+        # their position, as used by to_json()
+        self._suffixes = []
+        self._suffix_paths = []
+        self._keyed = []
+        self._key_index = {}
+        # Compiled targets of broadcast(), by id() of the target component
+        self._targets = {}
+        self._compile_component(o, "", root=True)
+        h = hashlib.sha1()
+        for g in self._component_groups + self._data_groups:
+            h.update(f"{g.name}:{','.join(g.alist)}\n".encode("utf-8"))
+            for p in g.paths:
+                h.update(p.encode("utf-8"))
+                h.update(b"\n")
+        if self._suffixes:
+            h.update(f"suffixes:{len(self._keyed)}\n".encode("utf-8"))
+            for p in self._suffix_paths:
+                h.update(p.encode("utf-8"))
+                h.update(b"\n")
+        self.fingerprint = h.hexdigest()
+
+    @property
+    def n_objects(self):
+        """Number of components and component data objects indexed"""
+        return sum(len(g.objects) for g in self._groups.values())
+
+    @property
+    def paths(self):
+        """
+        List of paths of the indexed components and component data objects
+        relative to the compiled component, in the order they are stored.
+        """
+        paths = []
+        for g in self._component_groups + self._data_groups:
+            paths.extend(g.paths)
+        return paths
+
+    def _get_group(self, o, alist, ff, data, root=False):
+        # The root has groups of its own, so a component compiled from a block
+        # data object (e.g. a period block of a multiperiod model) has the same
+        # groups as one compiled from a model, instead of sharing the group of
+        # the block data objects below it.
+        key = (data, None if root else type(o))
+        try:
+            return self._groups[key]
+        except KeyError:
+            pass
+        if data:
+            name = f"d{len(self._data_groups)}"
+        else:
+            name = f"c{len(self._component_groups)}"
+        g = _CompiledGroup(
+            name=name,
+            alist=alist,
+            ff=ff,
+            is_bool=isinstance(o, BooleanVar._ComponentDataClass),
+            is_var=isinstance(o, Var._ComponentDataClass),
+        )
+        self._groups[key] = g
+        if data:
+            self._data_groups.append(g)
+        else:
+            self._component_groups.append(g)
+        return g
+
+    def _add_keyed(self, o):
+        self._key_index[id(o)] = len(self._keyed)
+        self._keyed.append(o)
+
+    def _compile_component(self, o, path, root=False):
+        wts = self.wts
+        alist, ff = wts.get_class_attr_list(o)
+        if alist is None:
+            return
+        oname = o.getname(fully_qualified=False)
+        if not root:
+            path = f"{path}.{oname}" if path else oname
+        if isinstance(o, Suffix):
+            if wts.suffix_filter is None or oname in wts.suffix_filter:
+                self._suffixes.append(o)
+                self._suffix_paths.append(path)
+            return
+        store_keys = Suffix in wts.classes
+        if store_keys:
+            self._add_keyed(o)
+        if alist:
+            g = self._get_group(o, alist, ff, data=False, root=root)
+            g.objects.append(o)
+            g.paths.append(path)
+        try:
+            item_keys = o.keys()
+        except AttributeError:
+            item_keys = [None]
+        dg = None
+        for key in item_keys:
+            if key is None and isinstance(o, ComponentData):
+                el = o
+            else:
+                el = o[key]
+            if dg is None:
+                alist, ff = wts.get_data_class_attr_list(el)
+                if alist is None:
+                    return
+                dg = self._get_group(el, alist, ff, data=True, root=root)
+            epath = path if key is None else f"{path}[{key!r}]"
+            if store_keys and isinstance(el, ComponentData):
+                self._add_keyed(el)
+            # immutable params and raw values can't be loaded, so skip them
+            if (
+                dg.alist
+                and isinstance(el, ComponentData)
+                and not (
+                    isinstance(el, _ParamData) and not el.parent_component().mutable
+                )
+            ):
+                dg.objects.append(el)
+                dg.paths.append(epath)
+            if _may_have_subcomponents(el):
+                for o2 in el.component_objects(descend_into=False):
+                    self._compile_component(o2, epath)
+
+    def to_arrays(self, out=None):
+        """
+        Save the state of the compiled component to a dictionary of arrays.
+
+        Args:
+            out: optional dictionary of arrays previously returned by
+                to_arrays() or load(), to write the state into in place.
+
+        Returns:
+            Dictionary of NumPy arrays
+        """
+        wts = self.wts
+        if out is None:
+            out = {
+                "__format_version__": np.array(__compiled_format_version__),
+                "__fingerprint__": np.array(self.fingerprint),
+            }
+        else:
+            self._check_fingerprint(out)
+        for g in self._component_groups + self._data_groups:
+            for a in g.alist:
+                cb = wts.write_cbs.get(a, None)
+                if cb is _get_value and g.is_var:
+                    vals = [el.value for el in g.objects]
+                elif cb is None:
+                    vals = [getattr(el, a, None) for el in g.objects]
+                else:
+                    vals = [cb(el) for el in g.objects]
+                dtype = np.bool_ if a in _compiled_flag_attrs else np.float64
+                k = g.array_key(a)
+                if k in out:
+                    out[k][...] = np.array(vals, dtype=dtype)
+                else:
+                    out[k] = np.array(vals, dtype=dtype)
+        # The number of entries in a suffix can change, so its arrays are
+        # always replaced
+        for i, sfx in enumerate(self._suffixes):
+            idx, vals = [], []
+            for key, x in sfx.items():
+                pos = self._key_index.get(id(key), None)
+                if pos is None:
+                    # the key wasn't stored so can't write the entry
+                    continue
+                idx.append(pos)
+                vals.append(x)
+            out[f"s{i}__idx"] = np.array(idx, dtype=np.int64)
+            if all(isinstance(x, (int, float)) for x in vals):
+                out[f"s{i}_value"] = np.array(vals, dtype=np.float64)
+            else:
+                out[f"s{i}_value"] = np.array(vals, dtype=object)
+        return out
+
+    def _check_fingerprint(self, arrays):
+        fp = str(arrays["__fingerprint__"][()])
+        if fp != self.fingerprint:
+            raise ValueError(
+                "The stored model state does not match the structure of the "
+                "compiled model."
+            )
+
+    def _decode(self, g, a, x):
+        if a in _compiled_flag_attrs:
+            return bool(x)
+        if x != x:  # NaN is used to store None
+            return None
+        if g.is_bool:
+            return bool(x)
+        return float(x)
+
+    def from_arrays(self, arrays):
+        """
+        Load the state of the compiled component from a dictionary of arrays
+        created by to_arrays(), delta_arrays() or load(). If arrays is a delta,
+        only the objects that changed are read.
+
+        Args:
+            arrays: Dictionary of NumPy arrays
+
+        Returns:
+            None
+        """
+        self._check_fingerprint(arrays)
+        self._read_columns(self._columns(arrays))
+
+    def _columns(self, arrays):
+        # Convert the stored arrays to lists once, so they can be read into
+        # several components with the same structure.
+        wts = self.wts
+        columns = {}
+        for g in self._component_groups + self._data_groups:
+            idx = arrays.get(f"{g.name}__idx", None)
+            cols = {}
+            for a in g.alist:
+                try:
+                    cols[a] = arrays[g.array_key(a)].tolist()
+                except KeyError as e:
+                    if wts.ignore_missing:
+                        continue
+                    raise e
+            columns[g.name] = (None if idx is None else idx.tolist(), cols)
+        suffix_columns = []
+        for i in range(len(self._suffixes)):
+            try:
+                idx = arrays[f"s{i}__idx"].tolist()
+                vals = arrays[f"s{i}_value"].tolist()
+            except KeyError as e:
+                if wts.ignore_missing:
+                    suffix_columns.append(None)
+                    continue
+                raise e
+            suffix_columns.append((idx, vals))
+        columns["__suffixes__"] = suffix_columns
+        return columns
+
+    def _read_columns(self, columns):
+        for g in self._component_groups + self._data_groups:
+            idx, cols = columns[g.name]
+            if idx is None:
+                objects = g.objects
+            else:
+                objects = [g.objects[i] for i in idx]
+            if g.ff is None:
+                for a, col in cols.items():
+                    self._read_attr(g, a, objects, col)
+            else:
+                # Filter functions take the stored state for each object, so
+                # this is done object by object.
+                for i, el in enumerate(objects):
+                    edict = {a: self._decode(g, a, col[i]) for a, col in cols.items()}
+                    for a in g.ff(el, edict):
+                        self._read_one(a, el, edict[a])
+        # Suffixes are read last, like from_json does
+        keyed = self._keyed
+        for sfx, col in zip(self._suffixes, columns["__suffixes__"]):
+            if col is None:
+                continue
+            for pos, x in zip(*col):
+                sfx[keyed[pos]] = x
+
+    def broadcast(self, targets, arrays=None, strict=True):
+        """
+        Load a model state into several other components with the same
+        structure as the compiled component, e.g. the period blocks of a
+        multiperiod model built from the same flowsheet. The stored arrays are
+        decoded once, and each target is walked once to build its index the
+        first time it is broadcast to. The index is cached, so later calls read
+        the state into the target without walking it or looking up names.
+
+        Args:
+            targets: iterable of Pyomo components, or of CompiledStoreSpec
+                objects returned by a previous call
+            arrays: Dictionary of NumPy arrays to load, if None the current
+                state of the compiled component is used.
+            strict: if True, raise a ValueError if the structure of a target
+                does not match the compiled component, otherwise skip it.
+
+        Returns:
+            Tuple of the list of CompiledStoreSpec objects for the targets
+            that were loaded and the list of targets that were skipped
+        """
+        if arrays is None:
+            arrays = self.to_arrays()
+        else:
+            self._check_fingerprint(arrays)
+        columns = self._columns(arrays)
+        loaded = []
+        skipped = []
+        for t in targets:
+            if not isinstance(t, CompiledStoreSpec):
+                t = self._compiled_target(t)
+            if t.fingerprint != self.fingerprint:
+                if strict:
+                    raise ValueError(
+                        f"The structure of {t.component.name} does not match "
+                        f"the structure of the compiled model."
+                    )
+                skipped.append(t.component)
+                continue
+            t._read_columns(columns)
+            loaded.append(t)
+        return loaded, skipped
+
+    def _compiled_target(self, o):
+        # The cached index is checked against the component, in case the
+        # component was deleted and its id() reused
+        t = self._targets.get(id(o), None)
+        if t is None or t.component is not o:
+            t = CompiledStoreSpec(o, wts=self.wts)
+            self._targets[id(o)] = t
+        return t
+
+    def _read_attr(self, g, a, objects, col):
+        cb = self.wts.read_cbs.get(a, False)
+        if cb is None:
+            return
+        if cb is _set_value and g.is_var:
+            # The stored values came from variables with the same structure,
+            # so skip domain validation, which is most of the cost of loading.
+            for el, x in zip(objects, col):
+                el.set_value(None if x != x else x, skip_validation=True)
+            return
+        for el, x in zip(objects, col):
+            x = self._decode(g, a, x)
+            if cb is False:
+                setattr(el, a, x)
+            else:
+                cb(el, x)
+
+    def delta_arrays(self, base, arrays=None):
+        """
+        Create a delta snapshot, which only stores the objects whose stored
+        attributes differ from a base state. For each object group, the delta
+        contains the indexes of the changed objects and the values of all the
+        group attributes for those objects. Deltas can be read into the model
+        with from_arrays(), saved with save(), and combined with a base state
+        with apply_deltas().
+
+        Args:
+            base: Dictionary of arrays for the base state from to_arrays(),
+                load() or apply_deltas()
+            arrays: Dictionary of arrays for the new state, if None the current
+                state of the compiled component is used.
+
+        Returns:
+            Dictionary of NumPy arrays
+        """
+        self._check_fingerprint(base)
+        if arrays is None:
+            arrays = self.to_arrays()
+        else:
+            self._check_fingerprint(arrays)
+        delta = {
+            "__format_version__": np.array(__compiled_format_version__),
+            "__fingerprint__": np.array(self.fingerprint),
+            "__delta__": np.array(True),
+        }
+        for g in self._component_groups + self._data_groups:
+            changed = np.zeros(len(g.objects), dtype=np.bool_)
+            for a in g.alist:
+                k = g.array_key(a)
+                new, old = arrays[k], base[k]
+                if a in _compiled_flag_attrs:
+                    changed |= new != old
+                else:
+                    # NaN (None) compares unequal to itself
+                    changed |= (new != old) & ~(np.isnan(new) & np.isnan(old))
+            idx = np.flatnonzero(changed)
+            delta[f"{g.name}__idx"] = idx
+            for a in g.alist:
+                k = g.array_key(a)
+                delta[k] = arrays[k][idx]
+        # Suffixes are small, so a delta stores all their entries
+        for i in range(len(self._suffixes)):
+            for k in (f"s{i}__idx", f"s{i}_value"):
+                delta[k] = arrays[k]
+        return delta
+
+    def apply_deltas(self, base, deltas):
+        """
+        Replay a chain of delta snapshots on a base state. Each delta should
+        have been created relative to the state that results from applying the
+        previous deltas in the chain.
+
+        Args:
+            base: Dictionary of arrays for the base state
+            deltas: iterable of delta dictionaries from delta_arrays()
+
+        Returns:
+            New dictionary of NumPy arrays with the deltas applied, base is not
+            modified.
+        """
+        self._check_fingerprint(base)
+        if "__delta__" in base:
+            raise ValueError("The base state for apply_deltas can't be a delta.")
+        arrays = {k: np.array(a) for k, a in base.items()}
+        for delta in deltas:
+            self._check_fingerprint(delta)
+            for g in self._component_groups + self._data_groups:
+                idx = delta[f"{g.name}__idx"]
+                for a in g.alist:
+                    k = g.array_key(a)
+                    arrays[k][idx] = delta[k]
+            for i in range(len(self._suffixes)):
+                for k in (f"s{i}__idx", f"s{i}_value"):
+                    arrays[k] = np.array(delta[k])
+        return arrays
+
+    def _read_one(self, a, el, x):
+        cb = self.wts.read_cbs.get(a, False)
+        if cb is None:
+            return
+        if cb is False:
+            setattr(el, a, x)
+        else:
+            cb(el, x)
+
+    def save(self, fname, compress=False, arrays=None):
+        """
+        Save the state of the compiled component to a file. If the file name
+        ends with '.npz' the arrays are written to a NumPy npz archive,
+        otherwise fname is taken to be a directory and each array is written
+        to a separate '.npy' file, which can be memory-mapped when loading.
+
+        Args:
+            fname: file or directory name
+            compress: if True and writing an npz file, compress it
+            arrays: dictionary of arrays to save, if None the current state of
+                the compiled component is saved.
+
+        Returns:
+            None
+        """
+        if arrays is None:
+            arrays = self.to_arrays()
+        if fname.endswith(".npz"):
+            if compress:
+                np.savez_compressed(fname, **arrays)
+            else:
+                np.savez(fname, **arrays)
+        else:
+            os.makedirs(fname, exist_ok=True)
+            for k, a in arrays.items():
+                np.save(os.path.join(fname, f"{k}.npy"), a)
+
+    def load(self, fname, mmap_mode=None, read=True):
+        """
+        Load a model state or delta saved by save() and optionally read it
+        into the compiled component.
+
+        Args:
+            fname: file or directory name
+            mmap_mode: if loading from a directory, memory-map the arrays with
+                this mode (see numpy.load), ignored for npz files
+            read: if True read the state into the compiled component.
+
+        Returns:
+            Dictionary of NumPy arrays
+        """
+        if fname.endswith(".npz"):
+            with np.load(fname) as f:
+                arrays = {k: f[k] for k in f.files}
+        else:
+            arrays = {}
+            for f in os.listdir(fname):
+                if f.endswith(".npy"):
+                    arrays[f[:-4]] = np.load(
+                        os.path.join(fname, f), mmap_mode=mmap_mode
+                    )
+        self._check_fingerprint(arrays)
+        if read:
+            self.from_arrays(arrays)
+        return arrays
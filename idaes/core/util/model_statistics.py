@@ -19,10 +19,13 @@ IDAES models.
 __author__ = "Andrew Lee"
 
 import sys
+from contextlib import contextmanager
 
 from pyomo.environ import Block, Constraint, Expression, Objective, Var, value
 from pyomo.dae import DerivativeVar
 from pyomo.core.expr.current import identify_variables
+from pyomo.core.expr.numvalue import native_types
+from pyomo.core.expr.visitor import StreamBasedExpressionVisitor
 from pyomo.common.collections import ComponentSet
 
 
@@ -44,6 +47,128 @@ def _iter_indexed_block_data_objects(block, ctype, active, descend_into):
             yield c
 
 
+# -------------------------------------------------------------------------
+# Incidence cache
+class IncidenceCache(object):
+    """
+    Cache of the variables which appear in each Constraint. Walking constraint
+    expressions with identify_variables is the most expensive part of the
+    methods in this module, so when statistics are computed repeatedly (e.g.
+    degrees of freedom checks in a loop over unit models) the variable
+    incidence of each constraint can be found once and reused.
+
+    Only the variables in each constraint are cached, which Constraints and
+    Blocks are active and which Vars are fixed is checked on every call, so
+    activating, deactivating, fixing and unfixing components does not
+    invalidate the cache. Cached entries are also invalidated automatically if
+    the expression of a Constraint, or of a named Expression which appears in
+    it, is replaced.
+    """
+
+    def __init__(self):
+        self._map = {}
+
+    def __len__(self):
+        return len(self._map)
+
+    def clear(self):
+        """
+        Remove all cached entries.
+        """
+        self._map.clear()
+
+    def variables(self, c):
+        """
+        Get the variables which appear in the body of a Constraint.
+
+        Args:
+            c : Constraint data object
+
+        Returns:
+            A tuple of Var components which appear in c
+        """
+        expr = c.expr
+        entry = self._map.get(id(c), None)
+        # Keep a reference to the constraint and expressions, so ids can not be
+        # reused and a new expression is detected.
+        if (
+            entry is not None
+            and entry[0] is c
+            and entry[1] is expr
+            and all(e.expr is e_expr for e, e_expr in entry[2])
+        ):
+            return entry[3]
+        visitor = _IncidenceVisitor()
+        visitor.walk_expression(c.body)
+        vs = tuple(visitor.variables)
+        self._map[id(c)] = (c, expr, tuple(visitor.named), vs)
+        return vs
+
+
+class _IncidenceVisitor(StreamBasedExpressionVisitor):
+    """
+    Expression walker collecting the variables in an expression, like
+    identify_variables, and the named Expressions (with their current
+    expression) it descends into.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.variables = []
+        self.named = []
+        self._seen = set()
+
+    def initializeWalker(self, expr):
+        return self.beforeChild(None, expr, 0)[0], None
+
+    def beforeChild(self, node, child, child_idx):
+        if type(child) in native_types:
+            return False, None
+        if child.is_expression_type():
+            if child.is_named_expression_type() and id(child) not in self._seen:
+                self._seen.add(id(child))
+                self.named.append((child, child.expr))
+            return True, None
+        if child.is_variable_type() and id(child) not in self._seen:
+            self._seen.add(id(child))
+            self.variables.append(child)
+        return False, None
+
+
+_incidence_cache = None
+
+
+@contextmanager
+def incidence_cache(cache=None):
+    """
+    Context manager which enables caching of the variables which appear in
+    each Constraint for all methods in this module called within the context.
+
+    Args:
+        cache : IncidenceCache to use, this can be used to keep a cache between
+            contexts (default = None, create a new cache)
+
+    Returns:
+        The IncidenceCache in use
+    """
+    global _incidence_cache  # pylint: disable=global-statement
+    if cache is None:
+        cache = IncidenceCache()
+    previous = _incidence_cache
+    _incidence_cache = cache
+    try:
+        yield cache
+    finally:
+        _incidence_cache = previous
+
+
+def _constraint_variables(c):
+    # Variables in a constraint body, from the incidence cache if one is active
+    if _incidence_cache is None:
+        return identify_variables(c.body)
+    return _incidence_cache.variables(c)
+
+
 # -------------------------------------------------------------------------
 # Block methods
 def total_blocks_set(block):
@@ -784,8 +909,7 @@ def variables_in_activated_constraints_set(block):
     for c in _iter_indexed_block_data_objects(
         block, ctype=Constraint, active=True, descend_into=True
     ):
-        for v in identify_variables(c.body):
-            var_set.add(v)
+        var_set.update(_constraint_variables(c))
     return var_set
 
 
@@ -857,8 +981,7 @@ def variables_in_activated_equalities_set(block):
     """
     var_set = ComponentSet()
     for c in activated_equalities_generator(block):
-        for v in identify_variables(c.body):
-            var_set.add(v)
+        var_set.update(_constraint_variables(c))
     return var_set
 
 
@@ -891,8 +1014,7 @@ def variables_in_activated_inequalities_set(block):
     """
     var_set = ComponentSet()
     for c in activated_inequalities_generator(block):
-        for v in identify_variables(c.body):
-            var_set.add(v)
+        var_set.update(_constraint_variables(c))
     return var_set
 
 
@@ -30,6 +30,8 @@ __author__ = "John Eslick, Tim Bartholomew, Robert Parker, Andrew Lee"
 import math
 import sys
 
+import numpy as np
+from scipy import sparse
 import scipy.sparse.linalg as spla
 import scipy.linalg as la
 
@@ -257,6 +259,33 @@ def set_scaling_factor(c, v, data_objects=True, overwrite=True):
             suf[cdat] = v
 
 
+def _set_scaling_factors(components, values, overwrite=True):
+    """Set scaling factors for many component data objects at once, looking up
+    (or creating) the scaling_factor suffix only once for each parent block.
+
+    Args:
+        components: iterable of component data objects
+        values: iterable of scaling factors, in the same order as components
+        overwrite: whether to overwrite existing scaling factors
+    Returns:
+        None
+    """
+    suffixes = {}
+    for c, v in zip(components, values):
+        b = c.parent_block()
+        try:
+            suf = suffixes[id(b)]
+        except KeyError:
+            try:
+                suf = b.scaling_factor
+            except AttributeError:
+                b.scaling_factor = pyo.Suffix(direction=pyo.Suffix.EXPORT)
+                suf = b.scaling_factor
+            suffixes[id(b)] = suf
+        if overwrite or c not in suf:
+            suf[c] = v
+
+
 def get_scaling_factor(c, default=None, warning=False, exception=False, hint=None):
     """Get a component scale factor.
 
@@ -704,39 +733,65 @@ def constraint_autoscale_large_jac(
     else:
         nlp.clist = clist = nlp.get_pyomo_constraints()
     nlp.vlist = vlist = nlp.get_pyomo_variables()
-    # Create a scaled Jacobian to account for variable scaling, for now ignore
-    # constraint scaling
-    jac_scaled = jac.copy()
-    for i, c in enumerate(clist):
-        for j in jac_scaled[i].indices:
-            v = vlist[j]
-            if ignore_variable_scaling:
-                sv = 1
-            else:
-                sv = get_scaling_factor(v, default=1)
-            jac_scaled[i, j] = jac_scaled[i, j] / sv
-    # calculate constraint scale factors
-    for i, c in enumerate(clist):
-        sc = get_scaling_factor(c, default=1)
-        if not no_scale:
-            if ignore_constraint_scaling or get_scaling_factor(c) is None:
-                sc = 1
-                row = jac_scaled[i]
-                for d in row.indices:
-                    row[0, d] = abs(row[0, d])
-                mg = row.max()
-                if mg > max_grad:
-                    sc = max(min_scale, max_grad / mg)
-                set_scaling_factor(c, sc)
-        for j in jac_scaled[i].indices:
-            # update the scaled jacobian
-            jac_scaled[i, j] = jac_scaled[i, j] * sc
+    jac_scaled = _scale_jacobian(
+        jac,
+        clist,
+        vlist,
+        ignore_constraint_scaling=ignore_constraint_scaling,
+        ignore_variable_scaling=ignore_variable_scaling,
+        max_grad=max_grad,
+        min_scale=min_scale,
+        no_scale=no_scale,
+    )
     # delete dummy objective
     if n_obj == 0:
         delattr(m, dummy_objective_name)
     return jac, jac_scaled, nlp
 
 
+def _scale_jacobian(
+    jac,
+    clist,
+    vlist,
+    ignore_constraint_scaling=False,
+    ignore_variable_scaling=False,
+    max_grad=100,
+    min_scale=1e-6,
+    no_scale=False,
+):
+    """Calculate the scaled Jacobian and, unless no_scale is True, set
+    constraint scaling factors, for all rows at once. See
+    constraint_autoscale_large_jac for a description of the arguments.
+
+    Returns:
+        scaled Jacobian CSR form
+    """
+    jac = jac.tocsr()
+    # Create a scaled Jacobian to account for variable scaling
+    if ignore_variable_scaling:
+        sv = np.ones(len(vlist))
+    else:
+        sv = np.array([get_scaling_factor(v, default=1) for v in vlist], dtype=float)
+    jac_scaled = jac @ sparse.diags(1 / sv)
+    # calculate constraint scale factors
+    sc = np.array([get_scaling_factor(c, default=1) for c in clist], dtype=float)
+    if not no_scale:
+        if ignore_constraint_scaling:
+            autoscale = np.ones(len(clist), dtype=bool)
+        else:
+            autoscale = np.array([get_scaling_factor(c) is None for c in clist])
+        mg = abs(jac_scaled).max(axis=1).toarray().ravel()
+        large = mg > max_grad
+        new_sc = np.ones(len(clist))
+        new_sc[large] = np.maximum(min_scale, max_grad / mg[large])
+        sc[autoscale] = new_sc[autoscale]
+        _set_scaling_factors(
+            [clist[i] for i in np.flatnonzero(autoscale)], sc[autoscale].tolist()
+        )
+    # update the scaled jacobian
+    return (sparse.diags(sc) @ jac_scaled).tocsr()
+
+
 def get_jacobian(m, scaled=True, equality_constraints_only=False):
     """
     Get the Jacobian matrix at the current model values. This function also
@@ -761,6 +816,61 @@ def get_jacobian(m, scaled=True, equality_constraints_only=False):
         return jac, nlp
 
 
+def jacobian_row_norms(jac):
+    """
+    Calculate the L2 norm of every row of a sparse Jacobian matrix without
+    densifying it. Row i corresponds to the constraint nlp.clist[i] of the
+    Pynumero NLP returned by get_jacobian().
+
+    Args:
+        jac: Jacobian matrix in a Scipy sparse format
+
+    Returns:
+        NumPy array of row norms
+    """
+    jac = jac.tocsr()
+    return np.sqrt(np.asarray(jac.multiply(jac).sum(axis=1)).ravel())
+
+
+def jacobian_column_norms(jac):
+    """
+    Calculate the L2 norm of every column of a sparse Jacobian matrix without
+    densifying it. Column j corresponds to the variable nlp.vlist[j] of the
+    Pynumero NLP returned by get_jacobian().
+
+    Args:
+        jac: Jacobian matrix in a Scipy sparse format
+
+    Returns:
+        NumPy array of column norms
+    """
+    jac = jac.tocsc()
+    return np.sqrt(np.asarray(jac.multiply(jac).sum(axis=0)).ravel())
+
+
+def extreme_jacobian_entries_arrays(jac, large=1e4, small=1e-4, zero=1e-10):
+    """
+    Find very large and very small entries of a sparse Jacobian matrix without
+    densifying it.
+
+    Args:
+        jac: Jacobian matrix in a Scipy sparse format
+        large: >= to this value is considered large
+        small: <= to this and >= zero is considered small
+        zero: entries <= to this value are ignored
+
+    Returns:
+        NumPy arrays (absolute values, row indices, column indices) of the
+        extreme entries in row major order
+    """
+    jac = jac.tocsr()
+    jac.sort_indices()
+    jac = jac.tocoo()
+    e = np.abs(jac.data)
+    mask = ((e <= small) & (e > zero)) | (e >= large)
+    return e[mask], jac.row[mask], jac.col[mask]
+
+
 def extreme_jacobian_entries(
     m=None, scaled=True, large=1e4, small=1e-4, zero=1e-10, jac=None, nlp=None
 ):
@@ -778,14 +888,13 @@ def extreme_jacobian_entries(
     """
     if jac is None or nlp is None:
         jac, nlp = get_jacobian(m, scaled)
-    el = []
-    for i, c in enumerate(nlp.clist):
-        for j in jac[i].indices:
-            v = nlp.vlist[j]
-            e = abs(jac[i, j])
-            if (e <= small and e > zero) or e >= large:
-                el.append((e, c, v))
-    return el
+    e, rows, cols = extreme_jacobian_entries_arrays(
+        jac, large=large, small=small, zero=zero
+    )
+    return [
+        (float(x), nlp.clist[i], nlp.vlist[j])
+        for x, i, j in zip(e, rows.tolist(), cols.tolist())
+    ]
 
 
 def extreme_jacobian_rows(
@@ -807,16 +916,9 @@ def extreme_jacobian_rows(
     # Need both jac for the linear algebra and nlp for constraint names
     if jac is None or nlp is None:
         jac, nlp = get_jacobian(m, scaled)
-    el = []
-    for i, c in enumerate(nlp.clist):
-        norm = 0
-        # Calculate L2 norm
-        for j in jac[i].indices:
-            norm += jac[i, j] ** 2
-        norm = norm**0.5
-        if norm <= small or norm >= large:
-            el.append((norm, c))
-    return el
+    norms = jacobian_row_norms(jac)
+    idx = np.flatnonzero((norms <= small) | (norms >= large))
+    return [(float(norms[i]), nlp.clist[i]) for i in idx.tolist()]
 
 
 def extreme_jacobian_columns(
@@ -838,20 +940,14 @@ def extreme_jacobian_columns(
     # Need both jac for the linear algebra and nlp for variable names
     if jac is None or nlp is None:
         jac, nlp = get_jacobian(m, scaled)
-    jac = jac.tocsc()
-    el = []
-    for j, v in enumerate(nlp.vlist):
-        norm = 0
-        # Calculate L2 norm
-        for i in jac.getcol(j).indices:
-            norm += jac[i, j] ** 2
-        norm = norm**0.5
-        if norm <= small or norm >= large:
-            el.append((norm, v))
-    return el
+    norms = jacobian_column_norms(jac)
+    idx = np.flatnonzero((norms <= small) | (norms >= large))
+    return [(float(norms[j]), nlp.vlist[j]) for j in idx.tolist()]
 
 
-def jacobian_cond(m=None, scaled=True, order=None, pinv=False, jac=None):
+def jacobian_cond(
+    m=None, scaled=True, order=None, pinv=False, jac=None, estimate=False
+):
     """
     Get the condition number of the scaled or unscaled Jacobian matrix of a model.
 
@@ -861,6 +957,13 @@ def jacobian_cond(m=None, scaled=True, order=None, pinv=False, jac=None):
         order: norm order, None = Frobenius, see scipy.sparse.linalg.norm for more
         pinv: Use pseudoinverse, works for non-square matrices
         jac: (optional) previously calculated Jacobian
+        estimate: if True, estimate the condition number without densifying
+            the Jacobian or forming its inverse. For square matrices this is
+            the 1-norm condition number estimated from a sparse LU
+            factorization, for non-square matrices this is the 2-norm
+            condition number from the extreme singular values found by an
+            iterative (Lanczos) method. The order and pinv arguments are
+            ignored.
 
     Returns:
         (float) Condition number
@@ -868,6 +971,8 @@ def jacobian_cond(m=None, scaled=True, order=None, pinv=False, jac=None):
     if jac is None:
         jac, nlp = get_jacobian(m, scaled)  # pylint: disable=unused-variable
     jac = jac.tocsc()
+    if estimate:
+        return _jacobian_cond_estimate(jac)
     if jac.shape[0] != jac.shape[1] and not pinv:
         _log.warning("Nonsquare Jacobian using pseudo inverse")
         pinv = True
@@ -879,6 +984,27 @@ def jacobian_cond(m=None, scaled=True, order=None, pinv=False, jac=None):
         return spla.norm(jac, order) * la.norm(jac_inv, order)
 
 
+def _jacobian_cond_estimate(jac):
+    if jac.shape[0] == jac.shape[1]:
+        try:
+            lu = spla.splu(jac)
+        except RuntimeError:
+            _log.warning("Jacobian is singular")
+            return math.inf
+        jac_inv = spla.LinearOperator(
+            jac.shape,
+            matvec=lu.solve,
+            rmatvec=lambda x: lu.solve(x, trans="T"),
+            dtype=jac.dtype,
+        )
+        return spla.onenormest(jac) * spla.onenormest(jac_inv)
+    smax = spla.svds(jac, k=1, which="LM", return_singular_vectors=False)[0]
+    smin = spla.svds(jac, k=1, which="SM", return_singular_vectors=False)[0]
+    if smin == 0:
+        return math.inf
+    return smax / smin
+
+
 def scale_time_discretization_equations(blk, time_set, time_scaling_factor):
     """
     Scales time discretization equations generated via a Pyomo discretization
@@ -1537,13 +1663,206 @@ class NominalValueExtractionVisitor(EXPR.StreamBasedExpressionVisitor):
         )
 
 
+def _constraint_data_list(component, descend_into=True):
+    # Get a list of constraint data objects from a Block, indexed Constraint
+    # or ConstraintData.
+    if isinstance(component, pyo.Block):
+        return list(
+            component.component_data_objects(pyo.Constraint, descend_into=descend_into)
+        )
+    elif component.is_indexed():
+        return list(component.values())
+    return [component]
+
+
+class _RecordingNominalValueVisitor(NominalValueExtractionVisitor):
+    """
+    NominalValueExtractionVisitor which records the leaf nodes it visits and
+    their nominal values, and the named Expressions it visits and their
+    expressions, so a cached result can be validated later.
+    """
+
+    def __init__(self, warning: bool = True):
+        super().__init__(warning=warning)
+        self.leaves = []
+        self.leaf_values = []
+        self.named = []
+
+    def _get_magnitude_base_type(self, node):
+        nominal = super()._get_magnitude_base_type(node)
+        self.leaves.append(node)
+        self.leaf_values.append(nominal[0])
+        return nominal
+
+    def exitNode(self, node, data):
+        if (
+            hasattr(node, "is_named_expression_type")
+            and node.is_named_expression_type()
+        ):
+            self.named.append((node, node.expr))
+        return super().exitNode(node, data)
+
+
+class NominalValueCache(object):
+    """
+    Cache of the nominal values of expressions found with
+    NominalValueExtractionVisitor, keyed on expression identity.
+
+    For each expression, the nominal values of the leaf components (Vars and
+    Params) the result depends on are stored. When a cached result is
+    requested these are recalculated, which is much cheaper than walking the
+    full expression, and the expression is walked again if any of them changed
+    (e.g. because a scaling factor, bound or sign of a variable changed), or if
+    the expression of a named Expression which appears in it was replaced with
+    set_value. This makes the cache safe to keep between scaling reports and
+    rescaling steps.
+
+    Args:
+        warning: bool indicating whether to log a warning when a missing
+            scaling factor is encountered while walking an expression
+            (default=True)
+    """
+
+    def __init__(self, warning: bool = True):
+        self._visitor = _RecordingNominalValueVisitor(warning=warning)
+        self._check = NominalValueExtractionVisitor(warning=False)
+        self._map = {}
+
+    def __len__(self):
+        return len(self._map)
+
+    def clear(self):
+        """
+        Remove all cached entries.
+        """
+        self._map.clear()
+
+    def nominal_values(self, expr):
+        """
+        Get the nominal values of the additive terms in an expression, see
+        NominalValueExtractionVisitor.
+
+        Args:
+            expr: expression to get nominal values for
+
+        Returns:
+            list of nominal values of the additive terms in expr
+        """
+        entry = self._map.get(id(expr), None)
+        # Keep a reference to the expression, so an id can not be reused
+        if (
+            entry is not None
+            and entry[0] is expr
+            and all(e.expr is e_expr for e, e_expr in entry[3])
+        ):
+            check = self._check._get_magnitude_base_type
+            if all(check(n)[0] == v for n, v in zip(entry[1], entry[2])):
+                return list(entry[4])
+        visitor = self._visitor
+        visitor.leaves = []
+        visitor.leaf_values = []
+        visitor.named = []
+        values = visitor.walk_expression(expr)
+        self._map[id(expr)] = (
+            expr,
+            tuple(visitor.leaves),
+            tuple(visitor.leaf_values),
+            tuple(visitor.named),
+            tuple(values),
+        )
+        return list(values)
+
+
+def constraint_nominal_values(
+    component,
+    descend_into: bool = True,
+    warning: bool = True,
+    cache: NominalValueCache = None,
+):
+    """
+    Get the nominal values of the additive terms of all constraints in a
+    component in a single ragged structure.
+
+    Args:
+        component: a Block, Constraint or ConstraintData to get nominal values for
+        descend_into: bool indicating whether function should descend into child
+            Blocks if component is a Pyomo Block (default=True).
+        warning: bool indicating whether to log a warning if a missing variable
+            scaling factor is found (default=True). Ignored if cache is given.
+        cache: NominalValueCache to get nominal values from (default=None, walk
+            every constraint expression)
+
+    Returns:
+        list of constraint data objects, NumPy array of nominal values of all
+        terms and NumPy array of offsets, such that the nominal values of the
+        terms of constraint i are values[offsets[i]:offsets[i+1]]
+    """
+    constraints = _constraint_data_list(component, descend_into=descend_into)
+    if cache is None:
+        walk = NominalValueExtractionVisitor(warning=warning).walk_expression
+    else:
+        walk = cache.nominal_values
+    values = []
+    offsets = [0]
+    for c in constraints:
+        values.extend(walk(c.expr))
+        offsets.append(len(values))
+    return constraints, np.array(values, dtype=float), np.array(offsets, dtype=int)
+
+
+def _set_constraint_scaling_from_nominal(
+    component, reduction, warning, overwrite, descend_into, cache
+):
+    # Compute the nominal values of all constraints in component in one pass,
+    # reduce the terms of each constraint to a scaling factor with
+    # reduction(values, offsets) and write the scaling factors in bulk.
+    constraints, values, offsets = constraint_nominal_values(
+        component, descend_into=descend_into, warning=warning, cache=cache
+    )
+    if not constraints:
+        return
+    sf = reduction(np.abs(values), offsets)
+    _set_scaling_factors(constraints, sf.tolist(), overwrite=overwrite)
+
+
+def _reduce_max_magnitude(values, offsets):
+    # 0 terms will never be the largest absolute magnitude, so we can ignore them
+    return np.maximum.reduceat(values, offsets[:-1])
+
+
+def _reduce_min_magnitude(values, offsets):
+    # Ignore any 0 terms - we will assume they do not contribute to scaling
+    nonzero = np.where(values != 0, values, np.inf)
+    min_mag = np.minimum.reduceat(nonzero, offsets[:-1])
+    if np.isinf(min_mag).any():
+        raise ValueError(
+            "Found a constraint where all terms have a nominal value of 0, "
+            "cannot determine a scaling factor from the minimum magnitude."
+        )
+    return min_mag
+
+
+def _reduce_harmonic_magnitude(values, offsets):
+    # Ignore any 0 terms - we will assume they do not contribute to scaling
+    inv = np.zeros_like(values)
+    np.divide(1, values, out=inv, where=values != 0)
+    return np.add.reduceat(inv, offsets[:-1])
+
+
 def set_constraint_scaling_max_magnitude(
-    component, warning: bool = True, overwrite: bool = False, descend_into: bool = True
+    component,
+    warning: bool = True,
+    overwrite: bool = False,
+    descend_into: bool = True,
+    cache: NominalValueCache = None,
 ):
     """
     Set scaling factors for constraints using maximum expected magnitude of additive terms in expression.
     Scaling factor for constraints will be 1 / max(abs(nominal value)).
 
+    The nominal values of all constraints in component are collected in a
+    single pass and the scaling factors are computed and set in bulk.
+
     Args:
         component: a Pyomo component to set constraint scaling factors for.
         warning: bool indicating whether to log a warning if a missing variable scaling factor is
@@ -1551,39 +1870,35 @@ def set_constraint_scaling_max_magnitude(
         overwrite: bool indicating whether to overwrite existing scaling factors (default=False).
         descend_into: bool indicating whether function should descend into child Blocks
             if component is a Pyomo Block (default=True).
+        cache: NominalValueCache to get nominal values from (default=None).
 
     Returns:
         None
     """
-
-    def _set_sf_max_mag(c):
-        nominal = NominalValueExtractionVisitor(warning=warning).walk_expression(c.expr)
-        # 0 terms will never be the largest absolute magnitude, so we can ignore them
-        max_mag = max(abs(i) for i in nominal)
-        set_scaling_factor(c, max_mag, overwrite=overwrite)
-
-    if isinstance(component, pyo.Block):
-        # Iterate over all constraint datas and call this method on each
-        for c in component.component_data_objects(
-            pyo.Constraint, descend_into=descend_into
-        ):
-            set_constraint_scaling_max_magnitude(
-                c, warning=warning, overwrite=overwrite
-            )
-    elif component.is_indexed():
-        for i in component:
-            _set_sf_max_mag(component[i])
-    else:
-        _set_sf_max_mag(component)
+    _set_constraint_scaling_from_nominal(
+        component,
+        _reduce_max_magnitude,
+        warning=warning,
+        overwrite=overwrite,
+        descend_into=descend_into,
+        cache=cache,
+    )
 
 
 def set_constraint_scaling_min_magnitude(
-    component, warning: bool = True, overwrite: bool = False, descend_into: bool = True
+    component,
+    warning: bool = True,
+    overwrite: bool = False,
+    descend_into: bool = True,
+    cache: NominalValueCache = None,
 ):
     """
     Set scaling factors for constraints using minimum expected magnitude of additive terms in expression.
     Scaling factor for constraints will be 1 / min(abs(nominal value)).
 
+    The nominal values of all constraints in component are collected in a
+    single pass and the scaling factors are computed and set in bulk.
+
     Args:
         component: a Pyomo component to set constraint scaling factors for.
         warning: bool indicating whether to log a warning if a missing variable scaling factor is
@@ -1591,39 +1906,35 @@ def set_constraint_scaling_min_magnitude(
         overwrite: bool indicating whether to overwrite existing scaling factors (default=False).
         descend_into: bool indicating whether function should descend into child Blocks
             if component is a Pyomo Block (default=True).
+        cache: NominalValueCache to get nominal values from (default=None).
 
     Returns:
         None
     """
-
-    def _set_sf_min_mag(c):
-        nominal = NominalValueExtractionVisitor(warning=warning).walk_expression(c.expr)
-        # Ignore any 0 terms - we will assume they do not contribute to scaling
-        min_mag = min(abs(i) for i in [j for j in nominal if j != 0])
-        set_scaling_factor(c, min_mag, overwrite=overwrite)
-
-    if isinstance(component, pyo.Block):
-        # Iterate over all constraint datas and call this method on each
-        for c in component.component_data_objects(
-            pyo.Constraint, descend_into=descend_into
-        ):
-            set_constraint_scaling_min_magnitude(
-                c, warning=warning, overwrite=overwrite
-            )
-    elif component.is_indexed():
-        for i in component:
-            _set_sf_min_mag(component[i])
-    else:
-        _set_sf_min_mag(component)
+    _set_constraint_scaling_from_nominal(
+        component,
+        _reduce_min_magnitude,
+        warning=warning,
+        overwrite=overwrite,
+        descend_into=descend_into,
+        cache=cache,
+    )
 
 
 def set_constraint_scaling_harmonic_magnitude(
-    component, warning: bool = True, overwrite: bool = False, descend_into: bool = True
+    component,
+    warning: bool = True,
+    overwrite: bool = False,
+    descend_into: bool = True,
+    cache: NominalValueCache = None,
 ):
     """
     Set scaling factors for constraints using the harmonic sum of the expected magnitude of
     additive terms in expression. Scaling factor for constraints will be 1 / sum(1/abs(nominal value)).
 
+    The nominal values of all constraints in component are collected in a
+    single pass and the scaling factors are computed and set in bulk.
+
     Args:
         component: a Pyomo component to set constraint scaling factors for.
         warning: bool indicating whether to log a warning if a missing variable scaling factor is
@@ -1631,30 +1942,19 @@ def set_constraint_scaling_harmonic_magnitude(
         overwrite: bool indicating whether to overwrite existing scaling factors (default=False).
         descend_into: bool indicating whether function should descend into child Blocks
             if component is a Pyomo Block (default=True).
+        cache: NominalValueCache to get nominal values from (default=None).
 
     Returns:
         None
     """
-
-    def _set_sf_har_mag(c):
-        nominal = NominalValueExtractionVisitor(warning=warning).walk_expression(c.expr)
-        # Ignore any 0 terms - we will assume they do not contribute to scaling
-        harm_sum = sum(1 / abs(i) for i in [j for j in nominal if j != 0])
-        set_scaling_factor(c, harm_sum, overwrite=overwrite)
-
-    if isinstance(component, pyo.Block):
-        # Iterate over all constraint datas and call this method on each
-        for c in component.component_data_objects(
-            pyo.Constraint, descend_into=descend_into
-        ):
-            set_constraint_scaling_harmonic_magnitude(
-                c, warning=warning, overwrite=overwrite
-            )
-    elif component.is_indexed():
-        for i in component:
-            _set_sf_har_mag(component[i])
-    else:
-        _set_sf_har_mag(component)
+    _set_constraint_scaling_from_nominal(
+        component,
+        _reduce_harmonic_magnitude,
+        warning=warning,
+        overwrite=overwrite,
+        descend_into=descend_into,
+        cache=cache,
+    )
 
 
 def report_scaling_issues(
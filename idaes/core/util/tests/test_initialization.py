@@ -31,6 +31,7 @@ from pyomo.environ import (
     check_optimal_termination,
 )
 from pyomo.network import Arc, Port
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
 
 from idaes.core import (
     FlowsheetBlock,
@@ -52,11 +53,13 @@ from idaes.core.util.testing import PhysicalParameterTestBlock
 from idaes.core.util.model_statistics import degrees_of_freedom
 from idaes.models.unit_models import CSTR
 from idaes.core.util.exceptions import ConfigurationError
+import idaes.core.util.initialization
 from idaes.core.util.initialization import (
     fix_state_vars,
     revert_state_vars,
     propagate_state,
     solve_indexed_blocks,
+    solve_indexed_blocks_parallel,
     initialize_by_time_element,
 )
 from idaes.core.solvers import get_solver
@@ -979,6 +982,88 @@ def test_solve_indexed_block_IndexedBlock():
         assert value(m.b[i].v == 2.0)
 
 
+class _LinearBlockSolver(object):
+    """
+    Stand-in for a solver which solves blocks of constraints v == const, used
+    to test solve_indexed_blocks_parallel without an NLP solver.
+    """
+
+    def solve(self, blk, **kwds):
+        results = SolverResults()
+        for c in blk.component_data_objects(Constraint, active=True):
+            if value(c.upper) < 0:
+                raise RuntimeError("negative")
+            c.body.set_value(value(c.upper))
+        results.solver.status = SolverStatus.ok
+        results.solver.termination_condition = TerminationCondition.optimal
+        return results
+
+
+def _parallel_test_model():
+    m = ConcreteModel()
+    m.s = Set(initialize=[1, 2, 3, 4])
+
+    def block_rule(b, x):
+        b.v = Var(initialize=1.0)
+        b.c = Constraint(expr=b.v == 2.0 * x)
+
+    m.b = Block(m.s, rule=block_rule)
+    return m
+
+
+@pytest.mark.unit
+def test_solve_indexed_blocks_parallel():
+    m = _parallel_test_model()
+
+    res = solve_indexed_blocks_parallel(
+        solver=_LinearBlockSolver(), blocks=m.b, n_workers=2
+    )
+
+    assert check_optimal_termination(res)
+    for i in m.s:
+        assert value(m.b[i].v) == 2.0 * i
+
+
+@pytest.mark.unit
+def test_solve_indexed_blocks_parallel_failure():
+    m = _parallel_test_model()
+    m.b[3].c.set_value(m.b[3].v == -1)
+
+    res = solve_indexed_blocks_parallel(
+        solver=_LinearBlockSolver(), blocks=[m.b], n_workers=2
+    )
+
+    assert not check_optimal_termination(res)
+    assert res.solver.status == SolverStatus.error
+    assert "b[3]" in res.solver.message
+    # Other blocks are still solved
+    for i in [1, 2, 4]:
+        assert value(m.b[i].v) == 2.0 * i
+    assert value(m.b[3].v) == 1.0
+
+
+@pytest.mark.unit
+def test_solve_indexed_blocks_parallel_coupled(monkeypatch):
+    m = _parallel_test_model()
+    m.b[2].c2 = Constraint(expr=m.b[2].v == m.b[1].v)
+
+    # Coupled blocks are solved together with solve_indexed_blocks
+    monkeypatch.setattr(
+        idaes.core.util.initialization,
+        "solve_indexed_blocks",
+        lambda solver, blocks, **kwds: "fallback",
+    )
+    res = solve_indexed_blocks_parallel(
+        solver=_LinearBlockSolver(), blocks=m.b, n_workers=2
+    )
+    assert res == "fallback"
+    m.b[1].v.fix()
+    res = solve_indexed_blocks_parallel(
+        solver=_LinearBlockSolver(), blocks=m.b, n_workers=2
+    )
+    assert res != "fallback"
+
+
 @pytest.mark.unit
 def test_solve_indexed_block_error():
     # Try solve_indexed_block on non-block object
@@ -19,7 +19,7 @@ import os
 
 from pyomo.environ import *
 from idaes.core.util import to_json, from_json, StoreSpec
-from idaes.core.util.model_serializer import _only_fixed
+from idaes.core.util.model_serializer import _only_fixed, CompiledStoreSpec
 from idaes.core.dmf.util import mkdtemp
 import shutil
 import pytest
@@ -585,6 +585,288 @@ class TestModelSerialize(unittest.TestCase):
         assert value(model.b[1].x[3, 3]) == 1
         assert value(model.b[2].x[3, 3]) == 3
 
+    @pytest.mark.unit
+    def test_compiled01(self):
+        """Save and load a model state with a compiled StoreSpec"""
+        model = self.setup_model01()
+        a = model.b[1].a
+        b = model.b[1].b
+        cwts = StoreSpec().compile(model)
+        assert isinstance(cwts, CompiledStoreSpec)
+        assert "b[1].a" in cwts.paths
+        arrays = cwts.to_arrays()
+        a.value = 0.11
+        b.value = 0.11
+        a.unfix()
+        model.b[1].deactivate()
+        model.b[1].c.deactivate()
+        b.setlb(2)
+        b.setub(None)
+        model.x = False
+        cwts.from_arrays(arrays)
+        assert a.fixed
+        assert model.b[1].active
+        assert model.b[1].c.active
+        assert value(b) == 20
+        assert value(a) == 2
+        assert b.lb == -100
+        assert b.ub == 100
+        assert model.x.value is True
+        # write into the existing arrays in place
+        b.setub(None)
+        b.value = None
+        out = cwts.to_arrays(out=arrays)
+        assert out is arrays
+        b.setub(4)
+        b.value = 3
+        cwts.from_arrays(arrays)
+        assert b.ub is None
+        assert b.value is None
+
+    @pytest.mark.unit
+    def test_compiled02(self):
+        """Compiled StoreSpec with a filter function and parameters"""
+        model = self.setup_model02()
+        x = model.x
+        x[1].fix(1)
+        cwts = StoreSpec.value_isfixed_isactive(only_fixed=True).compile(model)
+        arrays = cwts.to_arrays()
+        x[1].unfix()
+        x[1].value = 2
+        x[2].value = 10
+        model.a = 5
+        model.g.deactivate()
+        cwts.from_arrays(arrays)
+        assert x[1].fixed
+        assert value(x[1]) == 1
+        assert value(x[2]) == 10
+        assert value(model.a) == 1
+        assert model.g.active
+
+    @pytest.mark.unit
+    def test_compiled03(self):
+        """Compiled StoreSpec save to npz file and directory"""
+        model = self.setup_model02()
+        cwts = CompiledStoreSpec(model)
+        fname = os.path.join(self.dirname, "state.npz")
+        dname = os.path.join(self.dirname, "state_dir")
+        cwts.save(fname)
+        cwts.save(dname)
+        model.x[1].value = 7
+        model.x[2].setlb(None)
+        cwts.load(fname)
+        assert value(model.x[1]) == pytest.approx(1.5)
+        assert model.x[2].lb == -10
+        model.x[1].value = 7
+        arrays = cwts.load(dname, mmap_mode="r")
+        assert value(model.x[1]) == pytest.approx(1.5)
+        model2 = self.setup_model02()
+        model2.x[1].value = 7
+        CompiledStoreSpec(model2).load(dname)
+        assert value(model2.x[1]) == pytest.approx(1.5)
+        # different structure
+        model2.y = Var()
+        with pytest.raises(ValueError):
+            CompiledStoreSpec(model2).from_arrays(arrays)
+
+    @pytest.mark.unit
+    def test_compiled04(self):
+        """Compiled StoreSpec with References, data appear more than once"""
+        model = self.setup_model03()
+        cwts = CompiledStoreSpec(model)
+        model.r[1, 3] = 1
+        model.r[2, 3] = 3
+        arrays = cwts.to_arrays()
+        model.r[1, 3] = 6
+        model.r[2, 3] = 8
+        cwts.from_arrays(arrays)
+        assert value(model.b[1].x[3, 3]) == 1
+        assert value(model.b[2].x[3, 3]) == 3
+
+    @pytest.mark.unit
+    def test_compiled_delta01(self):
+        """Delta snapshots only store changed objects"""
+        model = self.setup_model02()
+        x = model.x
+        cwts = CompiledStoreSpec(model)
+        base = cwts.to_arrays()
+        x[1].value = 3
+        x[2].setub(None)
+        d1 = cwts.delta_arrays(base)
+        assert d1["__delta__"]
+        n_changed = sum(
+            len(v) for k, v in d1.items() if k.endswith("__idx") and k.startswith("d")
+        )
+        assert n_changed == 2
+        s1 = cwts.to_arrays()
+        model.g.deactivate()
+        x[1].fix(4)
+        d2 = cwts.delta_arrays(s1)
+        fname = os.path.join(self.dirname, "delta2.npz")
+        cwts.save(fname, arrays=d2)
+        # back to base then replay the deltas into the model one by one
+        cwts.from_arrays(base)
+        assert value(x[1]) == pytest.approx(1.5)
+        assert x[2].ub == 10
+        assert model.g.active
+        cwts.from_arrays(d1)
+        assert value(x[1]) == 3
+        assert x[2].ub is None
+        assert model.g.active
+        assert not x[1].fixed
+        cwts.load(fname)
+        assert value(x[1]) == 4
+        assert x[1].fixed
+        assert not model.g.active
+        # replay the chain on the arrays
+        cwts.from_arrays(base)
+        cwts.from_arrays(cwts.apply_deltas(base, [d1, d2]))
+        assert value(x[1]) == 4
+        assert x[1].fixed
+        assert x[2].ub is None
+        assert not model.g.active
+        # base is not modified by apply_deltas
+        cwts.from_arrays(base)
+        assert value(x[1]) == pytest.approx(1.5)
+        with pytest.raises(ValueError):
+            cwts.apply_deltas(d1, [d2])
+
+    @pytest.mark.unit
+    def test_compiled_delta02(self):
+        """Delta snapshot with a filter function"""
+        model = self.setup_model02()
+        x = model.x
+        x[1].fix(1)
+        cwts = StoreSpec.value_isfixed(only_fixed=True).compile(model)
+        base = cwts.to_arrays()
+        x[1].value = 2
+        x[2].value = 5
+        delta = cwts.delta_arrays(base)
+        x[1].value = 7
+        x[2].value = 7
+        cwts.from_arrays(delta)
+        assert value(x[1]) == 2
+        assert value(x[2]) == 7
+
+    @pytest.mark.unit
+    def test_compiled_broadcast(self):
+        """Broadcast the state of one model to models with the same structure"""
+        model = self.setup_model02()
+        model.x[1].fix(3)
+        model.x[2].setub(None)
+        model.a = 5
+        cwts = CompiledStoreSpec(model)
+        blk = ConcreteModel()
+        blk.b = Block([1, 2])
+        for i in blk.b:
+            blk.b[i].transfer_attributes_from(self.setup_model02())
+        targets = [blk.b[1], blk.b[2], self.setup_model02()]
+        loaded, skipped = cwts.broadcast(targets)
+        assert len(loaded) == 3
+        assert skipped == []
+        for t in targets:
+            assert value(t.x[1]) == 3
+            assert t.x[1].fixed
+            assert t.x[2].ub is None
+            assert value(t.a) == 5
+        # reuse the compiled targets with a stored state
+        model.x[1].value = 4
+        arrays = cwts.to_arrays()
+        cwts.broadcast(loaded, arrays=arrays)
+        assert value(blk.b[2].x[1]) == 4
+        # targets with a different structure
+        model2 = self.setup_model02()
+        model2.y = Var()
+        with pytest.raises(ValueError):
+            cwts.broadcast([model2])
+        loaded, skipped = cwts.broadcast([model2, blk.b[1]], strict=False)
+        assert len(loaded) == 1
+        assert skipped == [model2]
+        assert value(model2.x[1]) == 1.5
+
+    @pytest.mark.unit
+    def test_compiled_broadcast_indexed_sub_block(self):
+        """Broadcast from a model to block data with indexed sub-blocks"""
+
+        def build(b):
+            b.x = Var(initialize=1)
+            b.sub = Block([1, 2])
+            for i in b.sub:
+                b.sub[i].y = Var([1, 2], initialize=2)
+
+        model = ConcreteModel()
+        build(model)
+        model.x.value = 3
+        model.sub[2].y[1].fix(4)
+        cwts = CompiledStoreSpec(model)
+        blk = ConcreteModel()
+        blk.period = Block([1, 2, 3])
+        for p in blk.period:
+            build(blk.period[p])
+        loaded, skipped = cwts.broadcast(blk.period.values(), strict=False)
+        assert len(loaded) == 3
+        assert skipped == []
+        for b in blk.period.values():
+            assert value(b.x) == 3
+            assert value(b.sub[2].y[1]) == 4
+            assert b.sub[2].y[1].fixed
+            assert value(b.sub[1].y[1]) == 2
+
+    @pytest.mark.unit
+    def test_compiled_suffix(self):
+        """Suffixes are stored and broadcast like with to_json and from_json"""
+        model = self.setup_model02()
+        model.scaling_factor = Suffix(direction=Suffix.EXPORT)
+        model.scaling_factor[model.x[1]] = 1e-3
+        model.scaling_factor[model.g] = 10
+        model.dual[model.g] = 1
+        cwts = CompiledStoreSpec(model)
+        arrays = cwts.to_arrays()
+        model.scaling_factor[model.x[1]] = 5
+        del model.dual[model.g]
+        cwts.from_arrays(arrays)
+        assert model.scaling_factor[model.x[1]] == 1e-3
+        assert model.scaling_factor[model.g] == 10
+        assert model.dual[model.g] == 1
+        # only the suffix changed
+        model.dual[model.g] = 2
+        delta = cwts.delta_arrays(arrays)
+        model.dual[model.g] = 3
+        cwts.from_arrays(delta)
+        assert model.dual[model.g] == 2
+        assert cwts.apply_deltas(arrays, [delta])["s1_value"].tolist() == [2]
+
+        # broadcast gives the same suffixes as from_json
+        sd = to_json(model, return_dict=True)
+
+        def _target():
+            m = self.setup_model02()
+            m.scaling_factor = Suffix(direction=Suffix.EXPORT)
+            return m
+
+        t1, t2 = _target(), _target()
+        from_json(t1, sd=sd)
+        loaded, skipped = cwts.broadcast([t2])
+        assert skipped == []
+        for t in (t1, t2):
+            assert {c.name: v for c, v in t.scaling_factor.items()} == {
+                "x[1]": 1e-3,
+                "g": 10,
+            }
+            assert {c.name: v for c, v in t.dual.items()} == {"g": 2}
+
+        # suffixes are not stored if not in the StoreSpec
+        cwts_nosuffix = CompiledStoreSpec(model, wts=StoreSpec(suffix=False))
+        t3 = _target()
+        cwts_nosuffix.broadcast([t3])
+        assert len(t3.scaling_factor) == 0
+
+        # the compiled targets are cached
+        t2.scaling_factor[t2.x[1]] = 7
+        loaded2, _ = cwts.broadcast([t2])
+        assert loaded2[0] is loaded[0]
+        assert t2.scaling_factor[t2.x[1]] == 1e-3
+
 
 if __name__ == "__main__":
     unittest.main()
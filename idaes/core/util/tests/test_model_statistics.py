@@ -607,6 +607,62 @@ def test_degrees_of_freedom(m):
     assert degrees_of_freedom(m.b2) == -1
 
 
+def _incidence_statistics(b):
+    return [
+        f(b)
+        for f in (
+            degrees_of_freedom,
+            number_variables_in_activated_constraints,
+            number_variables_not_in_activated_constraints,
+            number_variables_in_activated_equalities,
+            number_variables_in_activated_inequalities,
+            number_variables_only_in_inequalities,
+            number_fixed_variables_in_activated_equalities,
+            number_unfixed_variables_in_activated_equalities,
+            number_fixed_variables_only_in_inequalities,
+            number_unused_variables,
+            number_fixed_unused_variables,
+        )
+    ]
+
+
+@pytest.mark.unit
+def test_incidence_cache(m):
+    # A constraint with a named Expression
+    m.b2["b"].c3 = Constraint(expr=m.b2["b"].e1 == m.b2["b"].v2["b"])
+    cache = IncidenceCache()
+
+    def check():
+        # Statistics with the cache match those computed without it
+        for b in (m, m.b2):
+            expected = _incidence_statistics(b)
+            with incidence_cache(cache) as c:
+                assert c is cache
+                assert _incidence_statistics(b) == expected
+        assert len(cache) > 0
+
+    check()
+    # Activation and fixing changes do not invalidate the cache
+    n_entries = len(cache)
+    m.b2["b"].c2.deactivate()
+    check()
+    m.b2["b"].v1.unfix()
+    check()
+    m.b2["a"].c1.activate()
+    check()
+    assert len(cache) == n_entries + 1
+    # Replacing a constraint expression does
+    m.b2["b"].c1.set_value(m.b2["b"].v1 + m.b2["b"].v2["a"] == 2)
+    check()
+    assert m.b2["b"].v2["a"] in ComponentSet(cache.variables(m.b2["b"].c1))
+    # As does replacing a named Expression in a constraint
+    m.b2["b"].e1.set_value(m.b2["b"].v2["a"])
+    check()
+    c3_vars = ComponentSet(cache.variables(m.b2["b"].c3))
+    assert m.b2["b"].v2["a"] in c3_vars
+    assert m.b2["b"].v1 not in c3_vars
+
+
 @pytest.mark.unit
 def test_large_residuals_set(m):
     # Initialize derivative var values so no errors occur
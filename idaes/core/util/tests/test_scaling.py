@@ -16,7 +16,9 @@ This module contains tests for scaling.
 import math
 from io import StringIO
 
+import numpy as np
 import pytest
+import scipy.sparse
 import pyomo.environ as pyo
 import pyomo.dae as dae
 from pyomo.common.collections import ComponentSet
@@ -1123,6 +1125,71 @@ class TestFlattenedScalingAssignment:
         assert scaling_factor[y] == pytest.approx(1 / (4 + 10**3))
 
 
+@pytest.mark.unit
+def test_sparse_jacobian_diagnostics():
+    jac = scipy.sparse.csr_matrix(
+        np.array(
+            [
+                [1e7, 0, 0, 3],
+                [0, 1, 0, 0],
+                [0, 2e-5, 10, 0],
+                [0, 0, 0, 1e-7],
+            ]
+        )
+    )
+    dense = jac.toarray()
+    assert sc.jacobian_row_norms(jac) == pytest.approx(np.linalg.norm(dense, axis=1))
+    assert sc.jacobian_column_norms(jac) == pytest.approx(np.linalg.norm(dense, axis=0))
+    e, rows, cols = sc.extreme_jacobian_entries_arrays(jac)
+    assert list(rows) == [0, 2, 3]
+    assert list(cols) == [0, 1, 3]
+    assert e == pytest.approx([1e7, 2e-5, 1e-7])
+
+    exact = np.linalg.cond(dense, 1)
+    assert sc.jacobian_cond(jac=jac, estimate=True) == pytest.approx(exact, rel=1e-6)
+    assert sc.jacobian_cond(jac=jac, order=1) == pytest.approx(exact, rel=1e-6)
+
+    jac_ns = scipy.sparse.csr_matrix(dense[:, :3] + np.eye(4, 3))
+    assert sc.jacobian_cond(jac=jac_ns, estimate=True) == pytest.approx(
+        np.linalg.cond(jac_ns.toarray()), rel=1e-4
+    )
+
+    jac_singular = scipy.sparse.csr_matrix(np.array([[1.0, 2.0], [2.0, 4.0]]))
+    assert sc.jacobian_cond(jac=jac_singular, estimate=True) == math.inf
+
+
+@pytest.mark.unit
+def test_scale_jacobian_vectorized():
+    m = pyo.ConcreteModel()
+    m.x = pyo.Var([1, 2])
+    m.c = pyo.Constraint([1, 2, 3], rule=lambda b, i: m.x[1] == 0)
+    m.scaling_factor = pyo.Suffix(direction=pyo.Suffix.EXPORT)
+    m.scaling_factor[m.x[2]] = 1e-2
+    m.scaling_factor[m.c[3]] = 0.5
+    clist = list(m.c.values())
+    vlist = list(m.x.values())
+    jac = scipy.sparse.csr_matrix(np.array([[1e4, 1.0], [1.0, 2.0], [1e6, 0]]))
+
+    jac_scaled = sc._scale_jacobian(jac, clist, vlist, no_scale=True)
+    assert jac_scaled.toarray() == pytest.approx(
+        np.array([[1e4, 100], [1, 200], [5e5, 0]])
+    )
+    assert m.c[1] not in m.scaling_factor
+
+    jac_scaled = sc._scale_jacobian(jac, clist, vlist, min_scale=1e-3)
+    assert m.scaling_factor[m.c[1]] == pytest.approx(1e-2)
+    assert m.scaling_factor[m.c[2]] == pytest.approx(0.5)
+    assert m.scaling_factor[m.c[3]] == 0.5
+    assert jac_scaled.toarray() == pytest.approx(
+        np.array([[100, 1], [0.5, 100], [5e5, 0]])
+    )
+
+    sc._scale_jacobian(
+        jac, clist, vlist, min_scale=1e-3, ignore_constraint_scaling=True
+    )
+    assert m.scaling_factor[m.c[3]] == pytest.approx(1e-3)
+
+
 @pytest.mark.skipif(
     not AmplInterface.available(), reason="pynumero_ASL is not available"
 )
@@ -2245,6 +2312,67 @@ def m():
     return m
 
 
+class TestConstraintNominalValues:
+    @pytest.mark.unit
+    def test_constraint_nominal_values(self, m):
+        m.constraint = pyo.Constraint(
+            expr=m.scalar_var == sum(m.indexed_var[i] for i in m.set)
+        )
+        m.block = pyo.Block()
+        m.block.iconstraint = pyo.Constraint(
+            m.set, rule=lambda b, i: m.scalar_var == -m.indexed_var[i]
+        )
+
+        cons, values, offsets = sc.constraint_nominal_values(m)
+        assert cons == [m.constraint] + list(m.block.iconstraint.values())
+        assert list(offsets) == [0, 4, 6, 8, 10]
+        assert list(values) == [12, 22, 23, 24, 12, -22, 12, -23, 12, -24]
+
+        cons, values, offsets = sc.constraint_nominal_values(m, descend_into=False)
+        assert cons == [m.constraint]
+        assert list(offsets) == [0, 4]
+
+    @pytest.mark.unit
+    def test_nominal_value_cache(self, m):
+        m.constraint = pyo.Constraint(
+            expr=m.scalar_var == sum(m.indexed_var[i] for i in m.set)
+        )
+        cache = sc.NominalValueCache()
+        assert cache.nominal_values(m.constraint.expr) == [12, 22, 23, 24]
+        assert len(cache) == 1
+        assert cache.nominal_values(m.constraint.expr) == [12, 22, 23, 24]
+        assert len(cache) == 1
+
+        # Changing a scaling factor invalidates the entry
+        sc.set_scaling_factor(m.indexed_var["a"], 1 / 2)
+        m.scaling_factor[m.scalar_var] = 1 / 3
+        assert cache.nominal_values(m.constraint.expr) == [3, 2, 23, 24]
+
+        cons, values, offsets = sc.constraint_nominal_values(m, cache=cache)
+        assert list(values) == [3, 2, 23, 24]
+
+        # Replacing the expression
+        m.constraint.set_value(m.scalar_var == m.indexed_var["c"])
+        sc.set_constraint_scaling_max_magnitude(m, cache=cache)
+        assert m.scaling_factor[m.constraint] == 24
+        assert len(cache) == 2
+        cache.clear()
+        assert len(cache) == 0
+
+    @pytest.mark.unit
+    def test_nominal_value_cache_named_expression(self, m):
+        m.expression = pyo.Expression(expr=m.indexed_var["a"])
+        m.constraint = pyo.Constraint(expr=m.scalar_var == m.expression)
+        cache = sc.NominalValueCache()
+        assert cache.nominal_values(m.constraint.expr) == [12, 22]
+
+        # Replacing a named Expression in the constraint invalidates the entry
+        m.expression.set_value(m.indexed_var["b"] + m.indexed_var["c"])
+        assert cache.nominal_values(m.constraint.expr) == [12, 23, 24]
+        assert cache.nominal_values(m.constraint.expr) == [12, 23, 24]
+        assert len(cache) == 1
+
+
 class TestSetConstraintScalingMaxMagnitude:
     @pytest.mark.unit
     def test_set_constraint_scaling_max_magnitude(self, m):
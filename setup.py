@@ -84,7 +84,7 @@ kwargs = dict(
         "pyyaml",
         "requests",  # for ui/fsvis
         "scipy",
-        "tinydb",
+        "tinydb>=4.8",  # Table.get(doc_ids=...)
         "xlrd",  # for DMF read of old .xls Excel files
         "openpyxl",  # for DMF read of new .xls Excel files
         'ipython <= 8.12; python_version == "3.8"',